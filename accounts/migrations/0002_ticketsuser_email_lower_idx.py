@@ -0,0 +1,32 @@
+from django.db import migrations
+
+INDEX_NAME = "accounts_user_email_lower_idx"
+
+
+def create_index(apps, schema_editor):
+    TicketsUser = apps.get_model("accounts", "TicketsUser")
+    table = schema_editor.quote_name(TicketsUser._meta.db_table)
+    # Postgres only uses an index for LIKE 'prefix%' under the C collation
+    # or with a pattern operator class.
+    opclass = (
+        " text_pattern_ops"
+        if schema_editor.connection.vendor == "postgresql"
+        else ""
+    )
+    schema_editor.execute(
+        f"CREATE INDEX {INDEX_NAME} ON {table} (LOWER(email){opclass})"
+    )
+
+
+def drop_index(apps, schema_editor):
+    schema_editor.execute(f"DROP INDEX {INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
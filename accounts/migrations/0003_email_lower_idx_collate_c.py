@@ -0,0 +1,33 @@
+from django.db import migrations
+
+INDEX_NAME = "accounts_user_email_lower_idx"
+
+
+def _rebuild_index(expression):
+    def rebuild(apps, schema_editor):
+        # Other backends keep the plain expression index from 0002.
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        TicketsUser = apps.get_model("accounts", "TicketsUser")
+        table = schema_editor.quote_name(TicketsUser._meta.db_table)
+        schema_editor.execute(f"DROP INDEX {INDEX_NAME}")
+        schema_editor.execute(
+            f"CREATE INDEX {INDEX_NAME} ON {table} ({expression})"
+        )
+
+    return rebuild
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0002_ticketsuser_email_lower_idx"),
+    ]
+
+    operations = [
+        # A C-collated index serves both the prefix range and the ORDER
+        # BY on the same expression; text_pattern_ops only served LIKE.
+        migrations.RunPython(
+            _rebuild_index('(LOWER(email) COLLATE "C")'),
+            _rebuild_index("LOWER(email) text_pattern_ops"),
+        ),
+    ]
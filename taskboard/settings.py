@@ -56,6 +56,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "taskboard.wsgi.application"
+ASGI_APPLICATION = "taskboard.asgi.application"
 
 DATABASES = {
     "default": {
@@ -65,7 +66,9 @@ DATABASES = {
         "PASSWORD": os.getenv("DB_PASSWORD", ""),
         "HOST": os.getenv("DB_HOST", "localhost"),
         "PORT": os.getenv("DB_PORT", "5432"),
-        "CONN_MAX_AGE": 600,
+        # The web container serves ASGI, where sync views run in executor
+        # threads; persistent connections would outlive their requests.
+        "CONN_MAX_AGE": 0,
     }
 }
 
@@ -75,10 +78,16 @@ CACHES = {
         "LOCATION": os.getenv("REDIS_URL", "redis://127.0.0.1:6379/1"),
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "IGNORE_EXCEPTIONS": True,
         },
     }
 }
 
+TRACKER_EVENTS_BROKER = os.getenv(
+    "TRACKER_EVENTS_BROKER", "tracker.realtime.RedisBroker"
+)
+TRACKER_EVENTS_REDIS_URL = os.getenv("REDIS_URL", "redis://127.0.0.1:6379/1")
+
 if DEBUG:
     SECURE_SSL_REDIRECT = False
     SESSION_COOKIE_SECURE = False
@@ -99,8 +108,11 @@ CSRF_TRUSTED_ORIGINS = [
     "https://127.0.0.1",
 ]
 
-DATA_UPLOAD_MAX_MEMORY_SIZE = 10485760
-FILE_UPLOAD_MAX_MEMORY_SIZE = 10485760
+# Attachments arrive in chunks (see tracker.uploads), so request bodies
+# stay small; anything bigger that still comes in as a form upload is
+# spooled to a temporary file instead of held in worker memory.
+DATA_UPLOAD_MAX_MEMORY_SIZE = 2621440
+FILE_UPLOAD_MAX_MEMORY_SIZE = 2621440
 
 REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
@@ -139,6 +151,8 @@ STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
+# Unfinished chunked uploads; never served.
+TRACKER_UPLOAD_DIR = MEDIA_ROOT / ".uploads"
 
 LOG_DIR = os.path.join(BASE_DIR, "logs")
 os.makedirs(LOG_DIR, exist_ok=True)
@@ -0,0 +1,52 @@
+from django.core.cache import cache
+
+from .models import Project, TrackerGroup
+
+ACCESS_TIMEOUT = 60 * 60
+
+_MEMBERSHIPS = {
+    "group": (TrackerGroup.members.through, "trackergroup_id"),
+    "project": (Project.members.through, "project_id"),
+}
+
+
+def _access_key(kind, user_id, pk):
+    return f"tracker:access:{kind}:{user_id}:{pk}"
+
+
+def _is_member(kind, user_id, pk):
+    key = _access_key(kind, user_id, pk)
+    is_member = cache.get(key)
+    if is_member is None:
+        through, column = _MEMBERSHIPS[kind]
+        is_member = through.objects.filter(
+            **{column: pk, "ticketsuser_id": user_id}
+        ).exists()
+        cache.set(key, is_member, ACCESS_TIMEOUT)
+
+    return is_member
+
+
+def can_access_group(user, group):
+    if not user.is_authenticated:
+        return False
+
+    return group.owner_id == user.id or _is_member("group", user.id, group.pk)
+
+
+def can_access_project(user, project):
+    if not user.is_authenticated:
+        return False
+
+    return project.owner_id == user.id or _is_member(
+        "project", user.id, project.pk
+    )
+
+
+def forget_access(kind, user_ids, pks):
+    """Drop memoized membership answers for every (user, object) pair."""
+    keys = [
+        _access_key(kind, user_id, pk) for user_id in user_ids for pk in pks
+    ]
+    if keys:
+        cache.delete_many(keys)
@@ -0,0 +1,85 @@
+"""Email prefix search for the invite autocomplete.
+
+Matches select a range of ``lower(email)`` under the C collation, the
+expression of the ``accounts_user_email_lower_idx`` index on Postgres,
+so one index range scan yields the matches already in order. People who
+already share a group or project with the requester are listed first;
+both lookups stop after ``limit`` rows, so the cost does not depend on
+how many users match the prefix. Concurrent identical searches share
+one database hit through ``get_or_compute``.
+"""
+
+import hashlib
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.functions import Collate, Lower
+
+from accounts.models import TicketsUser
+
+from .cache import get_or_compute
+from .models import Project, TrackerGroup
+
+AUTOCOMPLETE_LIMIT = 10
+AUTOCOMPLETE_TIMEOUT = 60
+
+
+def _peers(user):
+    groups = TrackerGroup.members.through.objects.filter(
+        ticketsuser_id=user.id
+    ).values("trackergroup_id")
+    projects = Project.members.through.objects.filter(
+        ticketsuser_id=user.id
+    ).values("project_id")
+
+    return Q(
+        id__in=TrackerGroup.members.through.objects.filter(
+            trackergroup_id__in=groups
+        ).values("ticketsuser_id")
+    ) | Q(
+        id__in=Project.members.through.objects.filter(
+            project_id__in=projects
+        ).values("ticketsuser_id")
+    )
+
+
+def search_emails(user, query, limit=AUTOCOMPLETE_LIMIT):
+    """Return up to ``limit`` ``{"id", "email"}`` dicts whose email starts
+    with ``query``, peers of ``user`` first."""
+    prefix = query.strip().lower()
+    if not prefix:
+        return []
+
+    digest = hashlib.sha256(prefix.encode()).hexdigest()
+    return get_or_compute(
+        f"tracker:autocomplete:{user.id}:{digest}",
+        lambda: _search(user, prefix, limit),
+        AUTOCOMPLETE_TIMEOUT,
+    )
+
+
+def email_matches(prefix):
+    """Users whose lowercased email starts with ``prefix``, in order."""
+    email_lower = Lower("email")
+    if connection.vendor == "postgresql":
+        # Byte order, so the index serves the LIKE and the ORDER BY.
+        email_lower = Collate(email_lower, "C")
+    # A range instead of LIKE: the same rows in byte order, and Django
+    # casts LIKE operands to text, which hides the index on Postgres.
+    after_prefix = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return (
+        TicketsUser.objects.annotate(email_lower=email_lower)
+        .filter(email_lower__gte=prefix, email_lower__lt=after_prefix)
+        .order_by("email_lower")
+    )
+
+
+def _search(user, prefix, limit):
+    matches = email_matches(prefix)
+    results = list(matches.filter(_peers(user)).values("id", "email")[:limit])
+    if len(results) < limit:
+        results += matches.exclude(
+            id__in=[result["id"] for result in results]
+        ).values("id", "email")[: limit - len(results)]
+
+    return results
@@ -0,0 +1,127 @@
+"""Reference counts and garbage collection for attachment blobs.
+
+Each ``Blob`` row counts the attachments whose file is that blob. The
+attachment signals move the count with ``F()`` updates; a blob whose
+count drops to zero stays on disk until ``collect_blobs`` removes it, so
+a file that is uploaded again soon after is not written twice. Queryset
+updates bypass the signals; ``repair_blob_refs`` recomputes the counts
+from the attachment rows, and ``collect_blobs`` runs it first.
+"""
+
+import os
+from datetime import timedelta
+
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Attachment, Blob
+from .storage import BLOB_DIR, blob_storage, digest_of, is_blob_name
+
+# Blobs touched this recently may be about to gain a reference.
+BLOB_GRACE_PERIOD = timedelta(hours=1)
+
+
+def add_blob_ref(name):
+    if not is_blob_name(name):
+        return
+    blob, _ = Blob.objects.get_or_create(
+        name=name,
+        defaults={"digest": digest_of(name), "size": blob_storage.size(name)},
+    )
+    Blob.objects.filter(pk=blob.pk).update(ref_count=F("ref_count") + 1)
+
+
+def drop_blob_ref(name):
+    if is_blob_name(name):
+        Blob.objects.filter(name=name, ref_count__gt=0).update(
+            ref_count=F("ref_count") - 1
+        )
+
+
+def _reference_count():
+    return Coalesce(
+        Subquery(
+            Attachment.objects.filter(attached_file=OuterRef("name"))
+            .order_by()
+            .values("attached_file")
+            .annotate(count=Count("*"))
+            .values("count")
+        ),
+        0,
+    )
+
+
+def repair_blob_refs():
+    """Recompute the counts that disagree with the attachment rows and
+    return how many were fixed."""
+    return (
+        Blob.objects.annotate(real_count=_reference_count())
+        .filter(~Q(ref_count=F("real_count")))
+        .update(ref_count=_reference_count())
+    )
+
+
+def _is_settled(path, cutoff):
+    try:
+        return os.path.getmtime(path) < cutoff.timestamp()
+    except FileNotFoundError:
+        return True
+
+
+def collect_blobs(now=None):
+    """Delete blobs no attachment references, and blob files without a
+    row, once they are older than ``BLOB_GRACE_PERIOD``. Returns the
+    number of files removed."""
+    cutoff = (now or timezone.now()) - BLOB_GRACE_PERIOD
+    repair_blob_refs()
+
+    removed = 0
+    orphans = Blob.objects.filter(ref_count=0, created_at__lt=cutoff)
+    for blob in orphans.iterator():
+        if not _is_settled(blob_storage.path(blob.name), cutoff):
+            continue
+        deleted, _ = Blob.objects.filter(pk=blob.pk, ref_count=0).delete()
+        if deleted:
+            blob_storage.delete(blob.name)
+            removed += 1
+
+    # Files whose saving transaction rolled back never got a row.
+    root = blob_storage.path(BLOB_DIR)
+    for directory, _, files in os.walk(root):
+        names = {
+            os.path.relpath(
+                os.path.join(directory, file), blob_storage.location
+            ).replace(os.sep, "/"): os.path.join(directory, file)
+            for file in files
+        }
+        known = set(
+            Blob.objects.filter(name__in=names).values_list("name", flat=True)
+        ) | set(
+            Attachment.objects.filter(attached_file__in=names).values_list(
+                "attached_file", flat=True
+            )
+        )
+        for name, path in names.items():
+            if name not in known and _is_settled(path, cutoff):
+                blob_storage.delete(name)
+                removed += 1
+    return removed
+
+
+def adopt_legacy_attachments():
+    """Move attachments stored before blobs existed into the blob store,
+    keeping one copy of each distinct file. Returns how many moved."""
+    moved = 0
+    legacy = Attachment.objects.exclude(
+        attached_file__startswith=f"{BLOB_DIR}/"
+    ).exclude(attached_file="")
+    for attachment in legacy.iterator():
+        old_name = attachment.attached_file.name
+        if not blob_storage.exists(old_name):
+            continue
+        name = blob_storage.adopt(blob_storage.path(old_name), old_name)
+        Attachment.objects.filter(pk=attachment.pk).update(attached_file=name)
+        add_blob_ref(name)
+        moved += 1
+    return moved
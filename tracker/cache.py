@@ -0,0 +1,112 @@
+import time
+import uuid
+
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+# Part of every fragment key: bump it whenever a card template changes so
+# HTML rendered by the previous release is never served again.
+FRAGMENT_SCHEMA = 5
+FRAGMENT_TIMEOUT = 60 * 60 * 24
+
+COALESCE_LOCK_TIMEOUT = 5
+COALESCE_WAIT = 1.0
+COALESCE_POLL = 0.02
+
+
+def _version_key(kind, pk):
+    return f"tracker:version:{kind}:{pk}"
+
+
+def get_versions(kind, pks):
+    """Return ``{pk: version}`` for the given objects in one round trip.
+
+    A version is an opaque token that changes every time the object is
+    invalidated. Missing tokens are created on the fly.
+    """
+    keys = {pk: _version_key(kind, pk) for pk in set(pks)}
+    found = cache.get_many(keys.values())
+
+    versions, missing = {}, {}
+    for pk, key in keys.items():
+        if key in found:
+            versions[pk] = found[key]
+        else:
+            versions[pk] = missing[key] = uuid.uuid4().hex
+
+    if missing:
+        cache.set_many(missing, timeout=None)
+
+    return versions
+
+
+def invalidate(kind, *pks):
+    """Drop the version of the given objects, orphaning their fragments."""
+    if pks:
+        cache.delete_many([_version_key(kind, pk) for pk in pks])
+
+
+def attach_fragments(objects, template_name, key_func, context_func):
+    """Render ``template_name`` for every object into ``obj.card_html``.
+
+    Fragments are looked up with a single ``get_many``; only the misses
+    are rendered and written back. ``key_func`` must return a value that
+    changes whenever the rendered card would.
+    """
+    objects = list(objects)
+    keys = [
+        f"tracker:fragment:{FRAGMENT_SCHEMA}:{template_name}:{key_func(obj)}"
+        for obj in objects
+    ]
+    cached = cache.get_many(keys)
+
+    rendered = {}
+    for key, obj in zip(keys, objects, strict=True):
+        html = cached.get(key)
+        if html is None:
+            html = rendered[key] = render_to_string(
+                template_name, context_func(obj)
+            )
+        obj.card_html = mark_safe(html)  # nosec B308 - our own templates
+
+    if rendered:
+        cache.set_many(rendered, timeout=FRAGMENT_TIMEOUT)
+
+    return objects
+
+
+def get_or_compute(key, compute, timeout):
+    """Return the cached value of ``key``, computing it at most once
+    across concurrent callers.
+
+    The first caller takes a short lock and fills the cache; the others
+    poll for its result while the lock is held, and only compute
+    themselves if it takes longer than ``COALESCE_WAIT``. When the cache
+    is down (errors are ignored, so ``add`` gives ``None``) or the lock
+    is gone, callers compute straight away instead of waiting.
+    """
+    value = cache.get(key)
+    if value is not None:
+        return value
+
+    lock_key = f"{key}:lock"
+    added = cache.add(lock_key, 1, COALESCE_LOCK_TIMEOUT)
+    if added is None:
+        return compute()
+    if added:
+        try:
+            value = compute()
+            cache.set(key, value, timeout)
+        finally:
+            cache.delete(lock_key)
+        return value
+
+    deadline = time.monotonic() + COALESCE_WAIT
+    while cache.get(lock_key) is not None and time.monotonic() < deadline:
+        time.sleep(COALESCE_POLL)
+        value = cache.get(key)
+        if value is not None:
+            return value
+
+    return compute()
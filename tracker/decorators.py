@@ -1,9 +1,12 @@
+import math
 from functools import wraps
 
-from django.http import HttpResponseForbidden
+from django.http import HttpResponseForbidden, JsonResponse
 from django.shortcuts import get_object_or_404
 
+from .access import can_access_group, can_access_project
 from .models import Project, TrackerGroup
+from .throttle import take_token
 
 
 def group_access_required(view_func):
@@ -11,9 +14,7 @@ def group_access_required(view_func):
     def _wrapped_view(request, group_id, *args, **kwargs):
         group = get_object_or_404(TrackerGroup, id=group_id)
 
-        if not (
-            request.user == group.owner or request.user in group.members.all()
-        ):
+        if not can_access_group(request.user, group):
             return HttpResponseForbidden("No access to this group")
 
         return view_func(request, group_id, *args, group=group, **kwargs)
@@ -26,12 +27,37 @@ def project_access_required(view_func):
     def _wrapped_view(request, project_id, *args, **kwargs):
         project = get_object_or_404(Project, id=project_id)
 
-        if not (
-            request.user == project.owner
-            or request.user in project.members.all()
-        ):
+        if not can_access_project(request.user, project):
             return HttpResponseForbidden("No access to this project")
 
         return view_func(request, project_id, *args, project=project, **kwargs)
 
     return _wrapped_view
+
+
+def throttle(scope, rate, capacity):
+    """Allow ``rate`` requests per second per user, in bursts of up to
+    ``capacity``; anything over gets a 429 with ``Retry-After``."""
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            if request.user.is_authenticated:
+                client = f"user:{request.user.pk}"
+            else:
+                client = f"ip:{request.META.get('REMOTE_ADDR')}"
+
+            allowed, wait = take_token(f"{scope}:{client}", rate, capacity)
+            if not allowed:
+                response = JsonResponse(
+                    {"success": False, "error": "Too many requests"},
+                    status=429,
+                )
+                response["Retry-After"] = str(max(1, math.ceil(wait)))
+                return response
+
+            return view_func(request, *args, **kwargs)
+
+        return _wrapped_view
+
+    return decorator
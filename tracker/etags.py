@@ -0,0 +1,89 @@
+"""ETags for conditional GETs on the heavier pages.
+
+Each validator costs one aggregate query plus cached version tokens
+(see ``cache.get_versions``), so an unchanged page answers 304 without
+loading or rendering anything. Returning ``None`` opts the request out
+of conditional handling.
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.db.models import Count, Max
+
+from .cache import get_versions
+from .models import Ticket
+
+# Part of every ETag: bump it whenever a page template changes so pages
+# rendered by the previous release are not revalidated as current.
+ETAG_SCHEMA = 9
+
+
+def _is_conditional(request):
+    # A 304 would leave queued flash messages for some later page.
+    return request.method in ("GET", "HEAD") and not len(get_messages(request))
+
+
+def _page_etag(request, *parts):
+    # Pages embed the user and a CSRF token tied to the cookie secret.
+    parts = (
+        ETAG_SCHEMA,
+        request.user.pk,
+        request.COOKIES.get(settings.CSRF_COOKIE_NAME, ""),
+        *parts,
+    )
+    return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+
+def board_etag(request, project_id, project=None):
+    if not _is_conditional(request):
+        return None
+
+    state = project.tickets.aggregate(
+        last_change=Max("updated_at"), count=Count("id")
+    )
+    versions = get_versions("project", [project.id])
+    return _page_etag(
+        request, state["last_change"], state["count"], versions[project.id]
+    )
+
+
+def ticket_list_etag(request):
+    if not _is_conditional(request):
+        return None
+
+    state = list(
+        Ticket.objects.filter(assignee=request.user.id)
+        .values("project_id")
+        .annotate(last_change=Max("updated_at"), count=Count("id"))
+        .order_by("project_id")
+    )
+    versions = get_versions("project", [row["project_id"] for row in state])
+    return _page_etag(
+        request,
+        [
+            (row["last_change"], row["count"], versions[row["project_id"]])
+            for row in state
+        ],
+    )
+
+
+def ticket_detail_etag(request, project_id, ticket_id, project=None):
+    if not _is_conditional(request):
+        return None
+
+    updated_at = (
+        Ticket.objects.filter(id=ticket_id)
+        .values_list("updated_at", flat=True)
+        .first()
+    )
+    if updated_at is None:
+        return None
+
+    return _page_etag(
+        request,
+        updated_at,
+        get_versions("ticket", [ticket_id])[ticket_id],
+        get_versions("project", [project.id])[project.id],
+    )
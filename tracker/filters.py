@@ -0,0 +1,133 @@
+"""Ticket filters shared by the ticket list and the project board.
+
+``TicketFilterForm`` reads the filter query string and turns it into one
+``Q`` object, so every page applies its filters in the same single query
+it already runs. The composite indexes on ``Ticket`` (``project, status``,
+``assignee, status`` and ``project, due_date``) cover the common cases.
+"""
+
+from datetime import datetime, time, timedelta
+
+from django import forms
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.http import urlencode
+
+from accounts.models import TicketsUser
+
+from .models import Ticket
+
+
+def start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def ticket_filter_q(
+    status=(),
+    priority=(),
+    ticket_type=(),
+    assignee=None,
+    creator=None,
+    due_after=None,
+    due_before=None,
+):
+    """Build the ``Q`` matching every given criterion.
+
+    Empty criteria are skipped. Due dates are compared as half-open
+    datetime ranges rather than ``__date`` lookups so the
+    ``(project, due_date)`` index stays usable; both ends are inclusive
+    days.
+    """
+    q = Q()
+    if status:
+        q &= Q(status__in=status)
+    if priority:
+        q &= Q(priority__in=priority)
+    if ticket_type:
+        q &= Q(ticket_type__in=ticket_type)
+    if assignee is not None:
+        q &= Q(assignee=assignee)
+    if creator is not None:
+        q &= Q(creator=creator)
+    if due_after is not None:
+        q &= Q(due_date__gte=start_of_day(due_after))
+    if due_before is not None:
+        q &= Q(due_date__lt=start_of_day(due_before + timedelta(days=1)))
+    return q
+
+
+class TicketFilterForm(forms.Form):
+    status = forms.MultipleChoiceField(
+        choices=Ticket.STATUS_CHOICES,
+        required=False,
+        widget=forms.CheckboxSelectMultiple,
+    )
+    priority = forms.MultipleChoiceField(
+        choices=Ticket.PRIORITY_CHOICES,
+        required=False,
+        widget=forms.CheckboxSelectMultiple,
+    )
+    ticket_type = forms.MultipleChoiceField(
+        choices=Ticket.TYPE_CHOICES,
+        required=False,
+        widget=forms.CheckboxSelectMultiple,
+    )
+    assignee = forms.ModelChoiceField(
+        queryset=TicketsUser.objects.none(), required=False
+    )
+    creator = forms.ModelChoiceField(
+        queryset=TicketsUser.objects.none(), required=False
+    )
+    due_after = forms.DateField(
+        required=False, widget=forms.DateInput(attrs={"type": "date"})
+    )
+    due_before = forms.DateField(
+        required=False, widget=forms.DateInput(attrs={"type": "date"})
+    )
+
+    def __init__(self, *args, users=None, exclude=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        for name in exclude:
+            del self.fields[name]
+        for name in ("assignee", "creator"):
+            if name in self.fields and users is not None:
+                self.fields[name].queryset = users
+
+    def clean(self):
+        cleaned_data = super().clean()
+        due_after = cleaned_data.get("due_after")
+        due_before = cleaned_data.get("due_before")
+        if due_after and due_before and due_after > due_before:
+            raise forms.ValidationError(
+                "The start of the due date range is after its end."
+            )
+        return cleaned_data
+
+    @property
+    def is_active(self):
+        return self.is_valid() and any(self.cleaned_data.values())
+
+    def q(self):
+        """The filter as a ``Q``; invalid input filters nothing."""
+        if not self.is_valid():
+            return Q()
+        return ticket_filter_q(
+            **{
+                name: value
+                for name, value in self.cleaned_data.items()
+                if value not in (None, "", [])
+            }
+        )
+
+    def querystring(self):
+        """The active filters, ready to append to another URL."""
+        if not self.is_bound:
+            return ""
+        return urlencode(
+            [
+                (name, value)
+                for name in self.fields
+                for value in self.data.getlist(name)
+                if value
+            ]
+        )
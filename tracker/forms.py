@@ -5,10 +5,12 @@ from .models import (
     Attachment,
     Comment,
     Project,
+    SavedFilter,
     SubTask,
     Ticket,
     TrackerGroup,
 )
+from .query_language import QuerySyntaxError, parse
 
 
 class GroupForm(forms.ModelForm):
@@ -33,6 +35,10 @@ class GroupForm(forms.ModelForm):
 
 
 class ProjectForm(forms.ModelForm):
+    inherit_group_members = forms.BooleanField(
+        required=False, label="Add every member of the group"
+    )
+
     class Meta:
         model = Project
         fields = ("title", "description")
@@ -62,6 +68,17 @@ class TicketForm(forms.ModelForm):
             self.fields["assignee"].queryset = project.members.all()
 
 
+SubTaskFormSet = forms.modelformset_factory(
+    SubTask,
+    fields=("text", "is_done"),
+    extra=0,
+    widgets={
+        "text": forms.TextInput(attrs={"class": "form-control"}),
+        "is_done": forms.CheckboxInput(attrs={"class": "form-check-input"}),
+    },
+)
+
+
 class SubTaskForm(forms.ModelForm):
     class Meta:
         model = SubTask
@@ -102,3 +119,45 @@ class SecureAttachmentForm(forms.ModelForm):
                 )
 
         return file
+
+
+class SavedFilterForm(forms.ModelForm):
+    class Meta:
+        model = SavedFilter
+        fields = ("name", "query")
+        widgets = {
+            "query": forms.TextInput(
+                attrs={
+                    "placeholder": (
+                        "status in (open, in_progress) and priority >= high"
+                        " and assignee = me"
+                    )
+                }
+            ),
+        }
+
+    def __init__(self, *args, owner=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.owner = owner
+
+    def clean_name(self):
+        name = self.cleaned_data["name"].strip()
+        if (
+            SavedFilter.objects.filter(owner=self.owner, name=name)
+            .exclude(pk=self.instance.pk)
+            .exists()
+        ):
+            raise ValidationError("You already have a filter with this name.")
+        return name
+
+    def clean_query(self):
+        query = self.cleaned_data["query"].strip()
+        try:
+            parse(query)
+        except QuerySyntaxError as e:
+            raise ValidationError(str(e)) from None
+        return query
+
+    def save(self, commit=True):
+        self.instance.owner = self.owner
+        return super().save(commit)
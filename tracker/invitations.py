@@ -0,0 +1,69 @@
+from accounts.models import TicketsUser
+
+from .models import Invitation
+
+INVITED = "invited"
+ALREADY_INVITED = "already_invited"
+ALREADY_MEMBER = "already_member"
+UNKNOWN = "unknown"
+
+
+def parse_emails(raw):
+    """Split a comma separated form value into unique, stripped emails."""
+    return list(dict.fromkeys(e.strip() for e in raw.split(",") if e.strip()))
+
+
+def invite_to_group(owner, group, emails):
+    """Invite every address in ``emails`` to ``group`` in a few queries.
+
+    Returns ``{email: outcome}``, one of ``INVITED``, ``ALREADY_INVITED``,
+    ``ALREADY_MEMBER`` or ``UNKNOWN``. The pending-invitation constraint
+    keeps concurrent requests from inviting the same user twice.
+    """
+    emails = list(dict.fromkeys(emails))
+    users = {
+        user.email: user
+        for user in TicketsUser.objects.filter(email__in=emails).only(
+            "id", "email"
+        )
+    }
+    user_ids = [user.id for user in users.values()]
+
+    members = set(
+        group.members.filter(id__in=user_ids).values_list("id", flat=True)
+    )
+    members.add(group.owner_id)
+    pending = set(
+        Invitation.objects.filter(
+            target_group=group,
+            target_user__in=user_ids,
+            invitation_status="pending",
+        ).values_list("target_user_id", flat=True)
+    )
+
+    report = {}
+    invitations = []
+    for email in emails:
+        user = users.get(email)
+        if user is None:
+            report[email] = UNKNOWN
+        elif user.id in members:
+            report[email] = ALREADY_MEMBER
+        elif user.id in pending:
+            report[email] = ALREADY_INVITED
+        else:
+            report[email] = INVITED
+            invitations.append(
+                Invitation(
+                    owner=owner,
+                    target_user=user,
+                    target_group=group,
+                    invitation_type="group",
+                )
+            )
+
+    Invitation.objects.bulk_create(
+        invitations, batch_size=500, ignore_conflicts=True
+    )
+
+    return report
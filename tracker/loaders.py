@@ -0,0 +1,83 @@
+from datetime import datetime
+
+from django.db.models import Prefetch, Q
+from django.shortcuts import get_object_or_404
+
+from .models import Attachment, Comment, SubTask, Ticket
+
+COMMENT_PAGE_SIZE = 20
+
+
+def older_than(queryset, field, cursor):
+    """Keep the rows that come after ``cursor`` in ``-field, -id`` order.
+
+    Cursors look like ``<isoformat>.<id>``; a malformed one raises
+    ``ValueError``.
+    """
+    value, pk = cursor.rsplit(".", 1)
+    value, pk = datetime.fromisoformat(value), int(pk)
+    return queryset.filter(
+        Q(**{f"{field}__lt": value}) | Q(**{field: value, "id__lt": pk})
+    )
+
+
+def load_comments(ticket_id, before=None):
+    """Return one page of comments, oldest first, and the cursor of the
+    page before it (``None`` at the start of the thread).
+
+    Pages are read newest first along ``comment_ticket_created_idx``.
+    """
+    limit = COMMENT_PAGE_SIZE
+    comments = Comment.objects.filter(ticket_id=ticket_id)
+    if before:
+        comments = older_than(comments, "created_at", before)
+    comments = list(
+        comments.select_related("author").order_by("-created_at", "-id")[
+            : limit + 1
+        ]
+    )
+
+    cursor = None
+    if len(comments) > limit:
+        del comments[limit:]
+        last = comments[-1]
+        cursor = f"{last.created_at.isoformat()}.{last.id}"
+
+    comments.reverse()
+    return comments, cursor
+
+
+def load_ticket_detail(project, ticket_id):
+    """Fetch a ticket of ``project`` with everything its page shows.
+
+    Always five queries: the ticket with its people, then subtasks,
+    the latest page of comments with authors, attachments with
+    uploaders and the project members. Subtasks are ordered so a
+    formset can reuse the prefetched rows instead of querying again.
+    """
+    ticket = get_object_or_404(
+        Ticket.objects.select_related("creator", "assignee")
+        .defer("search_vector")
+        .prefetch_related(
+            Prefetch("subtasks", queryset=SubTask.objects.order_by("id")),
+            Prefetch(
+                "attachments",
+                queryset=Attachment.objects.select_related(
+                    "uploaded_by"
+                ).order_by("id"),
+            ),
+        ),
+        id=ticket_id,
+        project=project,
+    )
+    ticket.project = project
+    comments, comments_cursor = load_comments(ticket.id)
+
+    return {
+        "ticket": ticket,
+        "subtasks": ticket.subtasks.all(),
+        "comments": comments,
+        "comments_cursor": comments_cursor,
+        "attachments": ticket.attachments.all(),
+        "members": list(project.members.all()),
+    }
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from tracker.uploads import clear_stale_uploads
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete chunked attachment uploads that were started but never "
+        "finished, together with their part files."
+    )
+
+    def handle(self, *args, **options):
+        count = clear_stale_uploads()
+        self.stdout.write(self.style.SUCCESS(f"Removed {count} upload(s)"))
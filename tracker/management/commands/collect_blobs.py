@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from tracker.blobs import adopt_legacy_attachments, collect_blobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete attachment blobs that no attachment references any more. "
+        "With --adopt-legacy, first move attachments stored before blobs "
+        "existed into the blob store, keeping one copy of each file."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--adopt-legacy", action="store_true")
+
+    def handle(self, *args, **options):
+        if options["adopt_legacy"]:
+            count = adopt_legacy_attachments()
+            self.stdout.write(f"Moved {count} legacy attachment(s)")
+        count = collect_blobs()
+        self.stdout.write(self.style.SUCCESS(f"Removed {count} blob(s)"))
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from tracker.models import Ticket
+from tracker.ranking import (
+    REBALANCE_LENGTH,
+    columns_to_rebalance,
+    rebalance_column,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compact Kanban card ranks in columns where they have grown too "
+        "long. Meant to be run periodically, e.g. from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--length",
+            type=int,
+            default=REBALANCE_LENGTH,
+            help="Rebalance columns whose longest rank exceeds this.",
+        )
+
+    def handle(self, *args, **options):
+        columns = columns_to_rebalance(
+            Ticket.objects.all(), length=options["length"]
+        )
+        for project_id, status in columns:
+            with transaction.atomic():
+                count = rebalance_column(
+                    Ticket.objects.select_for_update().filter(
+                        project_id=project_id, status=status
+                    )
+                )
+            self.stdout.write(
+                f"Rebalanced {count} tickets in project {project_id} "
+                f"({status})"
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebalanced {len(columns)} column(s)")
+        )
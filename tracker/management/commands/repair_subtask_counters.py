@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from tracker.progress import repair_subtask_counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the subtask progress counters of tickets whose counters "
+        "disagree with their subtasks, e.g. after bulk edits or restores."
+    )
+
+    def handle(self, *args, **options):
+        count = repair_subtask_counters()
+        self.stdout.write(self.style.SUCCESS(f"Repaired {count} ticket(s)"))
@@ -0,0 +1,47 @@
+from django.db import connection, transaction
+from django.db.models.signals import m2m_changed
+
+from .models import Project, TrackerGroup
+
+
+def inherit_group_members(project, group):
+    """Copy every member of ``group`` into ``project`` with one
+    ``INSERT ... SELECT``, skipping users that are already members.
+
+    Raw SQL bypasses the m2m signals, so they are sent by hand to keep
+    the access and fragment caches in step.
+    """
+    through = Project.members.through
+    group_through = TrackerGroup.members.through
+    user_ids = set(group.members.values_list("id", flat=True))
+    if not user_ids:
+        return 0
+
+    qn = connection.ops.quote_name
+    project_table = qn(through._meta.db_table)
+    # Only quoted table names are interpolated; values are parameters.
+    sql = (  # nosec B608
+        f"INSERT INTO {project_table} (project_id, ticketsuser_id) "
+        "SELECT %s, g.ticketsuser_id "
+        f"FROM {qn(group_through._meta.db_table)} g "
+        "WHERE g.trackergroup_id = %s AND NOT EXISTS ("
+        f"SELECT 1 FROM {project_table} p "
+        "WHERE p.project_id = %s AND p.ticketsuser_id = g.ticketsuser_id)"
+    )
+    signal_kwargs = {
+        "sender": through,
+        "instance": project,
+        "reverse": False,
+        "model": Project.members.field.related_model,
+        "pk_set": user_ids,
+        "using": connection.alias,
+    }
+
+    with transaction.atomic():
+        m2m_changed.send(action="pre_add", **signal_kwargs)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [project.pk, group.pk, project.pk])
+            added = cursor.rowcount
+        m2m_changed.send(action="post_add", **signal_kwargs)
+
+    return added
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+from tracker.ranking import evenly_spaced_ranks
+
+
+def seed_ranks(apps, schema_editor):
+    Ticket = apps.get_model("tracker", "Ticket")
+
+    columns = (
+        Ticket.objects.values_list("project_id", "status")
+        .distinct()
+        .order_by()
+    )
+    for project_id, status in columns:
+        tickets = list(
+            Ticket.objects.filter(project_id=project_id, status=status)
+            .only("id")
+            .order_by("id")
+        )
+        for ticket, rank in zip(
+            tickets, evenly_spaced_ranks(len(tickets)), strict=True
+        ):
+            ticket.rank = rank
+        Ticket.objects.bulk_update(tickets, ["rank"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tracker", "0007_ticket_project_status_id_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="ticket",
+            name="ticket_project_status_id_idx",
+        ),
+        migrations.AddField(
+            model_name="ticket",
+            name="rank",
+            field=models.CharField(
+                blank=True, default="", editable=False, max_length=64
+            ),
+        ),
+        migrations.RunPython(seed_ranks, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="ticket",
+            index=models.Index(
+                fields=["project", "status", "rank", "id"],
+                name="ticket_project_status_rank_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:14
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def drop_duplicate_pending(apps, schema_editor):
+    Invitation = apps.get_model("tracker", "Invitation")
+
+    # Keep the oldest pending invitation of every (user, group) pair.
+    keep = (
+        Invitation.objects.filter(invitation_status="pending")
+        .values("target_user", "target_group")
+        .annotate(first_id=Min("id"))
+        .values("first_id")
+    )
+    Invitation.objects.filter(invitation_status="pending").exclude(
+        id__in=keep
+    ).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tracker", "0008_ticket_rank"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            drop_duplicate_pending, migrations.RunPython.noop
+        ),
+        migrations.AddConstraint(
+            model_name="invitation",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("invitation_status", "pending")),
+                fields=("target_user", "target_group"),
+                name="unique_pending_invitation",
+            ),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:20
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+from tracker.search import REFRESH_SEARCH_VECTORS_SQL
+
+INDEX_NAME = "ticket_search_vector_idx"
+
+
+def create_search_index(apps, schema_editor):
+    # GIN and tsvector only exist on Postgres; elsewhere search falls back
+    # to LIKE and the column stays empty.
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    Ticket = apps.get_model("tracker", "Ticket")
+    schema_editor.execute(
+        f"CREATE INDEX {INDEX_NAME} ON tracker_ticket "
+        "USING gin (search_vector)"
+    )
+    ids = list(Ticket.objects.values_list("id", flat=True))
+    for start in range(0, len(ids), 5000):
+        schema_editor.execute(
+            REFRESH_SEARCH_VECTORS_SQL, [ids[start : start + 5000]]
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(f"DROP INDEX {INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tracker", "0009_invitation_unique_pending"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ticket",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
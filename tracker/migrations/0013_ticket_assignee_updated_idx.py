@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tracker", "0012_savedfilter"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="ticket",
+            index=models.Index(
+                fields=["assignee", "updated_at", "id"],
+                name="ticket_assignee_updated_idx",
+            ),
+        ),
+    ]
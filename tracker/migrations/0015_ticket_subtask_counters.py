@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:33
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_subtasks(apps, schema_editor):
+    Ticket = apps.get_model("tracker", "Ticket")
+    SubTask = apps.get_model("tracker", "SubTask")
+
+    def subtask_count(**filters):
+        return Coalesce(
+            Subquery(
+                SubTask.objects.filter(ticket=OuterRef("pk"), **filters)
+                .order_by()
+                .values("ticket")
+                .annotate(count=Count("*"))
+                .values("count")
+            ),
+            0,
+        )
+
+    Ticket.objects.filter(id__in=SubTask.objects.values("ticket_id")).update(
+        subtasks_total=subtask_count(),
+        subtasks_done=subtask_count(is_done=True),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tracker", "0014_comment_ticket_created_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ticket",
+            name="subtasks_done",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="ticket",
+            name="subtasks_total",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_subtasks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:43
+
+import os
+
+import django.utils.timezone
+from django.db import migrations, models
+
+import tracker.storage
+
+
+def fill_filenames(apps, schema_editor):
+    Attachment = apps.get_model("tracker", "Attachment")
+    attachments = list(Attachment.objects.only("id", "attached_file"))
+    for attachment in attachments:
+        attachment.filename = os.path.basename(attachment.attached_file.name)
+    Attachment.objects.bulk_update(attachments, ["filename"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tracker", "0016_attachmentupload"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Blob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=255, unique=True)),
+                ("digest", models.CharField(max_length=64)),
+                ("size", models.PositiveBigIntegerField()),
+                ("ref_count", models.PositiveIntegerField(default=0)),
+                (
+                    "created_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="attachment",
+            name="filename",
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AlterField(
+            model_name="attachment",
+            name="attached_file",
+            field=models.FileField(
+                storage=tracker.storage.get_blob_storage,
+                upload_to="ticket_attachments",
+            ),
+        ),
+        migrations.RunPython(fill_filenames, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,14 @@
+import os
+import uuid
+
+from django.contrib.postgres.search import SearchVectorField
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils import timezone
 
+from .ranking import RANK_MAX_LENGTH, rank_in_column
+from .storage import get_blob_storage
+
 
 class TrackerGroup(models.Model):
     title = models.CharField(max_length=200)
@@ -104,10 +111,61 @@ class Ticket(models.Model):
         blank=True,
         related_name="assigned_tickets",
     )
+    rank = models.CharField(
+        max_length=RANK_MAX_LENGTH, blank=True, default="", editable=False
+    )
+    # Maintained by tracker.search on Postgres, left empty elsewhere.
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Maintained by tracker.progress as subtasks change.
+    subtasks_total = models.PositiveIntegerField(default=0, editable=False)
+    subtasks_done = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["project", "status", "rank", "id"],
+                name="ticket_project_status_rank_idx",
+            ),
+            models.Index(
+                fields=["assignee", "status"],
+                name="ticket_assignee_status_idx",
+            ),
+            models.Index(
+                fields=["project", "due_date"],
+                name="ticket_project_due_date_idx",
+            ),
+            models.Index(
+                fields=["assignee", "updated_at", "id"],
+                name="ticket_assignee_updated_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.get_status_display()})"
 
+    # Written by their own UPDATEs; a save of an instance loaded earlier
+    # must not put back the values it read.
+    MAINTAINED_FIELDS = {"search_vector", "subtasks_total", "subtasks_done"}
+
+    def save(self, *args, **kwargs):
+        if self._state.adding:
+            if not self.rank:
+                self.rank = rank_in_column(
+                    Ticket.objects.filter(
+                        project_id=self.project_id, status=self.status
+                    )
+                )
+        elif kwargs.get("update_fields") is None and not kwargs.get(
+            "force_insert"
+        ):
+            skipped = self.MAINTAINED_FIELDS | self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.attname not in skipped
+            ]
+        super().save(*args, **kwargs)
+
 
 class SubTask(models.Model):
     ticket = models.ForeignKey(
@@ -119,6 +177,13 @@ class SubTask(models.Model):
     def __str__(self):
         return f"{self.text} ({'done' if self.is_done else 'pending'})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The stored state, so saves can tell how the done count moved.
+        instance._stored_is_done = instance.__dict__.get("is_done")
+        return instance
+
 
 class Comment(models.Model):
     ticket = models.ForeignKey(
@@ -133,6 +198,14 @@ class Comment(models.Model):
     text = models.TextField(blank=False)
     created_at = models.DateTimeField(default=timezone.now)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["ticket", "created_at", "id"],
+                name="comment_ticket_created_idx",
+            ),
+        ]
+
     def __str__(self):
         return f"Comment from {self.author}, to {self.ticket.title}, at {self.created_at}"
 
@@ -143,7 +216,12 @@ class Attachment(models.Model):
         on_delete=models.CASCADE,
         related_name="attachments",
     )
-    attached_file = models.FileField(upload_to="ticket_attachments")
+    attached_file = models.FileField(
+        upload_to="ticket_attachments", storage=get_blob_storage
+    )
+    # The name the file was uploaded as; stored files are named after
+    # their content.
+    filename = models.CharField(max_length=255, blank=True)
     uploaded_by = models.ForeignKey(
         "accounts.TicketsUser",
         on_delete=models.CASCADE,
@@ -153,6 +231,18 @@ class Attachment(models.Model):
     def __str__(self):
         return f"Attachment to {self.ticket.title}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The stored file, so saves can tell which blob lost a reference.
+        instance._stored_file = instance.__dict__.get("attached_file")
+        return instance
+
+    def save(self, *args, **kwargs):
+        if self.attached_file and not self.attached_file._committed:
+            self.filename = os.path.basename(self.attached_file.name)
+        super().save(*args, **kwargs)
+
     def clean(self):
         super().clean()
         if self.attached_file:
@@ -175,6 +265,40 @@ class Attachment(models.Model):
                 )
 
 
+class Blob(models.Model):
+    """A stored attachment file shared by every attachment with the same
+    content; see ``tracker.storage`` and ``tracker.blobs``."""
+
+    name = models.CharField(max_length=255, unique=True)
+    digest = models.CharField(max_length=64)
+    size = models.PositiveBigIntegerField()
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} references)"
+
+
+class AttachmentUpload(models.Model):
+    """An attachment being uploaded in chunks; see ``tracker.uploads``."""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    ticket = models.ForeignKey(
+        Ticket, on_delete=models.CASCADE, related_name="uploads"
+    )
+    uploaded_by = models.ForeignKey(
+        "accounts.TicketsUser",
+        on_delete=models.CASCADE,
+    )
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    received = models.PositiveBigIntegerField(default=0)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.filename} ({self.received}/{self.size} bytes)"
+
+
 class Invitation(models.Model):
     INVITATION_STATUS_CHOICES = [
         ("pending", "Pending"),
@@ -207,3 +331,34 @@ class Invitation(models.Model):
         max_length=20, choices=INVITATION_STATUS_CHOICES, default="pending"
     )
     created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["target_user", "target_group"],
+                condition=models.Q(invitation_status="pending"),
+                name="unique_pending_invitation",
+            )
+        ]
+
+
+class SavedFilter(models.Model):
+    owner = models.ForeignKey(
+        "accounts.TicketsUser",
+        on_delete=models.CASCADE,
+        related_name="saved_filters",
+    )
+    name = models.CharField(max_length=100)
+    query = models.TextField()
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["name", "id"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["owner", "name"], name="unique_saved_filter_name"
+            )
+        ]
+
+    def __str__(self):
+        return self.name
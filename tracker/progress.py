@@ -0,0 +1,72 @@
+"""Subtask progress counters kept on ``Ticket``.
+
+``subtasks_total`` and ``subtasks_done`` are adjusted with ``F()``
+updates from the subtask signals, so concurrent changes never overwrite
+each other and the board and lists can show progress without reading
+the subtask table. Queryset updates and bulk operations bypass the
+signals; ``repair_subtask_counters`` recomputes the counters from the
+subtask rows.
+"""
+
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from .models import SubTask, Ticket
+
+REPAIR_BATCH_SIZE = 1000
+
+
+def adjust_subtask_counters(ticket_id, total=0, done=0):
+    """Shift the counters of one ticket by the given amounts."""
+    if not total and not done:
+        return
+    # updated_at moves too: it keys the cached cards and the ETags.
+    # Clamped at zero so a drifted counter cannot break a delete;
+    # repair_subtask_counters puts it right.
+    Ticket.objects.filter(pk=ticket_id).update(
+        subtasks_total=Greatest(F("subtasks_total") + total, 0),
+        subtasks_done=Greatest(F("subtasks_done") + done, 0),
+        updated_at=timezone.now(),
+    )
+
+
+def _subtask_count(**filters):
+    return Coalesce(
+        Subquery(
+            SubTask.objects.filter(ticket=OuterRef("pk"), **filters)
+            .order_by()
+            .values("ticket")
+            .annotate(count=Count("*"))
+            .values("count")
+        ),
+        0,
+    )
+
+
+def repair_subtask_counters(tickets=None):
+    """Recompute the counters of ``tickets`` (all tickets by default)
+    that disagree with their subtasks, and return how many were fixed."""
+    tickets = Ticket.objects.all() if tickets is None else tickets
+    stale = list(
+        tickets.annotate(
+            real_total=_subtask_count(), real_done=_subtask_count(is_done=True)
+        )
+        .filter(
+            ~Q(subtasks_total=F("real_total"))
+            | ~Q(subtasks_done=F("real_done"))
+        )
+        .values_list("pk", flat=True)
+    )
+
+    now = timezone.now()
+    for start in range(0, len(stale), REPAIR_BATCH_SIZE):
+        Ticket.objects.filter(
+            pk__in=stale[start : start + REPAIR_BATCH_SIZE]
+        ).update(
+            subtasks_total=_subtask_count(),
+            subtasks_done=_subtask_count(is_done=True),
+            updated_at=now,
+        )
+
+    return len(stale)
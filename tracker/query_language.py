@@ -0,0 +1,324 @@
+"""A small query language for saved ticket filters.
+
+Queries look like ``status in (open, in_progress) and priority >= high
+and assignee = me``. ``parse`` turns the text into a plan: nested tuples
+that hold only validated lookups and values, so plans can be cached and
+turned into a ``Q`` for any user by ``to_q`` without parsing again.
+
+Supported fields and operators:
+
+* ``status``, ``priority``: ``= != < <= > >= in``, ordered as in the
+  model choices, so ``priority >= high`` means high or critical;
+* ``type``: ``= != in``;
+* ``assignee``, ``creator``: ``= != in`` with ``me``, ``none`` or an email;
+* ``project``: ``= != in`` with a project title;
+* ``due``, ``created``, ``updated``: ``= != < <= > >=`` with a
+  ``YYYY-MM-DD`` date, and ``due = none``;
+* ``title``, ``description``: ``=`` and ``~`` (contains).
+
+Terms combine with ``and``, ``or``, ``not`` and parentheses; ``and``
+binds tighter than ``or``.
+"""
+
+import hashlib
+import re
+from datetime import date, timedelta
+from functools import reduce
+from operator import and_, or_
+
+from django.core.cache import cache
+from django.db.models import Q
+
+from .filters import start_of_day
+from .models import Ticket
+
+# Part of every cached plan key: bump it whenever the plan format changes.
+PLAN_SCHEMA = 2
+PLAN_TIMEOUT = 60 * 60 * 24
+
+KEYWORDS = {"and", "or", "not", "in"}
+ORDERING_OPERATORS = {"<", "<=", ">", ">="}
+
+TOKEN_RE = re.compile(
+    r"""\s*(?:
+        (?P<punct>[(),])
+        | (?P<op>!=|>=|<=|=|<|>|~)
+        | "(?P<string>(?:[^"\\]|\\.)*)"
+        | (?P<word>[^\s(),!=<>~"]+)
+    )""",
+    re.VERBOSE,
+)
+
+
+class QuerySyntaxError(ValueError):
+    pass
+
+
+def _choice_field(lookup, choices, ordered):
+    return {
+        "kind": "choice",
+        "lookup": lookup,
+        "values": [key for key, _ in choices],
+        "ordered": ordered,
+    }
+
+
+FIELDS = {
+    "status": _choice_field("status", Ticket.STATUS_CHOICES, ordered=True),
+    "priority": _choice_field(
+        "priority", Ticket.PRIORITY_CHOICES, ordered=True
+    ),
+    "type": _choice_field("ticket_type", Ticket.TYPE_CHOICES, ordered=False),
+    "assignee": {"kind": "user", "lookup": "assignee"},
+    "creator": {"kind": "user", "lookup": "creator"},
+    "project": {"kind": "project", "lookup": "project__title__iexact"},
+    "due": {"kind": "date", "lookup": "due_date", "nullable": True},
+    "created": {"kind": "date", "lookup": "created_at", "nullable": False},
+    "updated": {"kind": "date", "lookup": "updated_at", "nullable": False},
+    "title": {"kind": "text", "lookup": "title"},
+    "description": {"kind": "text", "lookup": "description"},
+}
+
+
+def _tokenize(text):
+    tokens, position = [], 0
+    text = text.rstrip()
+    while position < len(text):
+        match = TOKEN_RE.match(text, position)
+        if match is None:
+            raise QuerySyntaxError(
+                f"Unexpected character at position {position + 1}"
+            )
+        kind = match.lastgroup
+        value, start = match.group(kind), match.start(kind)
+        if kind == "string":
+            value = re.sub(r"\\(.)", r"\1", value)
+        elif kind == "word" and value.lower() in KEYWORDS:
+            kind, value = "keyword", value.lower()
+        tokens.append((kind, value, start + 1))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    def __init__(self, text):
+        self.tokens = _tokenize(text)
+        self.index = 0
+
+    def peek(self):
+        if self.index < len(self.tokens):
+            return self.tokens[self.index]
+        return (None, None, None)
+
+    def take(self, kind=None, value=None):
+        token = self.peek()
+        if token[0] is None:
+            raise QuerySyntaxError("Unexpected end of query")
+        if (kind and token[0] != kind) or (value and token[1] != value):
+            raise QuerySyntaxError(
+                f"Unexpected {token[1]!r} at position {token[2]}"
+            )
+        self.index += 1
+        return token
+
+    def at(self, kind, value=None):
+        token = self.peek()
+        return token[0] == kind and (value is None or token[1] == value)
+
+    def parse(self):
+        if not self.tokens:
+            raise QuerySyntaxError("The query is empty")
+        plan = self.disjunction()
+        if self.peek()[0] is not None:
+            token = self.peek()
+            raise QuerySyntaxError(
+                f"Unexpected {token[1]!r} at position {token[2]}"
+            )
+        return plan
+
+    def disjunction(self):
+        terms = [self.conjunction()]
+        while self.at("keyword", "or"):
+            self.take()
+            terms.append(self.conjunction())
+        return terms[0] if len(terms) == 1 else ("or", tuple(terms))
+
+    def conjunction(self):
+        terms = [self.negation()]
+        while self.at("keyword", "and"):
+            self.take()
+            terms.append(self.negation())
+        return terms[0] if len(terms) == 1 else ("and", tuple(terms))
+
+    def negation(self):
+        if self.at("keyword", "not"):
+            self.take()
+            return ("not", self.negation())
+        if self.at("punct", "("):
+            self.take()
+            plan = self.disjunction()
+            self.take("punct", ")")
+            return plan
+        return self.comparison()
+
+    def comparison(self):
+        _, name, position = self.take("word")
+        field = FIELDS.get(name.lower())
+        if field is None:
+            raise QuerySyntaxError(
+                f"Unknown field {name!r} at position {position}"
+            )
+
+        negated = False
+        if self.at("keyword", "not"):
+            self.take()
+            negated = True
+            self.take("keyword", "in")
+            operator = "in"
+        elif self.at("keyword", "in"):
+            self.take()
+            operator = "in"
+        else:
+            operator = self.take("op")[1]
+
+        if operator == "in":
+            values = self.value_list()
+            plan = (
+                "or",
+                tuple(_compare(field, name, "=", value) for value in values),
+            )
+            if field["kind"] == "choice":
+                # One IN lookup instead of a chain of ORs.
+                plan = _match(
+                    f"{field['lookup']}__in",
+                    tuple(dict.fromkeys(match[2] for match in plan[1])),
+                )
+        else:
+            plan = _compare(field, name, operator, self.value())
+        return ("not", plan) if negated else plan
+
+    def value(self):
+        kind, value, position = self.take()
+        if kind not in ("word", "string"):
+            raise QuerySyntaxError(
+                f"Expected a value at position {position}, got {value!r}"
+            )
+        return value
+
+    def value_list(self):
+        self.take("punct", "(")
+        values = [self.value()]
+        while self.at("punct", ","):
+            self.take()
+            values.append(self.value())
+        self.take("punct", ")")
+        return values
+
+
+def _match(lookup, value):
+    return ("match", lookup, value)
+
+
+def _compare(field, name, operator, value):
+    kind = field["kind"]
+    if operator == "!=":
+        return ("not", _compare(field, name, "=", value))
+
+    if kind == "choice":
+        choices = field["values"]
+        value = value.lower()
+        if value not in choices:
+            raise QuerySyntaxError(
+                f"{name} must be one of {', '.join(choices)}, not {value!r}"
+            )
+        if operator == "=":
+            return _match(field["lookup"], value)
+        if operator in ORDERING_OPERATORS and field["ordered"]:
+            at = choices.index(value)
+            selected = {
+                "<": choices[:at],
+                "<=": choices[: at + 1],
+                ">": choices[at + 1 :],
+                ">=": choices[at:],
+            }[operator]
+            return _match(f"{field['lookup']}__in", tuple(selected))
+
+    elif kind == "user" and operator == "=":
+        if value.lower() == "me":
+            # Bound to the user running the query by ``to_q``.
+            return ("me", field["lookup"])
+        if value.lower() in ("none", "empty"):
+            return _match(f"{field['lookup']}__isnull", True)
+        return _match(f"{field['lookup']}__email__iexact", value)
+
+    elif kind == "project" and operator == "=":
+        return _match(field["lookup"], value)
+
+    elif kind == "date" and operator != "~":
+        lookup = field["lookup"]
+        if value.lower() in ("none", "empty") and operator == "=":
+            if field["nullable"]:
+                return _match(f"{lookup}__isnull", True)
+        else:
+            try:
+                day = date.fromisoformat(value)
+            except ValueError:
+                raise QuerySyntaxError(
+                    f"{name} needs a YYYY-MM-DD date, not {value!r}"
+                ) from None
+            start = start_of_day(day)
+            end = start_of_day(day + timedelta(days=1))
+            # Half-open ranges keep the due date indexes usable.
+            bounds = {
+                "=": (start, end),
+                "<": (None, start),
+                "<=": (None, end),
+                ">": (end, None),
+                ">=": (start, None),
+            }[operator]
+            return (
+                "and",
+                tuple(
+                    _match(f"{lookup}__{suffix}", bound)
+                    for suffix, bound in zip(
+                        ("gte", "lt"), bounds, strict=True
+                    )
+                    if bound is not None
+                ),
+            )
+
+    elif kind == "text" and operator in ("=", "~"):
+        suffix = "iexact" if operator == "=" else "icontains"
+        return _match(f"{field['lookup']}__{suffix}", value)
+
+    raise QuerySyntaxError(f"{name} does not support {operator!r} {value!r}")
+
+
+def parse(text):
+    """Parse ``text`` into a plan, raising ``QuerySyntaxError``."""
+    return _Parser(text).parse()
+
+
+def get_plan(text):
+    """Return the plan of ``text``, parsing it at most once per day."""
+    digest = hashlib.sha256(text.encode()).hexdigest()
+    key = f"tracker:query-plan:{PLAN_SCHEMA}:{digest}"
+    plan = cache.get(key)
+    if plan is None:
+        plan = parse(text)
+        cache.set(key, plan, PLAN_TIMEOUT)
+    return plan
+
+
+def to_q(plan, user):
+    """Turn ``plan`` into a ``Q``, with ``me`` meaning ``user``."""
+    kind = plan[0]
+    if kind == "match":
+        _, lookup, value = plan
+        return Q(**{lookup: value})
+    if kind == "me":
+        return Q(**{plan[1]: user.pk})
+    if kind == "not":
+        return ~to_q(plan[1], user)
+    children = [to_q(child, user) for child in plan[1]]
+    return reduce(and_ if kind == "and" else or_, children)
@@ -0,0 +1,152 @@
+"""Lexicographic ranks for ordering cards inside a Kanban column.
+
+A rank is a base-36 string compared as plain text. Moving a card means
+computing one new rank strictly between its new neighbours, so only the
+moved row is written. Repeated inserts at the same spot make ranks grow
+by roughly one character per five moves (one per ~35 when appending);
+``rebalance_column`` rewrites a column with short, evenly spaced ranks
+once they get too long.
+
+Only digits and lowercase letters are used so the order is the same
+under the C collation and the usual locale collations.
+"""
+
+from django.db.models import Max
+from django.db.models.functions import Length
+
+ALPHABET = "0123456789abcdefghijklmnopqrstuvwxyz"
+BASE = len(ALPHABET)
+
+RANK_MAX_LENGTH = 64
+REBALANCE_LENGTH = 32
+
+
+def rank_between(before="", after=""):
+    """Return a rank sorting strictly between ``before`` and ``after``.
+
+    An empty string means the column has no card on that side.
+    """
+    if before and after:
+        if before >= after:
+            raise ValueError(f"{before!r} must sort before {after!r}")
+        return _midpoint(before, after)
+    if before:
+        return _increment(before)
+    if after:
+        return _decrement(after)
+    return ALPHABET[BASE // 2]
+
+
+def _midpoint(before, after):
+    rank = []
+    i = 0
+    while True:
+        low = ALPHABET.index(before[i]) if i < len(before) else 0
+        high = ALPHABET.index(after[i]) if i < len(after) else BASE
+
+        if high - low > 1:
+            rank.append(ALPHABET[(low + high) // 2])
+            return "".join(rank)
+
+        rank.append(ALPHABET[low])
+        if high - low == 1:
+            # Anything longer than this prefix already sorts before
+            # ``after``, so only ``before`` constrains the next digits.
+            after = ""
+        i += 1
+
+
+def _increment(rank):
+    # Appending is by far the most common move, so bump the shallowest
+    # digit that has room instead of halving the gap to the end.
+    for i, char in enumerate(rank):
+        if char != ALPHABET[-1]:
+            return rank[:i] + ALPHABET[ALPHABET.index(char) + 1]
+    return rank + ALPHABET[1]
+
+
+def _decrement(rank):
+    for i, char in enumerate(rank):
+        # Never produce a trailing "0": nothing could sort before it.
+        if ALPHABET.index(char) > 1:
+            return rank[:i] + ALPHABET[ALPHABET.index(char) - 1]
+    return _midpoint("", rank)
+
+
+def evenly_spaced_ranks(count):
+    """Return ``count`` short, increasing ranks spread over the key space."""
+    width = 1
+    while BASE**width <= count:
+        width += 1
+
+    step = BASE**width / (count + 1)
+    ranks = []
+    for position in range(1, count + 1):
+        value = int(step * position)
+        digits = []
+        for _ in range(width):
+            value, digit = divmod(value, BASE)
+            digits.append(ALPHABET[digit])
+        ranks.append("".join(reversed(digits)).rstrip("0"))
+
+    return ranks
+
+
+def rebalance_column(tickets):
+    """Rewrite the ranks of one column, keeping the current card order.
+
+    ``tickets`` is a queryset holding exactly the cards of that column.
+    """
+    tickets = list(tickets.only("id", "rank").order_by("rank", "id"))
+    for ticket, rank in zip(
+        tickets, evenly_spaced_ranks(len(tickets)), strict=True
+    ):
+        ticket.rank = rank
+
+    if tickets:
+        type(tickets[0]).objects.bulk_update(tickets, ["rank"], batch_size=500)
+
+    return len(tickets)
+
+
+def rank_in_column(column, before_id=None, after_id=None):
+    """Return the rank for a card dropped between two cards of ``column``.
+
+    ``before_id`` and ``after_id`` are the neighbouring card ids, ``None``
+    at either end; with neither the card goes last. The column is
+    compacted first if the new rank would not fit in the field, or if
+    the neighbours share a rank, as two cards created at the same time
+    can.
+    """
+    for _ in range(2):
+        if before_id is None and after_id is None:
+            before = column.aggregate(last=Max("rank"))["last"] or ""
+            after = ""
+        else:
+            ranks = dict(
+                column.filter(id__in=[before_id, after_id]).values_list(
+                    "id", "rank"
+                )
+            )
+            before = ranks.get(before_id, "")
+            after = ranks.get(after_id, "")
+
+        if not (before and after and before >= after):
+            rank = rank_between(before, after)
+            if len(rank) <= RANK_MAX_LENGTH:
+                return rank
+        rebalance_column(column)
+
+    raise ValueError("Column ranks are still invalid after rebalancing")
+
+
+def columns_to_rebalance(tickets, length=REBALANCE_LENGTH):
+    """Return ``(project_id, status)`` pairs among ``tickets`` whose
+    longest rank is over ``length`` characters."""
+    return list(
+        tickets.values("project_id", "status")
+        .annotate(longest=Max(Length("rank")))
+        .filter(longest__gt=length)
+        .values_list("project_id", "status")
+        .order_by()
+    )
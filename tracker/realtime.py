@@ -0,0 +1,136 @@
+"""Push board changes to connected browsers.
+
+Views publish small JSON deltas per project; ``event_stream`` turns a
+subscription into a Server-Sent Events body. The broker is pluggable via
+``TRACKER_EVENTS_BROKER``: ``RedisBroker`` fans out across workers and
+hosts, ``InMemoryBroker`` only within one process (tests, runserver).
+
+Streams are long-lived, so they must be served by an ASGI server; under
+WSGI every open board would pin a worker.
+"""
+
+import asyncio
+import functools
+import json
+import logging
+import threading
+
+import redis
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+from redis import asyncio as aioredis
+
+logger = logging.getLogger(__name__)
+
+KEEPALIVE_SECONDS = 15
+
+
+class InMemoryBroker:
+    """Process-local fan-out; publishers may run in any thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}
+
+    def publish(self, channel, message):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(queue.put_nowait, message)
+
+    async def subscribe(self, channel):
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue())
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(subscriber)
+        try:
+            while True:
+                yield await subscriber[1].get()
+        finally:
+            with self._lock:
+                self._subscribers[channel].discard(subscriber)
+                if not self._subscribers[channel]:
+                    del self._subscribers[channel]
+
+
+class RedisBroker:
+    """Fan-out over Redis pub/sub, shared by every worker."""
+
+    def __init__(self, url=None):
+        self.url = url or settings.TRACKER_EVENTS_REDIS_URL
+        self._client = None
+
+    def publish(self, channel, message):
+        if self._client is None:
+            self._client = redis.Redis.from_url(self.url)
+        self._client.publish(channel, message)
+
+    async def subscribe(self, channel):
+        client = aioredis.Redis.from_url(self.url)
+        pubsub = client.pubsub()
+        await pubsub.subscribe(channel)
+        try:
+            async for item in pubsub.listen():
+                if item["type"] == "message":
+                    yield item["data"].decode()
+        finally:
+            await pubsub.unsubscribe(channel)
+            await pubsub.aclose()
+            await client.aclose()
+
+
+@functools.cache
+def get_broker():
+    return import_string(settings.TRACKER_EVENTS_BROKER)()
+
+
+@receiver(setting_changed)
+def _reset_broker(setting, **kwargs):
+    if setting in ("TRACKER_EVENTS_BROKER", "TRACKER_EVENTS_REDIS_URL"):
+        get_broker.cache_clear()
+
+
+def board_channel(project_id):
+    return f"tracker:board:{project_id}"
+
+
+def publish_board_event(project_id, event_type, **payload):
+    """Send ``payload`` to everyone watching the board once the current
+    transaction commits. Delivery is best effort."""
+    message = json.dumps({"type": event_type, **payload})
+
+    def send():
+        try:
+            get_broker().publish(board_channel(project_id), message)
+        except Exception:
+            logger.exception("Could not publish board event")
+
+    transaction.on_commit(send)
+
+
+async def event_stream(channel):
+    """Yield Server-Sent Events for ``channel``, with periodic keepalives
+    so proxies do not close idle connections."""
+    yield "retry: 3000\n\n"
+
+    subscription = get_broker().subscribe(channel)
+    next_message = asyncio.ensure_future(anext(subscription))
+    try:
+        while True:
+            done, _ = await asyncio.wait(
+                {next_message}, timeout=KEEPALIVE_SECONDS
+            )
+            if not done:
+                yield ": keepalive\n\n"
+                continue
+
+            yield f"data: {next_message.result()}\n\n"
+            next_message = asyncio.ensure_future(anext(subscription))
+    finally:
+        # Let the pending read unwind before closing the subscription;
+        # closing a generator that is still awaiting raises.
+        next_message.cancel()
+        await asyncio.gather(next_message, return_exceptions=True)
+        await subscription.aclose()
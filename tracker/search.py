@@ -0,0 +1,164 @@
+"""Full-text ticket search over titles, descriptions and comments.
+
+On Postgres every ticket keeps a weighted ``search_vector`` (title A,
+description B, comments C) behind a GIN index, refreshed whenever one of
+those texts changes. Other backends fall back to ``LIKE`` matching, which
+is fine for tests and small installs.
+"""
+
+import re
+
+from django.contrib.postgres.search import (
+    SearchHeadline,
+    SearchQuery,
+    SearchRank,
+)
+from django.db import connection, transaction
+from django.db.models import F, Q, TextField, Value
+from django.db.models.functions import Concat
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .models import Comment, Project
+
+SEARCH_CONFIG = "english"
+SNIPPET_WORDS = 30
+
+# Refreshes the vector of the tickets whose ids are passed as an array.
+REFRESH_SEARCH_VECTORS_SQL = f"""
+UPDATE tracker_ticket AS t
+SET search_vector =
+    setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(t.title, '')), 'A')
+    || setweight(
+        to_tsvector('{SEARCH_CONFIG}', coalesce(t.description, '')), 'B'
+    )
+    || setweight(to_tsvector('{SEARCH_CONFIG}', coalesce((
+        SELECT string_agg(c.text, ' ')
+        FROM tracker_comment AS c
+        WHERE c.ticket_id = t.id
+    ), '')), 'C')
+WHERE t.id = ANY(%s)
+"""  # nosec B608 - constant SQL, ids are a parameter
+
+# Private-use markers that cannot appear in user text; they are swapped
+# for <mark> only after the snippet has been escaped.
+_START, _STOP = "\ue000", "\ue001"
+
+
+def uses_search_vectors():
+    return connection.vendor == "postgresql"
+
+
+def refresh_search_vectors(ticket_ids):
+    ticket_ids = list(ticket_ids)
+    if ticket_ids and uses_search_vectors():
+        with connection.cursor() as cursor:
+            cursor.execute(REFRESH_SEARCH_VECTORS_SQL, [ticket_ids])
+
+
+class _PendingRefresh:
+    def __init__(self):
+        self.ticket_ids = set()
+
+    def __call__(self):
+        if getattr(connection, "_pending_search_refresh", None) is self:
+            connection._pending_search_refresh = None
+        refresh_search_vectors(self.ticket_ids)
+
+
+def refresh_search_vectors_on_commit(ticket_ids):
+    """Refresh the vectors of ``ticket_ids`` when the transaction commits,
+    together with every other ticket queued in the same transaction."""
+    pending = getattr(connection, "_pending_search_refresh", None)
+    # A rolled back block drops its callbacks; start a new batch then.
+    if pending is None or not any(
+        callback is pending for _, callback, _ in connection.run_on_commit
+    ):
+        pending = connection._pending_search_refresh = _PendingRefresh()
+        pending.ticket_ids.update(ticket_ids)
+        transaction.on_commit(pending)
+    else:
+        pending.ticket_ids.update(ticket_ids)
+
+
+def visible_projects(user):
+    return Project.objects.filter(
+        Q(owner=user)
+        | Q(
+            id__in=Project.members.through.objects.filter(
+                ticketsuser_id=user.id
+            ).values("project_id")
+        )
+    )
+
+
+def _snippet_source():
+    return Concat("title", Value(" "), "description", output_field=TextField())
+
+
+def search_tickets(tickets, query):
+    """Filter ``tickets`` down to matches for ``query``, best first.
+
+    Each result carries a ``snippet`` annotation with the matched words
+    wrapped in private markers; pass it through ``highlight``.
+    """
+    if uses_search_vectors():
+        search = SearchQuery(
+            query, config=SEARCH_CONFIG, search_type="websearch"
+        )
+        return (
+            tickets.filter(search_vector=search)
+            .annotate(
+                search_rank=SearchRank(F("search_vector"), search),
+                snippet=SearchHeadline(
+                    _snippet_source(),
+                    search,
+                    config=SEARCH_CONFIG,
+                    start_sel=_START,
+                    stop_sel=_STOP,
+                    max_words=SNIPPET_WORDS,
+                    min_words=SNIPPET_WORDS // 2,
+                ),
+            )
+            .order_by("-search_rank", "-id")
+        )
+
+    for term in query.split():
+        tickets = tickets.filter(
+            Q(title__icontains=term)
+            | Q(description__icontains=term)
+            | Q(
+                id__in=Comment.objects.filter(text__icontains=term).values(
+                    "ticket_id"
+                )
+            )
+        )
+    return tickets.annotate(snippet=_snippet_source()).order_by(
+        "-updated_at", "-id"
+    )
+
+
+def highlight(snippet, query):
+    """Return ``snippet`` as safe HTML with the matched words in <mark>."""
+    snippet = snippet or ""
+    if _START not in snippet:
+        # LIKE backend: mark the terms ourselves in a window that starts
+        # just before the first match.
+        terms = [re.escape(term) for term in query.split()]
+        pattern = re.compile(f"({'|'.join(terms)})", re.IGNORECASE)
+        words = snippet.split()
+        first = next(
+            (
+                i
+                for i, word in enumerate(words)
+                if terms and pattern.search(word)
+            ),
+            0,
+        )
+        start = max(0, first - SNIPPET_WORDS // 4)
+        snippet = " ".join(words[start : start + SNIPPET_WORDS])
+        if terms:
+            snippet = pattern.sub(f"{_START}\\1{_STOP}", snippet)
+
+    html = escape(snippet).replace(_START, "<mark>").replace(_STOP, "</mark>")
+    return mark_safe(html)  # nosec B308 - escaped above
@@ -0,0 +1,158 @@
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .access import forget_access
+from .blobs import add_blob_ref, drop_blob_ref
+from .cache import invalidate
+from .models import (
+    Attachment,
+    Comment,
+    Project,
+    SubTask,
+    Ticket,
+    TrackerGroup,
+)
+from .progress import adjust_subtask_counters
+from .search import refresh_search_vectors, refresh_search_vectors_on_commit
+
+
+def _deleted_directly(sender, origin):
+    # False when the row goes because a parent row is being deleted.
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return issubclass(model, sender)
+
+
+def _invalidate(callback, *args):
+    # Drop the entry right away and again once the transaction commits,
+    # so a concurrent request cannot re-cache pre-commit state.
+    callback(*args)
+    transaction.on_commit(lambda: callback(*args))
+
+
+@receiver(post_save, sender=TrackerGroup)
+@receiver(post_delete, sender=TrackerGroup)
+def group_changed(sender, instance, **kwargs):
+    _invalidate(invalidate, "group", instance.pk)
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def project_changed(sender, instance, **kwargs):
+    _invalidate(invalidate, "project", instance.pk)
+    if instance.attached_group_id:
+        _invalidate(invalidate, "group", instance.attached_group_id)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=Attachment)
+@receiver(post_delete, sender=Attachment)
+@receiver(post_save, sender=SubTask)
+def ticket_part_changed(sender, instance, **kwargs):
+    _invalidate(invalidate, "ticket", instance.ticket_id)
+
+
+@receiver(post_save, sender=SubTask)
+def subtask_saved(sender, instance, created, **kwargs):
+    was_done = False if created else getattr(instance, "_stored_is_done", None)
+    if was_done is None:
+        # Not loaded from the database; the previous state is unknown.
+        return
+    adjust_subtask_counters(
+        instance.ticket_id,
+        total=int(created),
+        done=int(instance.is_done) - int(was_done),
+    )
+    instance._stored_is_done = instance.is_done
+
+
+@receiver(post_delete, sender=SubTask)
+def subtask_deleted(sender, instance, origin, **kwargs):
+    # Cascades take the ticket with them; queryset deletes are bulk
+    # edits whose callers repair the counters and drop the cache once.
+    if not isinstance(origin, SubTask):
+        return
+    _invalidate(invalidate, "ticket", instance.ticket_id)
+    was_done = getattr(instance, "_stored_is_done", None)
+    if was_done is None:
+        was_done = instance.is_done
+    adjust_subtask_counters(instance.ticket_id, total=-1, done=-int(was_done))
+
+
+@receiver(post_save, sender=Attachment)
+def attachment_saved(sender, instance, created, **kwargs):
+    name = instance.attached_file.name
+    stored = None if created else getattr(instance, "_stored_file", name)
+    if name != stored:
+        drop_blob_ref(stored)
+        add_blob_ref(name)
+    instance._stored_file = name
+
+
+@receiver(post_delete, sender=Attachment)
+def attachment_deleted(sender, instance, **kwargs):
+    stored = getattr(instance, "_stored_file", None)
+    drop_blob_ref(stored or instance.attached_file.name)
+
+
+@receiver(post_save, sender=Ticket)
+@receiver(post_delete, sender=Ticket)
+def ticket_changed(sender, instance, **kwargs):
+    # Saved filter counts are cached per project version.
+    _invalidate(invalidate, "project_tickets", instance.project_id)
+
+
+@receiver(post_save, sender=Ticket)
+def ticket_saved(sender, instance, update_fields, **kwargs):
+    # Board moves only touch status and rank; skip the vector for those.
+    if update_fields is None or {"title", "description"} & set(update_fields):
+        refresh_search_vectors([instance.pk])
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, **kwargs):
+    refresh_search_vectors_on_commit([instance.ticket_id])
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, origin, **kwargs):
+    # Skip cascades: a deleted ticket needs no vector, and re-reading
+    # the remaining comments once per deleted row is quadratic. Text of
+    # a deleted author lingers until the ticket's next refresh.
+    if _deleted_directly(sender, origin):
+        refresh_search_vectors_on_commit([instance.ticket_id])
+
+
+def _members_changed(kind, related_name, instance, action, reverse, pk_set):
+    if action == "pre_clear":
+        # The rows are about to disappear, so look up who is affected now.
+        related = (
+            getattr(instance, related_name) if reverse else instance.members
+        )
+        pk_set = set(related.values_list("pk", flat=True))
+    elif action not in ("post_add", "post_remove"):
+        return
+
+    if reverse:
+        user_ids, pks = [instance.pk], list(pk_set)
+    else:
+        user_ids, pks = list(pk_set), [instance.pk]
+
+    _invalidate(invalidate, kind, *pks)
+    _invalidate(forget_access, kind, user_ids, pks)
+
+
+@receiver(m2m_changed, sender=TrackerGroup.members.through)
+def group_members_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    _members_changed(
+        "group", "attached_groups", instance, action, reverse, pk_set
+    )
+
+
+@receiver(m2m_changed, sender=Project.members.through)
+def project_members_changed(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    _members_changed("project", "projects", instance, action, reverse, pk_set)
@@ -4,15 +4,29 @@ const suggestionsBox = document.getElementById("suggestionsBox");
 const selectedEmails = document.getElementById("selectedEmails");
 const emailsHidden = document.getElementById("emailsHidden");
 
+// Wait for a pause in typing before asking the server.
+const AUTOCOMPLETE_DELAY_MS = 200;
+
 let emails = [];
-emailInput.addEventListener("input", async () => {
+let autocompleteTimer = null;
+let latestQuery = "";
+
+emailInput.addEventListener("input", () => {
+    clearTimeout(autocompleteTimer);
+    autocompleteTimer = setTimeout(suggestEmails, AUTOCOMPLETE_DELAY_MS);
+});
+
+async function suggestEmails() {
     const query = emailInput.value;
+    latestQuery = query;
     if (query.length < 2) {
         suggestionsBox.style.display = "none";
         return;
     }
 
-    const response = await fetch(`${autocompleteUrl}?q=${query}`);
+    const response = await fetch(`${autocompleteUrl}?q=${encodeURIComponent(query)}`);
+    // Throttled, or overtaken by a newer query: keep the current list.
+    if (!response.ok || query !== latestQuery) return;
     const data = await response.json();
 
     suggestionsBox.innerHTML = "";
@@ -28,7 +42,7 @@ emailInput.addEventListener("input", async () => {
     } else {
         suggestionsBox.style.display = "none";
     }
-});
+}
 
 function addEmail(email) {
     if (emails.includes(email)) return;
@@ -17,7 +17,7 @@ document.addEventListener('DOMContentLoaded', () => {
     const board = document.getElementById('kanban-board');
     if (!board) return;
     
-    const updateUrl = board.dataset.updateUrl;
+    const batchUpdateUrl = board.dataset.batchUpdateUrl;
     const columns = board.querySelectorAll('.kanban-column');
     
     let draggedCard = null;
@@ -26,10 +26,191 @@ document.addEventListener('DOMContentLoaded', () => {
     const csrftoken = getCookie('csrftoken');
     console.log('CSRF Token loaded:', csrftoken ? `Length: ${csrftoken.length}` : 'NOT FOUND');
 
+    function loadMoreCards(column) {
+        const cursor = column.dataset.nextCursor;
+        if (!cursor || column.dataset.loading === 'true') return;
+
+        column.dataset.loading = 'true';
+        // Later pages must match the filters the board was rendered with.
+        const params = new URLSearchParams(board.dataset.filterQuery || '');
+        params.set('after', cursor);
+        const url = `${column.dataset.columnUrl}?${params}`;
+
+        fetch(url, { headers: { 'Accept': 'application/json' } })
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error(`HTTP error! status: ${response.status}`);
+                }
+                return response.json();
+            })
+            .then(data => {
+                const template = document.createElement('template');
+                template.innerHTML = data.html;
+                template.content.querySelectorAll('.kanban-card').forEach(card => {
+                    // A card dropped here earlier may also come back in a later page.
+                    if (!board.querySelector(`.kanban-card[data-task-id="${card.dataset.taskId}"]`)) {
+                        column.querySelector('.kanban-cards').appendChild(card);
+                    }
+                });
+                column.dataset.nextCursor = data.next_cursor ?? '';
+                column.dataset.loading = 'false';
+
+                // Re-observing fires a fresh callback if the sentinel is still visible.
+                const sentinel = column.querySelector('.kanban-sentinel');
+                observer.unobserve(sentinel);
+                observer.observe(sentinel);
+            })
+            .catch(err => {
+                console.error('Error loading cards:', err);
+                column.dataset.loading = 'false';
+            });
+    }
+
+    const observer = new IntersectionObserver(entries => {
+        entries.forEach(entry => {
+            if (entry.isIntersecting) {
+                loadMoreCards(entry.target.closest('.kanban-column'));
+            }
+        });
+    }, { root: null, rootMargin: '200px' });
+
+    board.querySelectorAll('.kanban-sentinel').forEach(sentinel => observer.observe(sentinel));
+
+    // Drops made within this window are sent to the server as one batch.
+    const BATCH_DELAY_MS = 300;
+    let pendingMoves = new Map();
+    let flushTimer = null;
+
+    function cardBelowPointer(container, draggedCard, y) {
+        const cards = [...container.querySelectorAll('.kanban-card')].filter(card => card !== draggedCard);
+        return cards.find(card => {
+            const box = card.getBoundingClientRect();
+            return y < box.top + box.height / 2;
+        }) || null;
+    }
+
+    function neighbourId(card, direction) {
+        const sibling = direction === 'before' ? card.previousElementSibling : card.nextElementSibling;
+        return sibling && sibling.classList.contains('kanban-card') ? sibling.dataset.taskId : null;
+    }
+
+    function queueMove(card, status, originColumn) {
+        const taskId = card.dataset.taskId;
+        const pending = pendingMoves.get(taskId);
+        // Re-queueing moves the card to the end of the batch, matching the
+        // order in which the server applies the moves.
+        pendingMoves.delete(taskId);
+        pendingMoves.set(taskId, {
+            card,
+            status,
+            beforeId: neighbourId(card, 'before'),
+            afterId: neighbourId(card, 'after'),
+            // Keep the column the card started in so a failed batch reverts all the way.
+            originColumn: pending ? pending.originColumn : originColumn,
+        });
+
+        clearTimeout(flushTimer);
+        flushTimer = setTimeout(flushMoves, BATCH_DELAY_MS);
+    }
+
+    function revertMove(move) {
+        move.originColumn.querySelector('.kanban-cards').appendChild(move.card);
+    }
+
+    function flushMoves() {
+        clearTimeout(flushTimer);
+        const batch = pendingMoves;
+        pendingMoves = new Map();
+        if (batch.size === 0) return;
+
+        const moves = Array.from(batch, ([taskId, move]) => ({
+            task_id: taskId,
+            status: move.status,
+            before_id: move.beforeId,
+            after_id: move.afterId,
+        }));
+
+        fetch(batchUpdateUrl, {
+            method: 'POST',
+            keepalive: true,
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': csrftoken,
+            },
+            body: JSON.stringify({ moves })
+        })
+        .then(response => {
+            if (!response.ok) {
+                throw new Error(`HTTP error! status: ${response.status}`);
+            }
+            return response.json();
+        })
+        .then(data => {
+            if (!data.success) {
+                throw new Error(data.error || 'Update failed');
+            }
+            data.updated.forEach(result => {
+                const move = batch.get(String(result.task_id));
+                const badge = move && move.card.querySelector('.badge');
+                if (badge) {
+                    badge.textContent = result.status_display;
+                }
+            });
+            data.missing.forEach(taskId => {
+                const move = batch.get(String(taskId));
+                if (move) revertMove(move);
+            });
+        })
+        .catch(err => {
+            console.error('Error updating task status:', err);
+            batch.forEach(revertMove);
+        });
+    }
+
+    window.addEventListener('pagehide', flushMoves);
+
+    function applyCard(data) {
+        const taskId = String(data.task_id);
+        const existing = board.querySelector(`.kanban-card[data-task-id="${taskId}"]`);
+        // A drop that is still queued here is newer than what the server sent.
+        if (pendingMoves.has(taskId) || (existing && existing === draggedCard)) return;
+
+        const column = board.querySelector(`.kanban-column[data-status="${data.status}"]`);
+        // A filtered board cannot tell whether a card it has not shown
+        // matches its filters, so it only refreshes the cards it has.
+        if (!existing && board.dataset.filterQuery) return;
+        if (existing) existing.remove();
+        if (!column) return;
+
+        const container = column.querySelector('.kanban-cards');
+        const next = [...container.querySelectorAll('.kanban-card')].find(card =>
+            card.dataset.rank > data.rank ||
+            (card.dataset.rank === data.rank && Number(card.dataset.taskId) > data.task_id)
+        );
+        // Past the last loaded card the next page will bring it in.
+        if (!next && column.dataset.nextCursor) return;
+
+        const template = document.createElement('template');
+        template.innerHTML = data.html.trim();
+        container.insertBefore(template.content.firstElementChild, next || null);
+    }
+
+    if (board.dataset.eventsUrl && window.EventSource) {
+        // The browser reconnects on its own after the retry delay the server sends.
+        const events = new EventSource(board.dataset.eventsUrl);
+        events.addEventListener('message', e => {
+            const event = JSON.parse(e.data);
+            if (event.type === 'cards') {
+                event.cards.forEach(applyCard);
+            }
+        });
+        window.addEventListener('pagehide', () => events.close());
+    }
+
     board.addEventListener('dragstart', e => {
         if (e.target.classList.contains('kanban-card')) {
             draggedCard = e.target;
-            oldColumn = draggedCard.parentElement;
+            oldColumn = draggedCard.closest('.kanban-column');
             setTimeout(() => draggedCard.style.opacity = '0.5', 0);
         }
     });
@@ -55,52 +236,19 @@ document.addEventListener('DOMContentLoaded', () => {
             column.classList.remove('drag-over');
             if (!draggedCard) return;
 
-            const taskId = draggedCard.dataset.taskId;
-            const newStatus = column.dataset.status;
+            const card = draggedCard;
+            const originColumn = oldColumn;
+            const container = column.querySelector('.kanban-cards');
 
-            column.appendChild(draggedCard);
+            container.insertBefore(card, cardBelowPointer(container, card, e.clientY));
 
             if (!csrftoken) {
                 console.error('CSRF token not available');
-                revertCardMove();
+                originColumn.querySelector('.kanban-cards').appendChild(card);
                 return;
             }
 
-            fetch(updateUrl, {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                    'X-CSRFToken': csrftoken,
-                },
-                body: JSON.stringify({ task_id: taskId, status: newStatus })
-            })
-            .then(response => {
-                if (!response.ok) {
-                    throw new Error(`HTTP error! status: ${response.status}`);
-                }
-                return response.json();
-            })
-            .then(data => {
-                if (data.success) {
-                    console.log('Task status updated successfully');
-                    const badge = draggedCard.querySelector('.badge');
-                    if (badge && data.status_display) {
-                        badge.textContent = data.status_display;
-                    }
-                } else {
-                    throw new Error(data.error || 'Update failed');
-                }
-            })
-            .catch(err => {
-                console.error('Error updating task status:', err);
-                revertCardMove();
-            });
-
-            function revertCardMove() {
-                if (draggedCard && oldColumn) {
-                    oldColumn.appendChild(draggedCard);
-                }
-            }
+            queueMove(card, column.dataset.status, originColumn);
         });
     });
 });
\ No newline at end of file
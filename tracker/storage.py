@@ -0,0 +1,89 @@
+"""Content-addressed storage for attachment files.
+
+Every file is hashed with SHA-256 while it is written and stored once,
+as ``blobs/<aa>/<bb>/<digest><ext>``; saving the same content again
+returns the existing name instead of writing a second copy. Stored
+blobs never change. ``tracker.blobs`` counts the attachments pointing
+at each blob and removes blobs nobody references any more.
+"""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage
+
+BLOB_DIR = "blobs"
+HASH_BLOCK_SIZE = 64 * 1024
+
+
+def blob_name(digest, filename):
+    extension = os.path.splitext(filename)[1].lower()
+    return f"{BLOB_DIR}/{digest[:2]}/{digest[2:4]}/{digest}{extension}"
+
+
+def is_blob_name(name):
+    return bool(name) and name.startswith(f"{BLOB_DIR}/")
+
+
+def digest_of(name):
+    return os.path.splitext(os.path.basename(name))[0]
+
+
+def file_digest(path):
+    with open(path, "rb") as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    def get_available_name(self, name, max_length=None):
+        # _save names the file after its content; equal names are the
+        # same file, so there is nothing to avoid.
+        return name
+
+    def _save(self, name, content):
+        temp_dir = Path(settings.TRACKER_UPLOAD_DIR)
+        temp_dir.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        fd, temp_path = tempfile.mkstemp(dir=temp_dir, suffix=".blob")
+        try:
+            with os.fdopen(fd, "wb") as temp:
+                for chunk in content.chunks(HASH_BLOCK_SIZE):
+                    digest.update(chunk)
+                    temp.write(chunk)
+            return self.adopt(temp_path, name, digest.hexdigest())
+        finally:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+
+    def adopt(self, path, filename, digest=None):
+        """Move the file at ``path`` into the store and return its blob
+        name; ``filename`` only supplies the extension.
+
+        When the blob already exists the file is dropped and the blob's
+        modification time refreshed, which keeps ``collect_blobs`` off
+        it while the new reference is being saved.
+        """
+        name = blob_name(digest or file_digest(path), filename)
+        target = self.path(name)
+        if os.path.exists(target):
+            os.unlink(path)
+            os.utime(target)
+            return name
+
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        # Two writers of the same content race to an identical file.
+        file_move_safe(path, target, allow_overwrite=True)
+        if self.file_permissions_mode is not None:
+            os.chmod(target, self.file_permissions_mode)
+        return name
+
+
+blob_storage = ContentAddressedStorage()
+
+
+def get_blob_storage():
+    return blob_storage
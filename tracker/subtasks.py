@@ -0,0 +1,35 @@
+"""Batched subtask edits.
+
+Edits to one ticket's subtasks are written with ``bulk_update``,
+``bulk_create`` and a queryset delete inside a single transaction. Bulk
+writes skip the subtask signals, and the delete signals ignore queryset
+deletes, so the progress counters are recomputed once at the end and
+the ticket's cache version is dropped by hand.
+"""
+
+from django.db import transaction
+
+from .cache import invalidate
+from .models import SubTask, Ticket
+from .progress import repair_subtask_counters
+
+BULK_BATCH_SIZE = 500
+
+
+def save_subtasks(ticket, changed=(), added=(), deleted_ids=()):
+    """Write ``changed`` and ``added`` subtasks and delete ``deleted_ids``
+    of ``ticket`` in one transaction."""
+    with transaction.atomic():
+        if changed:
+            SubTask.objects.bulk_update(
+                changed, ["text", "is_done"], batch_size=BULK_BATCH_SIZE
+            )
+        if added:
+            for subtask in added:
+                subtask.ticket = ticket
+            SubTask.objects.bulk_create(added, batch_size=BULK_BATCH_SIZE)
+        if deleted_ids:
+            SubTask.objects.filter(ticket=ticket, id__in=deleted_ids).delete()
+        repair_subtask_counters(Ticket.objects.filter(pk=ticket.pk))
+
+    invalidate("ticket", ticket.pk)
@@ -1,8 +1,23 @@
 import pytest
+from django.core.cache import cache
 from model_bakery import baker
 
 from accounts.models import TicketsUser
 from tracker.models import Project, Ticket, TrackerGroup
+from tracker.throttle import _local_buckets
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    _local_buckets.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def board_events_in_memory(settings):
+    settings.TRACKER_EVENTS_BROKER = "tracker.realtime.InMemoryBroker"
 
 
 @pytest.fixture
@@ -0,0 +1,36 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+
+from tracker.autocomplete import search_emails
+
+
+@pytest.mark.django_db
+class TestSearchEmails:
+    def setup_method(self):
+        self.user = baker.make("accounts.TicketsUser", email="me@x.com")
+        self.stranger = baker.make("accounts.TicketsUser", email="ann@a.com")
+        self.peer = baker.make("accounts.TicketsUser", email="Anna@z.com")
+        group = baker.make("tracker.TrackerGroup", owner=self.user)
+        group.members.add(self.user, self.peer)
+
+    def test_matches_prefix_case_insensitively(self):
+        emails = [r["email"] for r in search_emails(self.user, "AN")]
+
+        assert set(emails) == {"ann@a.com", "Anna@z.com"}
+        assert search_emails(self.user, "nn") == []
+        assert search_emails(self.user, "  ") == []
+
+    def test_ranks_peers_first(self):
+        results = search_emails(self.user, "an")
+
+        assert results[0] == {"id": self.peer.id, "email": "Anna@z.com"}
+
+    def test_results_are_cached_per_user_and_prefix(self):
+        search_emails(self.user, "an")
+
+        with CaptureQueriesContext(connection) as queries:
+            search_emails(self.user, "An")
+
+        assert len(queries) == 0
@@ -0,0 +1,163 @@
+import time
+from datetime import date, timedelta
+
+import pytest
+from django.db import connection
+from django.http import QueryDict
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from model_bakery import baker
+
+from accounts.models import TicketsUser
+from tracker.autocomplete import AUTOCOMPLETE_LIMIT, email_matches
+from tracker.filters import TicketFilterForm
+from tracker.models import Ticket
+
+
+@pytest.mark.slow
+@pytest.mark.django_db
+class TestProjectBoardBenchmark:
+    SMALL = 250
+    LARGE = 1000
+
+    def setup_method(self):
+        self.user = baker.make("accounts.TicketsUser", email="bench@user.com")
+        self.project = baker.make("tracker.Project", owner=self.user)
+        self.project.members.add(self.user)
+        self.created = 0
+
+    def _grow_board(self, size):
+        statuses = [choice[0] for choice in Ticket.STATUS_CHOICES]
+        Ticket.objects.bulk_create(
+            Ticket(
+                title=f"Ticket {i}",
+                description="word " * 200,
+                status=statuses[i % len(statuses)],
+                project=self.project,
+                creator=self.user,
+            )
+            for i in range(self.created, size)
+        )
+        self.created = size
+
+    def _render_board(self, client, repeat=3):
+        url = reverse("project_details", args=[self.project.id])
+        timings = []
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                response = client.get(url)
+                timings.append(time.perf_counter() - started)
+            assert response.status_code == 200
+        return min(timings), len(queries)
+
+    def test_board_query_count_is_constant(self, client):
+        client.force_login(self.user)
+
+        self._grow_board(self.SMALL)
+        _, small_queries = self._render_board(client, repeat=1)
+        self._grow_board(self.LARGE)
+        _, large_queries = self._render_board(client, repeat=1)
+
+        assert small_queries == large_queries
+
+    def test_board_render_time_scales_linearly(self, client):
+        client.force_login(self.user)
+
+        self._grow_board(self.SMALL)
+        small_time, _ = self._render_board(client)
+        self._grow_board(self.LARGE)
+        large_time, _ = self._render_board(client)
+
+        # 4x the tickets must cost well under the 16x a quadratic
+        # board would; the slack absorbs timer noise on shared runners.
+        ratio = self.LARGE / self.SMALL
+        assert large_time < small_time * ratio * 2
+
+
+@pytest.mark.slow
+@pytest.mark.django_db
+class TestTicketFilterPlans:
+    TICKETS = 2000
+
+    def setup_method(self):
+        self.users = baker.make("accounts.TicketsUser", _quantity=20)
+        self.projects = baker.make(
+            "tracker.Project", owner=self.users[0], _quantity=20
+        )
+        statuses = [choice[0] for choice in Ticket.STATUS_CHOICES]
+        now = timezone.now()
+        Ticket.objects.bulk_create(
+            Ticket(
+                title=f"Ticket {i}",
+                description="",
+                status=statuses[i % len(statuses)],
+                project=self.projects[i % len(self.projects)],
+                creator=self.users[0],
+                assignee=self.users[i % len(self.users)],
+                due_date=now + timedelta(days=i % 365),
+            )
+            for i in range(self.TICKETS)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def _plan(self, form):
+        return Ticket.objects.filter(form.q()).explain()
+
+    def _filters(self, query):
+        return TicketFilterForm(
+            QueryDict(query), users=TicketsUser.objects.all()
+        )
+
+    def test_assignee_and_status_use_composite_index(self):
+        form = self._filters(f"assignee={self.users[3].id}&status=open")
+        assert "ticket_assignee_status_idx" in self._plan(form)
+
+    def test_project_due_range_uses_composite_index(self):
+        today = date.today()
+        form = self._filters(
+            f"due_after={today}&due_before={today + timedelta(days=7)}"
+        )
+        plan = (
+            Ticket.objects.filter(project=self.projects[2])
+            .filter(form.q())
+            .explain()
+        )
+        assert "ticket_project_due_date_idx" in plan
+
+    def test_project_status_uses_board_index(self):
+        form = self._filters("status=testing")
+        plan = (
+            Ticket.objects.filter(project=self.projects[2])
+            .filter(form.q())
+            .explain()
+        )
+        assert "ticket_project_status_rank_idx" in plan
+
+
+@pytest.mark.slow
+@pytest.mark.django_db
+@pytest.mark.skipif(
+    connection.vendor != "postgresql", reason="checks Postgres plans"
+)
+class TestEmailAutocompletePlan:
+    USERS = 5000
+
+    def setup_method(self):
+        prefixes = ("an", "bo", "ca", "di")
+        TicketsUser.objects.bulk_create(
+            TicketsUser(
+                email=f"{prefixes[i % 4]}{i}@example.com", username=f"user{i}"
+            )
+            for i in range(self.USERS)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def test_prefix_search_reads_matches_in_index_order(self):
+        plan = email_matches("an")[:AUTOCOMPLETE_LIMIT].explain()
+
+        assert "accounts_user_email_lower_idx" in plan
+        assert "Sort" not in plan
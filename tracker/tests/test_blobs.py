@@ -0,0 +1,113 @@
+import hashlib
+import os
+from datetime import timedelta
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.utils import timezone
+from model_bakery import baker
+
+from tracker.blobs import collect_blobs, repair_blob_refs
+from tracker.models import Attachment, Blob
+
+PDF = b"%PDF-1.4\nthe same report"
+LATER = timezone.now() + timedelta(days=1)
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.TRACKER_UPLOAD_DIR = tmp_path / ".uploads"
+    return tmp_path
+
+
+def blob_files(root):
+    return sorted(
+        path.name for path in (root / "blobs").rglob("*") if path.is_file()
+    )
+
+
+@pytest.mark.django_db
+class TestBlobs:
+    def setup_method(self):
+        self.user = baker.make("accounts.TicketsUser", email="me@user.com")
+        self.tickets = baker.make("tracker.Ticket", _quantity=2)
+
+    def attach(self, ticket, filename="report.pdf", data=PDF):
+        return Attachment.objects.create(
+            ticket=ticket,
+            uploaded_by=self.user,
+            attached_file=SimpleUploadedFile(filename, data),
+        )
+
+    def test_stores_each_file_once(self, media_root):
+        first = self.attach(self.tickets[0], "report.pdf")
+        second = self.attach(self.tickets[1], "copy.pdf")
+
+        digest = hashlib.sha256(PDF).hexdigest()
+        assert first.attached_file.name == second.attached_file.name
+        assert first.attached_file.name.endswith(f"{digest}.pdf")
+        assert (first.filename, second.filename) == ("report.pdf", "copy.pdf")
+        assert blob_files(media_root) == [f"{digest}.pdf"]
+        assert not list((media_root / ".uploads").iterdir())
+        blob = Blob.objects.get()
+        assert (blob.digest, blob.size, blob.ref_count) == (
+            digest,
+            len(PDF),
+            2,
+        )
+
+    def test_collects_blobs_without_references(self, media_root):
+        kept = self.attach(self.tickets[0])
+        dropped = self.attach(self.tickets[1], data=b"%PDF-1.4\nother")
+        dropped.delete()
+        assert Blob.objects.get(name=dropped.attached_file.name).ref_count == 0
+
+        # Fresh blobs survive; someone may be attaching them again.
+        assert collect_blobs() == 0
+        assert collect_blobs(now=LATER) == 1
+
+        assert list(Blob.objects.values_list("name", flat=True)) == [
+            kept.attached_file.name
+        ]
+        assert blob_files(media_root) == [
+            os.path.basename(kept.attached_file.name)
+        ]
+
+    def test_collects_files_without_a_row(self, media_root):
+        stray = media_root / "blobs" / "ab" / "cd" / "abcd.pdf"
+        stray.parent.mkdir(parents=True)
+        stray.write_bytes(PDF)
+        os.utime(stray, (0, 0))
+
+        assert collect_blobs() == 1
+        assert not stray.exists()
+
+    def test_repairs_counts_after_queryset_updates(self):
+        attachment = self.attach(self.tickets[0])
+        Attachment.objects.filter(pk=attachment.pk).update(attached_file="")
+
+        assert repair_blob_refs() == 1
+        assert Blob.objects.get().ref_count == 0
+
+    def test_adopts_legacy_attachments(self, media_root):
+        legacy = media_root / "ticket_attachments"
+        legacy.mkdir()
+        for ticket, name in zip(self.tickets, ("a.pdf", "b.pdf"), strict=True):
+            (legacy / name).write_bytes(PDF)
+            Attachment.objects.create(
+                ticket=ticket,
+                uploaded_by=self.user,
+                attached_file=f"ticket_attachments/{name}",
+            )
+
+        call_command("collect_blobs", "--adopt-legacy")
+
+        names = set(Attachment.objects.values_list("attached_file", flat=True))
+        assert len(names) == 1
+        assert Blob.objects.get(name__in=names).ref_count == 2
+        assert not list(legacy.iterdir())
+        assert blob_files(media_root) == [
+            f"{hashlib.sha256(PDF).hexdigest()}.pdf"
+        ]
@@ -0,0 +1,103 @@
+import threading
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+from model_bakery import baker
+
+from tracker.cache import (
+    attach_fragments,
+    get_or_compute,
+    get_versions,
+    invalidate,
+)
+from tracker.models import Project
+
+
+@pytest.mark.django_db
+class TestFragmentCache:
+    def test_attach_fragments_renders_misses_only(self, project):
+        def render_twice():
+            return [
+                attach_fragments(
+                    [project],
+                    "projects/project_card.html",
+                    key_func=lambda obj: obj.id,
+                    context_func=lambda obj: {"project": obj},
+                )
+                for _ in range(2)
+            ]
+
+        with mock.patch(
+            "tracker.cache.render_to_string", return_value="<p>card</p>"
+        ) as render:
+            _, (cached,) = render_twice()
+
+        assert render.call_count == 1
+        assert cached.card_html == "<p>card</p>"
+
+    def test_invalidate_changes_version(self, project):
+        before = get_versions("project", [project.id])
+
+        assert get_versions("project", [project.id]) == before
+
+        invalidate("project", project.id)
+
+        assert get_versions("project", [project.id]) != before
+
+    def test_member_change_invalidates_project(self, project):
+        other = baker.make("accounts.TicketsUser", email="other@example.com")
+        before = get_versions("project", [project.id])
+
+        project.members.add(other)
+
+        assert get_versions("project", [project.id]) != before
+
+    def test_reverse_clear_invalidates_groups(self, user, group):
+        group.members.add(user)
+        before = get_versions("group", [group.id])
+
+        user.attached_groups.clear()
+
+        assert get_versions("group", [group.id]) != before
+
+    def test_project_save_invalidates_its_group(self, user, group):
+        before = get_versions("group", [group.id])
+
+        baker.make(Project, owner=user, attached_group=group)
+
+        assert get_versions("group", [group.id]) != before
+
+
+class TestGetOrCompute:
+    def test_computes_once_and_caches(self):
+        compute = mock.Mock(return_value=["a"])
+
+        assert get_or_compute("k", compute, 60) == ["a"]
+        assert get_or_compute("k", compute, 60) == ["a"]
+        assert compute.call_count == 1
+
+    def test_waits_for_the_caller_holding_the_lock(self):
+        cache.add("k:lock", 1)
+        threading.Timer(0.05, cache.set, args=("k", ["b"])).start()
+        compute = mock.Mock()
+
+        assert get_or_compute("k", compute, 60) == ["b"]
+        assert not compute.called
+
+    @pytest.mark.parametrize("add_result", [None, False])
+    def test_computes_at_once_without_a_working_cache(self, add_result):
+        # With IGNORE_EXCEPTIONS a dead Redis answers None to everything.
+        dead = mock.Mock(spec=["get", "add", "set", "delete"])
+        dead.get.return_value = None
+        dead.add.return_value = add_result
+        compute = mock.Mock(return_value=["c"])
+
+        with (
+            mock.patch("tracker.cache.cache", dead),
+            mock.patch("tracker.cache.time.sleep") as sleep,
+        ):
+            assert get_or_compute("k", compute, 60) == ["c"]
+
+        assert compute.call_count == 1
+        assert not sleep.called
@@ -1,5 +1,6 @@
 import pytest
 from django.http import HttpRequest
+from model_bakery import baker
 
 from tracker.decorators import group_access_required, project_access_required
 
@@ -29,3 +30,50 @@ class TestDecorators:
         request.user = user
         response = test_view(request, project_id=project.id)
         assert response == "Success"
+
+    def test_group_access_required_without_access(self, group):
+        stranger = baker.make("accounts.TicketsUser", email="x@example.com")
+
+        @group_access_required
+        def test_view(request, group_id, group):
+            return "Success"
+
+        request = HttpRequest()
+        request.user = stranger
+        response = test_view(request, group_id=group.id)
+        assert response.status_code == 403
+
+    def test_project_access_is_memoized(
+        self, user, project, django_assert_num_queries
+    ):
+        member = baker.make("accounts.TicketsUser", email="m@example.com")
+        project.members.add(member)
+
+        @project_access_required
+        def test_view(request, project_id, project):
+            return "Success"
+
+        request = HttpRequest()
+        request.user = member
+        test_view(request, project_id=project.id)
+
+        # Only the project itself is loaded once membership is cached.
+        with django_assert_num_queries(1):
+            assert test_view(request, project_id=project.id) == "Success"
+
+    def test_membership_change_invalidates_cached_denial(self, group):
+        newcomer = baker.make("accounts.TicketsUser", email="n@example.com")
+
+        @group_access_required
+        def test_view(request, group_id, group):
+            return "Success"
+
+        request = HttpRequest()
+        request.user = newcomer
+        assert test_view(request, group_id=group.id).status_code == 403
+
+        group.members.add(newcomer)
+        assert test_view(request, group_id=group.id) == "Success"
+
+        newcomer.attached_groups.clear()
+        assert test_view(request, group_id=group.id).status_code == 403
@@ -0,0 +1,84 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from model_bakery import baker
+
+from tracker.models import Comment, SubTask
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+    def setup_method(self):
+        self.user = baker.make("accounts.TicketsUser", email="a@user.com")
+        self.project = baker.make("tracker.Project", owner=self.user)
+        self.project.members.add(self.user)
+        self.ticket = baker.make(
+            "tracker.Ticket",
+            project=self.project,
+            creator=self.user,
+            assignee=self.user,
+        )
+        self.board_url = reverse("project_details", args=[self.project.id])
+        self.detail_url = reverse(
+            "ticket_detail", args=[self.project.id, self.ticket.id]
+        )
+
+    def revalidate(self, client, url):
+        # The first visit may set the CSRF cookie, which is part of the tag.
+        client.get(url)
+        etag = client.get(url)["ETag"]
+        return client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    def test_unchanged_board_is_not_modified(self, client):
+        client.force_login(self.user)
+        etag = client.get(self.board_url)["ETag"]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(self.board_url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+        # Session, user, project and the ticket aggregate.
+        assert len(queries) == 4
+
+    def test_ticket_change_invalidates_board(self, client):
+        client.force_login(self.user)
+        etag = client.get(self.board_url)["ETag"]
+
+        self.ticket.title = "Renamed"
+        self.ticket.save()
+
+        response = client.get(self.board_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+
+    def test_etag_is_per_user(self, client):
+        other = baker.make("accounts.TicketsUser", email="b@user.com")
+        self.project.members.add(other)
+        client.force_login(self.user)
+        etag = client.get(self.board_url)["ETag"]
+
+        client.force_login(other)
+        response = client.get(self.board_url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200
+
+    def test_ticket_list_is_not_modified(self, client):
+        client.force_login(self.user)
+
+        response = self.revalidate(client, reverse("ticket_list"))
+
+        assert response.status_code == 304
+
+    def test_ticket_detail_tracks_comments_and_subtasks(self, client):
+        client.force_login(self.user)
+        assert self.revalidate(client, self.detail_url).status_code == 304
+
+        etag = client.get(self.detail_url)["ETag"]
+        Comment.objects.create(ticket=self.ticket, author=self.user, text="Hi")
+        response = client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+
+        etag = response["ETag"]
+        SubTask.objects.create(ticket=self.ticket, text="Step")
+        response = client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
@@ -0,0 +1,113 @@
+from datetime import date, datetime
+
+import pytest
+from django.http import QueryDict
+from django.urls import reverse
+from django.utils import timezone
+from model_bakery import baker
+
+from tracker.filters import TicketFilterForm
+from tracker.models import Ticket
+
+
+def _due(day):
+    return timezone.make_aware(datetime.combine(day, datetime.min.time()))
+
+
+@pytest.mark.django_db
+class TestTicketFilters:
+    def setup_method(self):
+        self.user = baker.make("accounts.TicketsUser", email="me@user.com")
+        self.other = baker.make("accounts.TicketsUser", email="you@user.com")
+        self.project = baker.make("tracker.Project", owner=self.user)
+        self.project.members.add(self.other)
+        self.bug = baker.make(
+            "tracker.Ticket",
+            title="Crash on save",
+            project=self.project,
+            creator=self.other,
+            assignee=self.user,
+            status="open",
+            priority="high",
+            ticket_type="bug",
+            due_date=_due(date(2026, 3, 10)),
+        )
+        self.task = baker.make(
+            "tracker.Ticket",
+            title="Write docs",
+            project=self.project,
+            creator=self.user,
+            assignee=self.user,
+            status="done",
+            priority="low",
+            ticket_type="task",
+            due_date=_due(date(2026, 3, 20)),
+        )
+
+    def _filter(self, query, **kwargs):
+        form = TicketFilterForm(QueryDict(query), **kwargs)
+        return set(Ticket.objects.filter(form.q())), form
+
+    def test_empty_filter_matches_everything(self):
+        tickets, form = self._filter("")
+        assert tickets == {self.bug, self.task}
+        assert not form.is_active
+
+    def test_combines_criteria(self):
+        users = self.project.members.all()
+        tickets, form = self._filter(
+            f"status=open&status=done&priority=high&creator={self.other.id}",
+            users=users,
+        )
+        assert tickets == {self.bug}
+        assert form.is_active
+
+    def test_due_range_includes_both_days(self):
+        tickets, _ = self._filter("due_after=2026-03-10&due_before=2026-03-10")
+        assert tickets == {self.bug}
+
+        tickets, _ = self._filter("due_after=2026-03-11&due_before=2026-03-20")
+        assert tickets == {self.task}
+
+    def test_invalid_input_filters_nothing(self):
+        tickets, form = self._filter(
+            "due_after=2026-03-20&due_before=2026-03-10"
+        )
+        assert tickets == {self.bug, self.task}
+        assert form.non_field_errors()
+
+        tickets, form = self._filter(f"creator={self.other.id}")
+        assert tickets == {self.bug, self.task}
+        assert "creator" in form.errors
+
+    def test_querystring_keeps_only_filter_fields(self):
+        form = TicketFilterForm(QueryDict("status=open&status=done&after=x"))
+        assert form.querystring() == "status=open&status=done"
+
+    def test_ticket_list_filters_assigned_tickets(self, client):
+        client.force_login(self.user)
+
+        response = client.get(reverse("ticket_list"), {"ticket_type": "bug"})
+
+        assert response.status_code == 200
+        assert "Crash on save" in response.content.decode()
+        assert "Write docs" not in response.content.decode()
+        assert "assignee" not in response.context["filters"].fields
+
+    def test_project_board_and_columns_apply_filters(self, client):
+        client.force_login(self.user)
+
+        response = client.get(
+            reverse("project_details", args=[self.project.id]),
+            {"assignee": self.user.id, "priority": "low"},
+        )
+        content = response.content.decode()
+        assert "Write docs" in content
+        assert "Crash on save" not in content
+        assert 'data-filter-query="priority=low&amp;assignee=' in content
+
+        response = client.get(
+            reverse("board_column", args=[self.project.id, "open"]),
+            {"priority": "low"},
+        )
+        assert response.json()["count"] == 0
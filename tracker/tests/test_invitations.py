@@ -0,0 +1,96 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+
+from tracker.invitations import (
+    ALREADY_INVITED,
+    ALREADY_MEMBER,
+    INVITED,
+    UNKNOWN,
+    invite_to_group,
+    parse_emails,
+)
+from tracker.models import Invitation
+
+
+@pytest.mark.django_db
+class TestInviteToGroup:
+    def setup_method(self):
+        self.owner = baker.make("accounts.TicketsUser", email="owner@x.com")
+        self.group = baker.make("tracker.TrackerGroup", owner=self.owner)
+
+    def test_parse_emails_strips_and_dedupes(self):
+        assert parse_emails(" a@x.com, ,b@x.com,a@x.com ") == [
+            "a@x.com",
+            "b@x.com",
+        ]
+
+    def test_reports_each_address(self):
+        member = baker.make("accounts.TicketsUser", email="member@x.com")
+        invited = baker.make("accounts.TicketsUser", email="invited@x.com")
+        baker.make("accounts.TicketsUser", email="new@x.com")
+        self.group.members.add(member)
+        baker.make(
+            Invitation,
+            owner=self.owner,
+            target_user=invited,
+            target_group=self.group,
+            invitation_type="group",
+        )
+
+        report = invite_to_group(
+            self.owner,
+            self.group,
+            [
+                "owner@x.com",
+                "member@x.com",
+                "invited@x.com",
+                "new@x.com",
+                "nobody@x.com",
+            ],
+        )
+
+        assert report == {
+            "owner@x.com": ALREADY_MEMBER,
+            "member@x.com": ALREADY_MEMBER,
+            "invited@x.com": ALREADY_INVITED,
+            "new@x.com": INVITED,
+            "nobody@x.com": UNKNOWN,
+        }
+        assert Invitation.objects.filter(target_group=self.group).count() == 2
+
+    def test_query_count_does_not_grow_with_batch(self):
+        users = baker.make("accounts.TicketsUser", _quantity=50)
+
+        with CaptureQueriesContext(connection) as queries:
+            invite_to_group(
+                self.owner, self.group, [user.email for user in users]
+            )
+
+        assert len(queries) <= 4
+        assert Invitation.objects.filter(target_group=self.group).count() == 50
+
+    def test_pending_invitation_is_unique(self):
+        user = baker.make("accounts.TicketsUser", email="u@x.com")
+        invitation = Invitation(
+            owner=self.owner,
+            target_user=user,
+            target_group=self.group,
+            invitation_type="group",
+        )
+        Invitation.objects.bulk_create([invitation])
+
+        Invitation.objects.bulk_create(
+            [
+                Invitation(
+                    owner=self.owner,
+                    target_user=user,
+                    target_group=self.group,
+                    invitation_type="group",
+                )
+            ],
+            ignore_conflicts=True,
+        )
+
+        assert Invitation.objects.filter(target_user=user).count() == 1
@@ -0,0 +1,35 @@
+import pytest
+from model_bakery import baker
+
+from tracker.access import can_access_project
+from tracker.memberships import inherit_group_members
+
+
+@pytest.mark.django_db
+class TestInheritGroupMembers:
+    def setup_method(self):
+        self.owner = baker.make("accounts.TicketsUser", email="o@x.com")
+        self.group = baker.make("tracker.TrackerGroup", owner=self.owner)
+        self.project = baker.make(
+            "tracker.Project", owner=self.owner, attached_group=self.group
+        )
+
+    def test_copies_missing_members_only(self):
+        existing, newcomer = baker.make("accounts.TicketsUser", _quantity=2)
+        self.group.members.add(existing, newcomer)
+        self.project.members.add(existing)
+
+        assert inherit_group_members(self.project, self.group) == 1
+        assert set(self.project.members.all()) == {existing, newcomer}
+
+    def test_refreshes_memoized_access(self):
+        user = baker.make("accounts.TicketsUser")
+        self.group.members.add(user)
+        assert not can_access_project(user, self.project)
+
+        inherit_group_members(self.project, self.group)
+
+        assert can_access_project(user, self.project)
+
+    def test_empty_group_is_a_no_op(self):
+        assert inherit_group_members(self.project, self.group) == 0
@@ -0,0 +1,125 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from model_bakery import baker
+
+from tracker.models import SubTask, Ticket
+from tracker.progress import repair_subtask_counters
+
+
+@pytest.mark.django_db
+class TestSubtaskCounters:
+    def setup_method(self):
+        self.user = baker.make("accounts.TicketsUser", email="me@user.com")
+        self.project = baker.make("tracker.Project", owner=self.user)
+        self.project.members.add(self.user)
+        self.ticket = baker.make(
+            "tracker.Ticket", project=self.project, creator=self.user
+        )
+
+    def counters(self):
+        self.ticket.refresh_from_db()
+        return self.ticket.subtasks_done, self.ticket.subtasks_total
+
+    def test_create_toggle_and_delete(self):
+        first = SubTask.objects.create(ticket=self.ticket, text="One")
+        SubTask.objects.create(ticket=self.ticket, text="Two", is_done=True)
+        assert self.counters() == (1, 2)
+
+        first.is_done = True
+        first.save()
+        first.save()
+        assert self.counters() == (2, 2)
+
+        SubTask.objects.get(id=first.id).delete()
+        assert self.counters() == (1, 1)
+
+        # Queryset deletes are bulk edits, repaired by their callers.
+        self.ticket.subtasks.all().delete()
+        assert self.counters() == (1, 1)
+        repair_subtask_counters(Ticket.objects.filter(pk=self.ticket.pk))
+        assert self.counters() == (0, 0)
+
+    def test_ticket_edits_keep_concurrent_counter_changes(self):
+        stale = Ticket.objects.get(pk=self.ticket.pk)
+        subtask = SubTask.objects.create(ticket=self.ticket, text="One")
+
+        stale.title = "Renamed"
+        stale.save()
+        assert self.counters() == (0, 1)
+        assert self.ticket.title == "Renamed"
+
+        subtask.delete()
+        assert self.counters() == (0, 0)
+
+    def test_counters_never_go_below_zero(self):
+        subtask = SubTask.objects.create(ticket=self.ticket, text="One")
+        Ticket.objects.filter(pk=self.ticket.pk).update(subtasks_total=0)
+
+        subtask.delete()
+
+        assert self.counters() == (0, 0)
+
+    def test_deleting_the_ticket_skips_counter_updates(self):
+        SubTask.objects.bulk_create(
+            SubTask(ticket=self.ticket, text=f"Step {i}") for i in range(5)
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            self.ticket.delete()
+
+        assert not [
+            query
+            for query in queries
+            if "subtasks_total" in query["sql"]
+            and query["sql"].startswith("UPDATE")
+        ]
+
+    def test_counter_updates_touch_updated_at(self):
+        before = self.ticket.updated_at
+
+        SubTask.objects.create(ticket=self.ticket, text="One")
+
+        self.ticket.refresh_from_db()
+        assert self.ticket.updated_at > before
+
+    def test_views_keep_counters(self, client):
+        client.force_login(self.user)
+        client.post(
+            reverse("add_subtask", args=[self.ticket.id]), {"subtask": "One"}
+        )
+        subtask = self.ticket.subtasks.get()
+
+        client.post(
+            reverse(
+                "update_task_ajax",
+                args=[self.project.id, self.ticket.id, subtask.id],
+            ),
+            {"completed": True},
+            content_type="application/json",
+        )
+        assert self.counters() == (1, 1)
+
+        response = client.get(
+            reverse("project_details", args=[self.project.id])
+        )
+        assert "1/1 done" in response.content.decode()
+
+    def test_repair_command(self):
+        baker.make(SubTask, ticket=self.ticket, is_done=True, _quantity=2)
+        baker.make(SubTask, ticket=self.ticket, is_done=False)
+        untouched = baker.make(
+            "tracker.Ticket", project=self.project, creator=self.user
+        )
+        Ticket.objects.update(subtasks_total=7, subtasks_done=0)
+        Ticket.objects.filter(id=untouched.id).update(subtasks_total=0)
+
+        out = StringIO()
+        call_command("repair_subtask_counters", stdout=out)
+
+        assert self.counters() == (2, 3)
+        assert "Repaired 1 ticket(s)" in out.getvalue()
@@ -0,0 +1,234 @@
+from datetime import datetime
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from model_bakery import baker
+
+from tracker.models import SavedFilter, Ticket
+from tracker.query_language import (
+    QuerySyntaxError,
+    get_plan,
+    parse,
+    to_q,
+)
+from tracker.saved_filters import saved_filter_counts
+
+
+def _day(value):
+    return timezone.make_aware(datetime.fromisoformat(value))
+
+
+@pytest.mark.django_db
+class TestQueryLanguage:
+    def setup_method(self):
+        self.user = baker.make("accounts.TicketsUser", email="me@user.com")
+        self.other = baker.make("accounts.TicketsUser", email="you@user.com")
+        self.project = baker.make(
+            "tracker.Project", title="Backend", owner=self.user
+        )
+        self.urgent = baker.make(
+            "tracker.Ticket",
+            title="Crash on save",
+            project=self.project,
+            creator=self.other,
+            assignee=self.user,
+            status="in_progress",
+            priority="critical",
+            ticket_type="bug",
+            due_date=_day("2026-03-10T15:00"),
+        )
+        self.minor = baker.make(
+            "tracker.Ticket",
+            title="Write docs",
+            project=self.project,
+            creator=self.user,
+            assignee=self.other,
+            status="open",
+            priority="high",
+            ticket_type="task",
+        )
+        self.closed = baker.make(
+            "tracker.Ticket",
+            title="Old crash",
+            project=self.project,
+            creator=self.user,
+            assignee=None,
+            status="closed",
+            priority="low",
+            ticket_type="bug",
+            due_date=_day("2026-03-01T09:00"),
+        )
+
+    def _run(self, query, user=None):
+        return set(
+            Ticket.objects.filter(to_q(parse(query), user or self.user))
+        )
+
+    def test_example_query(self):
+        query = (
+            "status in (open,in_progress) and priority>=high and assignee=me"
+        )
+        assert self._run(query) == {self.urgent}
+        assert self._run(query, self.other) == {self.minor}
+
+    @pytest.mark.parametrize(
+        "query, expected",
+        [
+            ("priority < high", {"closed"}),
+            ("status != closed", {"urgent", "minor"}),
+            ("type = bug or title ~ docs", {"urgent", "minor", "closed"}),
+            ("not (type = bug) ", {"minor"}),
+            ("status not in (open, closed)", {"urgent"}),
+            ("assignee = none", {"closed"}),
+            ("creator = YOU@user.com", {"urgent"}),
+            ('project = "backend" and title = "old crash"', {"closed"}),
+            ("due = 2026-03-10", {"urgent"}),
+            ("due <= 2026-03-09", {"closed"}),
+            ("due > 2026-03-01", {"urgent"}),
+            ("due = none", {"minor"}),
+            (
+                "type = bug and (priority = low or assignee = me)",
+                {"urgent", "closed"},
+            ),
+        ],
+    )
+    def test_operators(self, query, expected):
+        assert self._run(query) == {getattr(self, name) for name in expected}
+
+    @pytest.mark.parametrize(
+        "query, message",
+        [
+            ("", "empty"),
+            ("colour = red", "Unknown field"),
+            ("priority >= urgent", "priority must be one of"),
+            ("type > bug", "does not support"),
+            ("due ~ 2026", "does not support"),
+            ("due < tomorrow", "YYYY-MM-DD"),
+            ("status = open and", "end of query"),
+            ("(status = open", "end of query"),
+            ("status = open status = done", "Unexpected 'status'"),
+            ("status in open", "Unexpected 'open'"),
+            ('title = "unterminated', "Unexpected character"),
+        ],
+    )
+    def test_syntax_errors(self, query, message):
+        with pytest.raises(QuerySyntaxError, match=message):
+            parse(query)
+
+    def test_me_only_means_the_user_for_user_fields(self):
+        self.minor.title = "@me"
+        self.minor.save()
+
+        assert self._run('title = "@me"') == {self.minor}
+        assert self._run("assignee = me") == {self.urgent}
+
+    def test_plan_is_cached(self):
+        query = "status = open"
+        assert get_plan(query) == parse(query)
+
+        with pytest.MonkeyPatch.context() as patch:
+            patch.setattr(
+                "tracker.query_language.parse",
+                lambda text: pytest.fail("parsed again"),
+            )
+            assert get_plan(query) == ("match", "status", "open")
+
+
+@pytest.mark.django_db
+class TestSavedFilters:
+    def setup_method(self):
+        self.user = baker.make("accounts.TicketsUser", email="me@user.com")
+        self.project = baker.make("tracker.Project", owner=self.user)
+        self.hidden = baker.make("tracker.Project")
+        self.ticket = baker.make(
+            "tracker.Ticket",
+            project=self.project,
+            assignee=self.user,
+            status="open",
+        )
+        baker.make("tracker.Ticket", project=self.hidden, status="open")
+        self.saved = baker.make(
+            SavedFilter, owner=self.user, name="Open", query="status = open"
+        )
+
+    def test_counts_are_cached_until_tickets_change(
+        self, django_assert_num_queries
+    ):
+        assert saved_filter_counts(self.user, [self.saved]) == {
+            self.saved.id: 1
+        }
+        # Visible projects only; the count itself comes from the cache.
+        with django_assert_num_queries(1):
+            assert saved_filter_counts(self.user, [self.saved]) == {
+                self.saved.id: 1
+            }
+
+        baker.make("tracker.Ticket", project=self.project, status="open")
+        assert saved_filter_counts(self.user, [self.saved]) == {
+            self.saved.id: 2
+        }
+
+        self.ticket.delete()
+        assert saved_filter_counts(self.user, [self.saved]) == {
+            self.saved.id: 1
+        }
+
+    def test_batch_moves_refresh_counts(self, client):
+        client.force_login(self.user)
+        assert saved_filter_counts(self.user, [self.saved])[self.saved.id] == 1
+
+        response = client.post(
+            reverse("update_task_statuses", args=[self.project.id]),
+            {"moves": [{"task_id": self.ticket.id, "status": "done"}]},
+            content_type="application/json",
+        )
+
+        assert response.json()["success"]
+        assert saved_filter_counts(self.user, [self.saved])[self.saved.id] == 0
+
+    def test_create_list_and_run(self, client):
+        client.force_login(self.user)
+
+        response = client.post(
+            reverse("saved_filter_list"),
+            {"name": "Mine", "query": "assignee = me"},
+        )
+        saved = SavedFilter.objects.get(owner=self.user, name="Mine")
+        assert response.url == reverse("saved_filter_results", args=[saved.id])
+
+        response = client.get(reverse("saved_filter_list"))
+        assert [f.ticket_count for f in response.context["saved_filters"]] == [
+            1,
+            1,
+        ]
+
+        response = client.get(reverse("saved_filter_results", args=[saved.id]))
+        assert list(response.context["page"]) == [self.ticket]
+
+    def test_invalid_query_and_duplicate_name_are_rejected(self, client):
+        client.force_login(self.user)
+
+        response = client.post(
+            reverse("saved_filter_list"),
+            {"name": "Open", "query": "status = nope"},
+        )
+
+        form = response.context["form"]
+        assert "name" in form.errors
+        assert "status must be one of" in form.errors["query"][0]
+        assert SavedFilter.objects.count() == 1
+
+    def test_other_users_filters_are_private(self, client):
+        client.force_login(baker.make("accounts.TicketsUser"))
+
+        results = client.get(
+            reverse("saved_filter_results", args=[self.saved.id])
+        )
+        delete = client.post(
+            reverse("delete_saved_filter", args=[self.saved.id])
+        )
+
+        assert results.status_code == 404
+        assert delete.status_code == 404
+        assert SavedFilter.objects.filter(id=self.saved.id).exists()
@@ -0,0 +1,107 @@
+import random
+
+import pytest
+from django.core.management import call_command
+from model_bakery import baker
+
+from tracker.models import Ticket
+from tracker.ranking import (
+    evenly_spaced_ranks,
+    rank_between,
+    rank_in_column,
+)
+
+
+class TestRankBetween:
+    def test_empty_column(self):
+        assert rank_between() == "i"
+
+    def test_stays_strictly_between_neighbours(self):
+        rng = random.Random(42)
+        ranks = []
+        for _ in range(2000):
+            position = rng.randint(0, len(ranks))
+            before = ranks[position - 1] if position else ""
+            after = ranks[position] if position < len(ranks) else ""
+
+            rank = rank_between(before, after)
+
+            assert not before or before < rank
+            assert not after or rank < after
+            assert not rank.endswith("0")
+            ranks.insert(position, rank)
+
+        assert ranks == sorted(ranks)
+
+    def test_appending_keeps_ranks_short(self):
+        rank = ""
+        for _ in range(500):
+            rank = rank_between(rank, "")
+
+        assert len(rank) < 20
+
+    def test_rejects_inverted_neighbours(self):
+        with pytest.raises(ValueError):
+            rank_between("b", "a")
+
+    def test_evenly_spaced_ranks(self):
+        ranks = evenly_spaced_ranks(1000)
+
+        assert ranks == sorted(ranks)
+        assert len(set(ranks)) == 1000
+        assert max(len(rank) for rank in ranks) == 2
+
+
+@pytest.mark.django_db
+class TestColumnRanks:
+    def test_new_tickets_go_last(self, user, project):
+        first, second = baker.make(
+            Ticket, project=project, creator=user, _quantity=2
+        )
+
+        assert first.rank < second.rank
+
+    def test_rank_in_column_compacts_overlong_ranks(self, user, project):
+        first = baker.make(Ticket, project=project, creator=user, rank="i")
+        second = baker.make(
+            Ticket, project=project, creator=user, rank="i" + "0" * 62 + "1"
+        )
+
+        rank = rank_in_column(
+            Ticket.objects.filter(project=project, status="open"),
+            first.id,
+            second.id,
+        )
+
+        second.refresh_from_db()
+        assert len(second.rank) == 1
+        assert rank < second.rank
+
+    def test_rank_in_column_separates_tied_neighbours(self, user, project):
+        first, second = baker.make(
+            Ticket, project=project, creator=user, rank="i", _quantity=2
+        )
+
+        rank = rank_in_column(
+            Ticket.objects.filter(project=project, status="open"),
+            first.id,
+            second.id,
+        )
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        assert first.rank < rank < second.rank
+
+    def test_rebalance_command(self, user, project):
+        tickets = [
+            baker.make(
+                Ticket, project=project, creator=user, rank="a" * 40 + c
+            )
+            for c in "123"
+        ]
+
+        call_command("rebalance_ranks")
+
+        ordered = Ticket.objects.filter(project=project).order_by("rank")
+        assert list(ordered) == tickets
+        assert all(len(ticket.rank) == 1 for ticket in ordered)
@@ -0,0 +1,142 @@
+import asyncio
+import json
+from unittest import mock
+
+import pytest
+from django.urls import reverse
+from model_bakery import baker
+
+from tracker.realtime import (
+    InMemoryBroker,
+    board_channel,
+    event_stream,
+    get_broker,
+    publish_board_event,
+)
+
+
+class TestInMemoryBroker:
+    def test_fans_out_messages_published_from_other_threads(self):
+        broker = InMemoryBroker()
+
+        async def listen():
+            first = broker.subscribe("board")
+            second = broker.subscribe("board")
+            reads = [
+                asyncio.ensure_future(anext(first)),
+                asyncio.ensure_future(anext(second)),
+            ]
+            # Let both subscriptions register before publishing.
+            while len(broker._subscribers.get("board", ())) < 2:
+                await asyncio.sleep(0)
+            await asyncio.to_thread(broker.publish, "board", "hello")
+            await asyncio.to_thread(broker.publish, "other", "ignored")
+            received = await asyncio.gather(*reads)
+            await first.aclose()
+            await second.aclose()
+            return received
+
+        assert asyncio.run(listen()) == ["hello", "hello"]
+        assert broker._subscribers == {}
+
+    def test_event_stream_formats_server_sent_events(self):
+        async def read_two():
+            stream = event_stream("board")
+            retry = await anext(stream)
+            read = asyncio.ensure_future(anext(stream))
+            while "board" not in get_broker()._subscribers:
+                await asyncio.sleep(0)
+            get_broker().publish("board", '{"type": "cards"}')
+            data = await read
+            await stream.aclose()
+            return retry, data
+
+        assert asyncio.run(read_two()) == (
+            "retry: 3000\n\n",
+            'data: {"type": "cards"}\n\n',
+        )
+
+
+@pytest.mark.django_db
+class TestBoardEvents:
+    def setup_method(self):
+        self.user = baker.make("accounts.TicketsUser", email="a@user.com")
+        self.project = baker.make("tracker.Project", owner=self.user)
+        self.ticket = baker.make(
+            "tracker.Ticket", project=self.project, creator=self.user
+        )
+
+    def published(self, callbacks):
+        return [
+            json.loads(call.args[1])
+            for call in callbacks.call_args_list
+            if call.args[0] == board_channel(self.project.id)
+        ]
+
+    def test_publish_waits_for_commit(
+        self, django_capture_on_commit_callbacks
+    ):
+        with mock.patch.object(get_broker(), "publish") as publish:
+            with django_capture_on_commit_callbacks() as callbacks:
+                publish_board_event(self.project.id, "cards", cards=[])
+
+            assert not publish.called
+            callbacks[0]()
+
+        assert self.published(publish) == [{"type": "cards", "cards": []}]
+
+    def test_status_change_publishes_card(
+        self, client, django_capture_on_commit_callbacks
+    ):
+        client.force_login(self.user)
+        with mock.patch.object(get_broker(), "publish") as publish:
+            with django_capture_on_commit_callbacks(execute=True):
+                client.post(
+                    reverse("update_task_status", args=[self.project.id]),
+                    json.dumps(
+                        {"task_id": self.ticket.id, "status": "testing"}
+                    ),
+                    content_type="application/json",
+                )
+
+        (event,) = self.published(publish)
+        (card,) = event["cards"]
+        assert card["task_id"] == self.ticket.id
+        assert card["status"] == "testing"
+        assert f'data-task-id="{self.ticket.id}"' in card["html"]
+
+    def test_create_ticket_publishes_card(
+        self, client, django_capture_on_commit_callbacks
+    ):
+        client.force_login(self.user)
+        with mock.patch.object(get_broker(), "publish") as publish:
+            with django_capture_on_commit_callbacks(execute=True):
+                client.post(
+                    reverse("create_ticket", args=[self.project.id]),
+                    {
+                        "title": "Fresh",
+                        "description": "Pushed to open boards",
+                        "priority": "low",
+                        "ticket_type": "task",
+                    },
+                )
+
+        (event,) = self.published(publish)
+        assert "Fresh" in event["cards"][0]["html"]
+
+    def test_events_require_project_access(self, client):
+        outsider = baker.make("accounts.TicketsUser", email="b@user.com")
+        client.force_login(outsider)
+
+        response = client.get(reverse("board_events", args=[self.project.id]))
+
+        assert response.status_code == 403
+
+    def test_events_stream_for_members(self, client):
+        client.force_login(self.user)
+
+        response = client.get(reverse("board_events", args=[self.project.id]))
+
+        assert response.status_code == 200
+        assert response["Content-Type"] == "text/event-stream"
+        assert response.streaming
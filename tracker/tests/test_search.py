@@ -0,0 +1,83 @@
+import pytest
+from django.urls import reverse
+from model_bakery import baker
+
+from tracker import search
+from tracker.models import Comment, Ticket
+from tracker.search import highlight, search_tickets
+
+
+@pytest.mark.django_db
+class TestTicketSearch:
+    def setup_method(self):
+        self.user = baker.make("accounts.TicketsUser", email="a@x.com")
+        self.project = baker.make("tracker.Project", owner=self.user)
+        self.login = baker.make(
+            "tracker.Ticket",
+            project=self.project,
+            creator=self.user,
+            title="Login page crashes",
+            description="Stack trace when the password is empty",
+        )
+        self.other = baker.make(
+            "tracker.Ticket",
+            project=self.project,
+            creator=self.user,
+            title="Dark mode",
+            description="Colors",
+        )
+
+    def test_comment_changes_refresh_each_ticket_once_on_commit(
+        self, monkeypatch, django_capture_on_commit_callbacks
+    ):
+        refreshed = []
+        monkeypatch.setattr(
+            search,
+            "refresh_search_vectors",
+            lambda ticket_ids: refreshed.append(set(ticket_ids)),
+        )
+
+        with django_capture_on_commit_callbacks(execute=True):
+            for ticket in (self.login, self.login, self.other):
+                Comment.objects.create(
+                    ticket=ticket, author=self.user, text="Seen it"
+                )
+        assert refreshed == [{self.login.id, self.other.id}]
+
+        refreshed.clear()
+        with django_capture_on_commit_callbacks(execute=True):
+            self.login.delete()
+            Comment.objects.filter(ticket=self.other).delete()
+        assert refreshed == [{self.other.id}]
+
+    def test_matches_title_description_and_comments(self):
+        Comment.objects.create(
+            ticket=self.other, author=self.user, text="Needs a toggle"
+        )
+
+        def found(query):
+            return set(search_tickets(Ticket.objects.all(), query))
+
+        assert found("crashes") == {self.login}
+        assert found("password empty") == {self.login}
+        assert found("toggle") == {self.other}
+
+    def test_highlight_escapes_and_marks_terms(self):
+        html = highlight("<b>Login</b> fails", "login")
+
+        assert html == "&lt;b&gt;<mark>Login</mark>&lt;/b&gt; fails"
+
+    def test_view_only_searches_visible_projects(self, client):
+        stranger = baker.make("accounts.TicketsUser", email="b@x.com")
+        baker.make(
+            "tracker.Ticket",
+            creator=stranger,
+            title="Login secrets",
+            project=baker.make("tracker.Project", owner=stranger),
+        )
+        client.force_login(self.user)
+
+        response = client.get(reverse("ticket_search"), {"q": "login"})
+
+        assert list(response.context["page"]) == [self.login]
+        assert b"<mark>Login</mark>" in response.content
@@ -0,0 +1,128 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from model_bakery import baker
+
+from tracker.models import SubTask
+
+
+@pytest.mark.django_db
+class TestUpdateSubtasks:
+    def setup_method(self):
+        self.user = baker.make("accounts.TicketsUser", email="me@user.com")
+        self.project = baker.make("tracker.Project", owner=self.user)
+        self.project.members.add(self.user)
+        self.ticket = baker.make(
+            "tracker.Ticket", project=self.project, creator=self.user
+        )
+        self.subtasks = [
+            SubTask.objects.create(ticket=self.ticket, text=f"Step {i}")
+            for i in range(3)
+        ]
+        self.url = reverse(
+            "update_subtasks", args=[self.project.id, self.ticket.id]
+        )
+
+    def post(self, client, changes):
+        return client.post(
+            self.url, {"changes": changes}, content_type="application/json"
+        )
+
+    def test_applies_every_kind_of_change(self, client):
+        client.force_login(self.user)
+        first, second, third = self.subtasks
+        other = baker.make(SubTask, text="Elsewhere")
+
+        response = self.post(
+            client,
+            [
+                {"op": "toggle", "id": first.id, "is_done": True},
+                {"op": "rename", "id": first.id, "text": "Renamed"},
+                {"op": "toggle", "id": second.id, "is_done": True},
+                {"op": "delete", "id": second.id},
+                {"op": "delete", "id": third.id},
+                {"op": "add", "text": "New"},
+                {"op": "toggle", "id": other.id, "is_done": True},
+            ],
+        )
+
+        data = response.json()
+        assert data["success"]
+        assert data["missing"] == [other.id]
+        assert (data["subtasks_done"], data["subtasks_total"]) == (1, 2)
+        assert set(self.ticket.subtasks.values_list("text", "is_done")) == {
+            ("Renamed", True),
+            ("New", False),
+        }
+        assert data["added"][0]["text"] == "New"
+        other.refresh_from_db()
+        assert not other.is_done
+
+    def test_query_count_does_not_grow_with_the_batch(self, client):
+        client.force_login(self.user)
+
+        def toggle(subtasks):
+            with CaptureQueriesContext(connection) as queries:
+                self.post(
+                    client,
+                    [
+                        {"op": "toggle", "id": subtask.id, "is_done": True}
+                        for subtask in subtasks
+                    ],
+                )
+            return len(queries)
+
+        small = toggle(self.subtasks[:1])
+        large = toggle(self.subtasks)
+
+        assert large == small
+
+    def test_deletes_without_per_row_queries(self, client):
+        client.force_login(self.user)
+        doomed = SubTask.objects.bulk_create(
+            SubTask(ticket=self.ticket, text=f"Extra {i}") for i in range(30)
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post(
+                client,
+                [{"op": "delete", "id": subtask.id} for subtask in doomed],
+            )
+
+        assert response.json()["subtasks_total"] == len(self.subtasks)
+        # One DELETE and no per-row counter UPDATEs; the rest is the
+        # request, the locked batch, the repair and the reply.
+        assert len(queries) == 14
+        assert not [q for q in queries if q["sql"].startswith("UPDATE")]
+
+    @pytest.mark.parametrize(
+        "changes",
+        [
+            [],
+            "toggle",
+            [{"op": "flip", "id": 1}],
+            [{"op": "toggle", "id": "1"}],
+            [{"op": "toggle", "id": 1}],
+            [{"op": "toggle", "id": 1, "is_done": "false"}],
+            [{"op": "add", "text": ""}],
+            [{"op": "rename", "id": 1, "text": "x" * 256}],
+        ],
+    )
+    def test_rejects_invalid_batches(self, client, changes):
+        client.force_login(self.user)
+
+        response = self.post(client, changes)
+
+        assert response.status_code == 400
+        assert not response.json()["success"]
+
+    def test_requires_project_access(self, client):
+        client.force_login(baker.make("accounts.TicketsUser"))
+
+        response = self.post(
+            client, [{"op": "delete", "id": self.subtasks[0].id}]
+        )
+
+        assert response.status_code == 403
+        assert SubTask.objects.filter(id=self.subtasks[0].id).exists()
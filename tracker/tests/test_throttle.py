@@ -0,0 +1,59 @@
+from unittest import mock
+
+import pytest
+from django.urls import reverse
+from model_bakery import baker
+from redis.exceptions import ConnectionError
+
+from tracker.throttle import LocalBuckets, take_token
+from tracker.views import AUTOCOMPLETE_BURST
+
+
+class TestTokenBucket:
+    def test_local_bucket_allows_burst_then_waits(self):
+        buckets = LocalBuckets()
+
+        with mock.patch("tracker.throttle.time.monotonic", return_value=100):
+            results = [buckets.take("k", 2, 3) for _ in range(4)]
+
+        assert [allowed for allowed, _ in results] == [True] * 3 + [False]
+        assert results[-1][1] == pytest.approx(0.5)
+
+    def test_local_bucket_refills_over_time(self):
+        buckets = LocalBuckets()
+        with mock.patch("tracker.throttle.time.monotonic") as clock:
+            clock.return_value = 100
+            buckets.take("k", 1, 1)
+            assert not buckets.take("k", 1, 1)[0]
+
+            clock.return_value = 101
+            assert buckets.take("k", 1, 1)[0]
+
+    def test_falls_back_when_redis_is_down(self):
+        client = mock.Mock()
+        client.eval.side_effect = ConnectionError
+        with mock.patch(
+            "tracker.throttle.get_redis_connection", return_value=client
+        ):
+            allowed, _ = take_token("fallback", 1, 1)
+
+        assert allowed
+        assert client.eval.called
+
+
+@pytest.mark.django_db
+class TestAutocompleteThrottle:
+    def test_returns_429_with_retry_after(self, client):
+        user = baker.make("accounts.TicketsUser", email="t@x.com")
+        client.force_login(user)
+        url = reverse("user_email_autocomplete")
+
+        statuses = [
+            client.get(url, {"q": "te"}).status_code
+            for _ in range(AUTOCOMPLETE_BURST)
+        ]
+        response = client.get(url, {"q": "te"})
+
+        assert set(statuses) == {200}
+        assert response.status_code == 429
+        assert int(response["Retry-After"]) >= 1
@@ -0,0 +1,127 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from model_bakery import baker
+
+from tracker.models import Attachment, AttachmentUpload
+from tracker.uploads import UPLOAD_CHUNK_SIZE, part_path
+
+PDF = b"%PDF-1.4\n" + b"x" * (UPLOAD_CHUNK_SIZE + 100)
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.TRACKER_UPLOAD_DIR = tmp_path / ".uploads"
+    return tmp_path
+
+
+@pytest.mark.django_db
+class TestChunkedUploads:
+    def setup_method(self):
+        self.user = baker.make("accounts.TicketsUser", email="me@user.com")
+        self.project = baker.make("tracker.Project", owner=self.user)
+        self.project.members.add(self.user)
+        self.ticket = baker.make(
+            "tracker.Ticket", project=self.project, creator=self.user
+        )
+        self.start_url = reverse(
+            "start_attachment_upload", args=[self.project.id, self.ticket.id]
+        )
+
+    def start(self, client, filename="report.pdf", size=len(PDF)):
+        return client.post(
+            self.start_url,
+            {"filename": filename, "size": size},
+            content_type="application/json",
+        )
+
+    def send(self, client, url, offset, chunk):
+        return client.generic(
+            "PATCH",
+            url,
+            chunk,
+            content_type="application/offset+octet-stream",
+            headers={"Upload-Offset": str(offset)},
+        )
+
+    def test_uploads_in_chunks_and_resumes(self, client, media_root):
+        client.force_login(self.user)
+        upload = self.start(client).json()
+        url = upload["url"]
+
+        response = self.send(client, url, 0, PDF[:UPLOAD_CHUNK_SIZE])
+        assert response.json()["offset"] == UPLOAD_CHUNK_SIZE
+
+        # A retried chunk is refused; the client asks where to go on.
+        response = self.send(client, url, 0, PDF[:UPLOAD_CHUNK_SIZE])
+        assert response.status_code == 409
+        offset = client.get(url).json()["offset"]
+        assert offset == UPLOAD_CHUNK_SIZE
+
+        response = self.send(client, url, offset, PDF[offset:])
+        assert response.status_code == 201
+        attachment = Attachment.objects.get(ticket=self.ticket)
+        assert response.json()["attachment"]["id"] == attachment.id
+        assert attachment.uploaded_by == self.user
+        assert (media_root / attachment.attached_file.name).read_bytes() == PDF
+        assert not AttachmentUpload.objects.exists()
+        assert not list((media_root / ".uploads").iterdir())
+
+    def test_rejects_content_that_does_not_match_the_type(self, client):
+        client.force_login(self.user)
+        url = self.start(client, "image.png", 10).json()["url"]
+
+        response = self.send(client, url, 0, b"%PDF-1.4\nx")
+
+        assert response.status_code == 415
+        assert AttachmentUpload.objects.get().received == 0
+
+    def test_rejects_bad_files_and_oversized_chunks(self, client):
+        client.force_login(self.user)
+        assert self.start(client, "script.sh").status_code == 400
+        assert self.start(client, size=11 * 1024 * 1024).status_code == 400
+
+        url = self.start(client).json()["url"]
+        response = self.send(client, url, 0, PDF[: UPLOAD_CHUNK_SIZE + 1])
+        assert response.status_code == 413
+
+        url = self.start(client, size=20).json()["url"]
+        response = self.send(client, url, 0, PDF[:30])
+        assert response.status_code == 413
+        assert not Attachment.objects.exists()
+
+    def test_uploads_are_private_to_their_uploader(self, client):
+        client.force_login(self.user)
+        url = self.start(client).json()["url"]
+        other = baker.make("accounts.TicketsUser", email="other@user.com")
+        self.project.members.add(other)
+
+        client.force_login(other)
+        assert client.get(url).status_code == 404
+        assert self.send(client, url, 0, PDF[:100]).status_code == 404
+
+    def test_clears_stale_uploads(self, client):
+        client.force_login(self.user)
+        self.start(client)
+        fresh = AttachmentUpload.objects.get()
+        stale = baker.make(
+            AttachmentUpload,
+            ticket=self.ticket,
+            uploaded_by=self.user,
+            filename="old.pdf",
+            size=10,
+        )
+        AttachmentUpload.objects.filter(pk=stale.pk).update(
+            created_at=timezone.now() - timedelta(days=2)
+        )
+        part_path(stale).touch()
+
+        call_command("clear_stale_uploads")
+
+        assert list(AttachmentUpload.objects.all()) == [fresh]
+        assert not part_path(stale).exists()
+        assert part_path(fresh).exists()
@@ -1,18 +1,25 @@
 import json
+from datetime import timedelta
 
 import pytest
+from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from model_bakery import baker
 
 from tracker.models import (
     Attachment,
     Comment,
+    Invitation,
     Project,
     SubTask,
     Ticket,
     TrackerGroup,
 )
+from tracker.views import GROUP_PAGE_SIZE
 
 
 @pytest.mark.django_db
@@ -59,6 +66,49 @@ class TestTrackerView:
         assert "owned_groups" in response.context
         assert "member_groups" in response.context
 
+    def test_group_list_annotates_counts(self, client):
+        self.group.members.add(self.user2)
+        client.force_login(self.user)
+
+        response = client.get(reverse("group_list"))
+
+        (group,) = response.context["owned_groups"]
+        assert group.member_count == 2
+        assert group.project_count == 1
+        assert b"2 members" in response.content
+
+    def test_group_list_paginates_and_sorts(self, client):
+        baker.make(
+            "tracker.TrackerGroup",
+            owner=self.user,
+            _quantity=GROUP_PAGE_SIZE,
+        )
+        client.force_login(self.user)
+        url = reverse("group_list")
+
+        with CaptureQueriesContext(connection) as queries:
+            first = client.get(url, {"sort": "members"})
+        # Session, user, then a count and a page for each list.
+        assert len(queries) == 6
+
+        second = client.get(url, {"sort": "members", "owned_groups_page": 2})
+
+        assert len(first.context["owned_groups"]) == GROUP_PAGE_SIZE
+        assert first.context["owned_groups"][0] == self.group
+        assert len(second.context["owned_groups"]) == 1
+
+        both = client.get(
+            url,
+            {
+                "sort": "members",
+                "owned_groups_page": 2,
+                "member_groups_page": 3,
+            },
+        )
+        assert both.context["owned_groups"].previous_url == (
+            "?sort=members&owned_groups_page=1&member_groups_page=3"
+        )
+
     def test_create_group_get(self, client):
         client.force_login(self.user)
         response = client.get(reverse("create_group"))
@@ -84,6 +134,51 @@ class TestTrackerView:
         assert response.status_code == 200
         assert response.context["group"] == self.group
 
+    def test_group_view_counts_per_project(self, client):
+        self.project.members.add(self.user2)
+        baker.make(
+            "tracker.Ticket",
+            project=self.project,
+            creator=self.user,
+            status="done",
+        )
+        client.force_login(self.user)
+
+        response = client.get(reverse("group_view", args=[self.group.id]))
+
+        (project,) = response.context["projects"]
+        assert project.member_count == 2
+        assert project.ticket_count == 2
+        assert project.open_count == 1
+        assert project.done_count == 1
+        assert set(response.context["members"]) == {self.user}
+
+    def test_group_view_query_count_is_constant(self, client):
+        client.force_login(self.user)
+        url = reverse("group_view", args=[self.group.id])
+        with CaptureQueriesContext(connection) as small:
+            client.get(url)
+        # The log is reset by the next request, so count right away.
+        small_count = len(small)
+
+        for _ in range(3):
+            project = baker.make(
+                "tracker.Project", owner=self.user, attached_group=self.group
+            )
+            project.members.add(self.user, self.user2)
+            baker.make(
+                "tracker.Ticket",
+                project=project,
+                creator=self.user,
+                _quantity=3,
+            )
+        self.group.members.add(self.user2, self.other_user)
+        with CaptureQueriesContext(connection) as large:
+            response = client.get(url)
+
+        assert len(response.context["members"]) == 3
+        assert len(large) == small_count
+
     def test_project_list(self, client):
         client.force_login(self.user)
         response = client.get(reverse("project_list"))
@@ -109,6 +204,26 @@ class TestTrackerView:
 
         assert Project.objects.filter(title="New Project").exists()
 
+    def test_create_project_attaches_members_in_bulk(self, client):
+        self.group.members.add(self.other_user)
+        client.force_login(self.user)
+        data = {
+            "title": "Bulk Project",
+            "emails": "test2@user.com, missing@user.com",
+            "inherit_group_members": "on",
+        }
+        with CaptureQueriesContext(connection) as queries:
+            client.post(reverse("create_project", args=[self.group.id]), data)
+        project_queries = len(queries)
+
+        project = Project.objects.get(title="Bulk Project")
+        assert set(project.members.all()) == {
+            self.user,
+            self.user2,
+            self.other_user,
+        }
+        assert project_queries < 20
+
     def test_project_details(self, client):
         client.force_login(self.user)
         response = client.get(
@@ -118,6 +233,93 @@ class TestTrackerView:
         assert response.status_code == 200
         assert response.context["project"] == self.project
 
+    def test_project_details_buckets_tickets_by_status(self, client):
+        done = baker.make(
+            "tracker.Ticket",
+            project=self.project,
+            creator=self.user,
+            status="done",
+        )
+        client.force_login(self.user)
+        response = client.get(
+            reverse("project_details", args=[self.project.id])
+        )
+
+        columns = {
+            column["key"]: [ticket.id for ticket in column["tickets"]]
+            for column in response.context["columns"]
+        }
+        assert columns["open"] == [self.ticket.id]
+        assert columns["done"] == [done.id]
+        assert columns["in_progress"] == []
+
+    def test_project_details_limits_columns_to_first_page(
+        self, client, monkeypatch
+    ):
+        monkeypatch.setattr("tracker.views.BOARD_PAGE_SIZE", 2)
+        baker.make(
+            "tracker.Ticket",
+            project=self.project,
+            creator=self.user,
+            status="open",
+            _quantity=2,
+        )
+        client.force_login(self.user)
+        response = client.get(
+            reverse("project_details", args=[self.project.id])
+        )
+
+        open_column = response.context["columns"][0]
+        assert len(open_column["tickets"]) == 2
+        last = open_column["tickets"][-1]
+        assert open_column["next_cursor"] == f"{last.rank}.{last.id}"
+
+    def test_board_column_returns_next_page(self, client):
+        later = baker.make(
+            "tracker.Ticket",
+            project=self.project,
+            creator=self.user,
+            status="open",
+            _quantity=3,
+        )
+        client.force_login(self.user)
+        response = client.get(
+            reverse("board_column", args=[self.project.id, "open"]),
+            {"after": f"{self.ticket.rank}.{self.ticket.id}", "limit": 2},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["count"] == 2
+        assert data["next_cursor"] == f"{later[1].rank}.{later[1].id}"
+        assert f'data-task-id="{later[0].id}"' in data["html"]
+        assert f'data-task-id="{self.ticket.id}"' not in data["html"]
+
+        response = client.get(
+            reverse("board_column", args=[self.project.id, "open"]),
+            {"after": data["next_cursor"]},
+        )
+        assert response.json()["next_cursor"] is None
+
+    def test_project_details_reflects_ticket_edits(self, client):
+        client.force_login(self.user)
+        url = reverse("project_details", args=[self.project.id])
+        client.get(url)
+
+        self.ticket.title = "Renamed Ticket"
+        self.ticket.save()
+        response = client.get(url)
+
+        assert "Renamed Ticket" in response.content.decode()
+
+    def test_board_column_invalid_status(self, client):
+        client.force_login(self.user)
+        response = client.get(
+            reverse("board_column", args=[self.project.id, "archived"])
+        )
+
+        assert response.status_code == 400
+
     def test_ticket_list(self, client):
         client.force_login(self.user2)
         response = client.get(reverse("ticket_list"))
@@ -125,6 +327,66 @@ class TestTrackerView:
         assert response.status_code == 200
         assert "user_tickets" in response.context
 
+    def test_ticket_list_query_count_is_pinned(self, client):
+        client.force_login(self.user2)
+        url = reverse("ticket_list")
+        with CaptureQueriesContext(connection) as small:
+            client.get(url)
+        small_count = len(small)
+
+        for _ in range(3):
+            project = baker.make("tracker.Project", owner=self.user)
+            baker.make(
+                "tracker.Ticket",
+                project=project,
+                creator=self.user,
+                assignee=self.user2,
+                _quantity=4,
+            )
+        # Cold fragments, so every card is rendered from the row itself.
+        cache.clear()
+        with CaptureQueriesContext(connection) as large:
+            response = client.get(url)
+
+        assert len(response.context["user_tickets"]) == 13
+        # Session, user, ETag aggregate, page, status counts and the
+        # creator choices of the filter form.
+        assert len(large) == small_count == 6
+
+    def test_ticket_list_keyset_pagination_and_status_counts(
+        self, client, monkeypatch
+    ):
+        monkeypatch.setattr("tracker.views.TICKET_LIST_PAGE_SIZE", 2)
+        baker.make(
+            "tracker.Ticket",
+            project=self.project,
+            creator=self.user,
+            assignee=self.user2,
+            status="done",
+            _quantity=2,
+        )
+        client.force_login(self.user2)
+
+        first = client.get(reverse("ticket_list"))
+        second = client.get(
+            reverse("ticket_list"), {"after": first.context["next_cursor"]}
+        )
+        bad = client.get(reverse("ticket_list"), {"after": "nope"})
+
+        seen = first.context["user_tickets"] + second.context["user_tickets"]
+        expected = Ticket.objects.filter(assignee=self.user2).order_by(
+            "-updated_at", "-id"
+        )
+        assert seen == list(expected)
+        assert second.context["next_cursor"] is None
+        counts = {
+            status["key"]: status["count"]
+            for status in first.context["status_counts"]
+        }
+        assert counts["done"] == 2
+        assert counts["open"] == len(expected) - 2
+        assert bad.status_code == 400
+
     def test_create_ticket_get(self, client):
         client.force_login(self.user)
         response = client.get(reverse("create_ticket", args=[self.project.id]))
@@ -206,6 +468,18 @@ class TestTrackerView:
 
         assert response.status_code == 403
 
+    def test_send_invitation_skips_unknown_addresses(self, client):
+        client.force_login(self.user)
+        data = {"emails": "missing@user.com, other@user.com"}
+        response = client.post(
+            reverse("send_invitation", args=[self.group.id]), data
+        )
+
+        assert response.status_code == 302
+        assert Invitation.objects.filter(
+            target_user=self.other_user, target_group=self.group
+        ).exists()
+
     def test_decline_invitation(self, client):
         invitation = baker.make(
             "tracker.Invitation",
@@ -223,6 +497,7 @@ class TestTrackerView:
 
         assert response.status_code == 302
         invitation.refresh_from_db()
+        assert invitation.invitation_status == "declined"
 
     def test_ticket_detail_post_comment(self, client):
         client.force_login(self.user)
@@ -246,6 +521,163 @@ class TestTrackerView:
         assert response.status_code == 302
         assert SubTask.objects.filter(text="Test subtask").exists()
 
+    def test_ticket_detail_query_count_is_bounded(self, client):
+        client.force_login(self.user)
+        url = reverse("ticket_detail", args=[self.project.id, self.ticket.id])
+        with CaptureQueriesContext(connection) as small:
+            client.get(url)
+        small_count = len(small)
+
+        baker.make(SubTask, ticket=self.ticket, _quantity=5)
+        for author in (self.user, self.user2, self.other_user):
+            baker.make(Comment, ticket=self.ticket, author=author)
+            baker.make(
+                Attachment,
+                ticket=self.ticket,
+                uploaded_by=author,
+                attached_file="ticket_attachments/notes.txt",
+            )
+        self.project.members.add(self.other_user)
+        with CaptureQueriesContext(connection) as large:
+            response = client.get(url)
+
+        assert len(response.context["subtasks"]) == 6
+        assert [c.author for c in response.context["comments"]] == [
+            self.user,
+            self.user2,
+            self.other_user,
+        ]
+        assert len(large) == small_count
+
+    def test_ticket_detail_pages_comments(self, client, monkeypatch):
+        monkeypatch.setattr("tracker.loaders.COMMENT_PAGE_SIZE", 2)
+        now = timezone.now()
+        comments = [
+            baker.make(
+                Comment,
+                ticket=self.ticket,
+                author=self.user2,
+                text=f"Comment {i}",
+                created_at=now - timedelta(minutes=5 - i),
+            )
+            for i in range(5)
+        ]
+        client.force_login(self.user)
+
+        response = client.get(
+            reverse("ticket_detail", args=[self.project.id, self.ticket.id])
+        )
+        assert response.context["comments"] == comments[3:]
+
+        url = reverse(
+            "ticket_comments", args=[self.project.id, self.ticket.id]
+        )
+        cursor = response.context["comments_cursor"]
+        pages = []
+        while cursor:
+            data = client.get(url, {"before": cursor}).json()
+            pages.append(data["count"])
+            cursor = data["next_cursor"]
+        assert pages == [2, 1]
+        assert "Comment 0" in data["html"]
+
+        assert client.get(url, {"before": "nope"}).status_code == 400
+        other = baker.make("tracker.Project", owner=self.user)
+        assert (
+            client.get(
+                reverse("ticket_comments", args=[other.id, self.ticket.id])
+            ).status_code
+            == 404
+        )
+
+    def test_ticket_detail_post_subtask_formset(self, client):
+        subtasks = [
+            self.task,
+            SubTask.objects.create(ticket=self.ticket, text="Second"),
+        ]
+        client.force_login(self.user)
+        data = {
+            "update_subtasks": "true",
+            "form-TOTAL_FORMS": "2",
+            "form-INITIAL_FORMS": "2",
+        }
+        for i, subtask in enumerate(subtasks):
+            data[f"form-{i}-id"] = subtask.id
+            data[f"form-{i}-text"] = f"Step {i}"
+            data[f"form-{i}-is_done"] = "on"
+
+        response = client.post(
+            reverse("ticket_detail", args=[self.project.id, self.ticket.id]),
+            data,
+        )
+
+        assert response.status_code == 302
+        assert list(
+            SubTask.objects.filter(ticket=self.ticket)
+            .order_by("id")
+            .values_list("text", "is_done")
+        ) == [("Step 0", True), ("Step 1", True)]
+
+    def test_ticket_detail_actions_answer_xhr_with_fragments(self, client):
+        client.force_login(self.user)
+        url = reverse("ticket_detail", args=[self.project.id, self.ticket.id])
+        xhr = {"HTTP_X_REQUESTED_WITH": "XMLHttpRequest"}
+
+        with CaptureQueriesContext(connection) as queries:
+            comment = client.post(
+                url, {"add_comment": "true", "text": "Looks good"}, **xhr
+            )
+        subtask = client.post(
+            url, {"add_subtask": "true", "new_subtask": "Ship it"}, **xhr
+        )
+        edit = client.post(
+            url,
+            {
+                "title": "Renamed",
+                "description": "Text",
+                "priority": "high",
+                "ticket_type": "bug",
+                "assignee": self.user2.id,
+            },
+            **xhr,
+        )
+
+        assert comment.json()["success"]
+        assert "Looks good" in comment.json()["html"]
+        # No second page render behind the action.
+        assert not any(
+            "tracker_attachment" in query["sql"] for query in queries
+        )
+        assert 'data-task="' in subtask.json()["html"]
+        assert subtask.json()["subtasks_total"] == 2
+        assert edit.json()["ticket"]["title"] == "Renamed"
+        # Nothing is left queued for the next full page.
+        page = client.get(url)
+        assert not list(page.context["messages"])
+
+    def test_ticket_detail_xhr_reports_form_errors(self, client):
+        client.force_login(self.user)
+        url = reverse("ticket_detail", args=[self.project.id, self.ticket.id])
+
+        response = client.post(
+            url,
+            {"add_comment": "true", "text": ""},
+            HTTP_X_REQUESTED_WITH="XMLHttpRequest",
+        )
+
+        assert response.status_code == 400
+        assert "text" in response.json()["errors"]
+
+    def test_ticket_detail_of_another_project_is_not_found(self, client):
+        other_project = baker.make("tracker.Project", owner=self.user)
+        client.force_login(self.user)
+
+        response = client.get(
+            reverse("ticket_detail", args=[other_project.id, self.ticket.id])
+        )
+
+        assert response.status_code == 404
+
     def test_user_email_autocomplete(self, client):
         client.force_login(self.user)
         response = client.get(
@@ -282,6 +714,81 @@ class TestTrackerView:
 
         assert response.status_code == 400
 
+    def test_update_task_statuses_batch(self, client):
+        other = baker.make(
+            "tracker.Ticket", project=self.project, creator=self.user
+        )
+        foreign = baker.make("tracker.Ticket", creator=self.user)
+        client.force_login(self.user)
+        data = {
+            "moves": [
+                {"task_id": self.ticket.id, "status": "testing"},
+                {"task_id": other.id, "status": "done"},
+                {"task_id": self.ticket.id, "status": "done"},
+                {"task_id": foreign.id, "status": "done"},
+            ]
+        }
+        response = client.post(
+            reverse("update_task_statuses", args=[self.project.id]),
+            json.dumps(data),
+            content_type="application/json",
+        )
+
+        assert response.status_code == 200
+        assert response.json()["missing"] == [foreign.id]
+        assert set(
+            Ticket.objects.filter(id__in=[self.ticket.id, other.id])
+            .values_list("status", flat=True)
+            .distinct()
+        ) == {"done"}
+        foreign.refresh_from_db()
+        assert foreign.status == "open"
+
+    def test_update_task_statuses_places_card_between_neighbours(self, client):
+        first, second, moved = baker.make(
+            "tracker.Ticket",
+            project=self.project,
+            creator=self.user,
+            status="testing",
+            _quantity=3,
+        )
+        client.force_login(self.user)
+        data = {
+            "moves": [
+                {
+                    "task_id": moved.id,
+                    "status": "testing",
+                    "before_id": first.id,
+                    "after_id": second.id,
+                }
+            ]
+        }
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post(
+                reverse("update_task_statuses", args=[self.project.id]),
+                json.dumps(data),
+                content_type="application/json",
+            )
+
+        assert response.status_code == 200
+        writes = [q for q in queries if q["sql"].startswith("UPDATE")]
+        assert len(writes) == 1
+        ordered = Ticket.objects.filter(status="testing").order_by("rank")
+        assert list(ordered) == [first, moved, second]
+
+    def test_update_task_statuses_rejects_invalid_status(self, client):
+        client.force_login(self.user)
+        data = {"moves": [{"task_id": self.ticket.id, "status": "nope"}]}
+        response = client.post(
+            reverse("update_task_statuses", args=[self.project.id]),
+            json.dumps(data),
+            content_type="application/json",
+        )
+
+        assert response.status_code == 400
+        self.ticket.refresh_from_db()
+        assert self.ticket.status == "open"
+
     def test_group_delete_as_owner(self, client):
         client.force_login(self.user)
         group_id = self.group.id
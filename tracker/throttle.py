@@ -0,0 +1,98 @@
+"""Token-bucket rate limiting for chatty endpoints.
+
+Buckets live in Redis when the default cache is django_redis, so every
+worker shares them; the refill and take happen in one Lua script. When
+Redis is not configured or unreachable, each process falls back to its
+own in-memory buckets, which is looser but keeps the limit in place.
+"""
+
+import logging
+import threading
+import time
+
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+# Returns {allowed, seconds to wait}; floats go back as strings because
+# Redis truncates Lua numbers to integers.
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local allowed = 0
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    wait = (1 - tokens) / rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(wait)}
+"""
+
+
+class LocalBuckets:
+    """Per-process buckets, used when Redis is not available."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = {}
+
+    def take(self, key, rate, capacity):
+        now = time.monotonic()
+        with self._lock:
+            tokens, ts = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - ts) * rate)
+            if tokens >= 1:
+                self._buckets[key] = (tokens - 1, now)
+                return True, 0.0
+
+            self._buckets[key] = (tokens, now)
+            return False, (1 - tokens) / rate
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+_local_buckets = LocalBuckets()
+
+
+def _redis():
+    try:
+        return get_redis_connection("default")
+    except NotImplementedError:
+        # The default cache is not django_redis (tests, local runs).
+        return None
+
+
+def take_token(key, rate, capacity):
+    """Take one token from bucket ``key``.
+
+    ``rate`` is tokens refilled per second and ``capacity`` the burst
+    size. Returns ``(allowed, retry_after_seconds)``.
+    """
+    key = f"tracker:throttle:{key}"
+    client = _redis()
+    if client is not None:
+        try:
+            allowed, wait = client.eval(
+                TOKEN_BUCKET_SCRIPT, 1, key, rate, capacity
+            )
+            return bool(allowed), float(wait)
+        except RedisError:
+            logger.warning("Throttle falling back to local buckets")
+
+    return _local_buckets.take(key, rate, capacity)
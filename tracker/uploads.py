@@ -0,0 +1,162 @@
+"""Chunked, resumable attachment uploads.
+
+A client announces a file with its name and size, then sends it in
+chunks of at most ``UPLOAD_CHUNK_SIZE`` bytes, each at an explicit
+offset. Chunks are copied from the request into one part file under
+``settings.TRACKER_UPLOAD_DIR`` in small blocks. The ASGI handler
+buffers each request body before the view runs, so a worker holds at
+most one chunk of an upload in memory, never the whole file. Size and
+type limits are checked on every chunk. When the last byte arrives, the
+part file is hashed and renamed into the blob store (see
+``tracker.storage``), so it is never copied. After an interrupted
+upload the client asks for the stored offset and continues from there.
+"""
+
+import os
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import get_valid_filename
+
+from .models import Attachment, AttachmentUpload
+
+ATTACHMENT_MAX_SIZE = 10 * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+UPLOAD_READ_SIZE = 64 * 1024
+UPLOAD_EXPIRY = timedelta(days=1)
+
+# The leading bytes every file of an allowed type starts with.
+SIGNATURES = {
+    "pdf": b"%PDF-",
+    "png": b"\x89PNG\r\n\x1a\n",
+    "jpg": b"\xff\xd8\xff",
+    "jpeg": b"\xff\xd8\xff",
+    "doc": b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1",
+    "docx": b"PK\x03\x04",
+}
+
+
+class UploadError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def _extension(filename):
+    return filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+
+
+def part_path(upload):
+    return Path(settings.TRACKER_UPLOAD_DIR) / f"{upload.pk}.part"
+
+
+def start_upload(ticket, user, filename, size):
+    """Register an upload of ``size`` bytes and create its empty part
+    file."""
+    filename = get_valid_filename(os.path.basename(str(filename or "")))
+    if _extension(filename) not in SIGNATURES:
+        raise UploadError(
+            f"File type not allowed. Allowed: {', '.join(SIGNATURES)}"
+        )
+    if not isinstance(size, int) or not 0 < size <= ATTACHMENT_MAX_SIZE:
+        raise UploadError(
+            f"File size must be between 1 byte and {ATTACHMENT_MAX_SIZE} bytes"
+        )
+
+    upload = AttachmentUpload.objects.create(
+        ticket=ticket, uploaded_by=user, filename=filename, size=size
+    )
+    path = part_path(upload)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.touch()
+    return upload
+
+
+def _check_signature(upload, block, position):
+    """Reject ``block``, found at ``position`` in the file, if it covers
+    leading bytes that do not match the file's extension."""
+    signature = SIGNATURES[_extension(upload.filename)]
+    expected = signature[position : position + len(block)]
+    if expected and not block.startswith(expected):
+        raise UploadError("File content does not match its type", 415)
+
+
+def write_chunk(upload_id, user, offset, stream, length):
+    """Append ``length`` bytes read from ``stream`` at ``offset``.
+
+    Returns the upload, or the finished ``Attachment`` once the last
+    chunk is in. Raises ``UploadError`` when the chunk is out of place,
+    too large or of the wrong type; a rejected chunk leaves the stored
+    offset where it was, and its bytes are overwritten by the retry.
+    """
+    if not 0 < length <= UPLOAD_CHUNK_SIZE:
+        raise UploadError(
+            f"Chunks must be between 1 and {UPLOAD_CHUNK_SIZE} bytes", 413
+        )
+
+    with transaction.atomic():
+        # The row lock serialises chunks of one upload across workers.
+        upload = (
+            AttachmentUpload.objects.select_for_update()
+            .filter(pk=upload_id, uploaded_by=user)
+            .first()
+        )
+        if upload is None:
+            raise UploadError("Upload not found", 404)
+        if offset != upload.received:
+            raise UploadError(
+                f"Expected offset {upload.received}, got {offset}", 409
+            )
+        if offset + length > upload.size:
+            raise UploadError("Chunk runs past the declared file size", 413)
+
+        written = 0
+        with open(part_path(upload), "r+b") as part:
+            part.seek(offset)
+            while written < length:
+                block = stream.read(min(UPLOAD_READ_SIZE, length - written))
+                if not block:
+                    raise UploadError("Chunk ended early")
+                _check_signature(upload, block, offset + written)
+                part.write(block)
+                written += len(block)
+            part.truncate(offset + written)
+
+        upload.received = offset + written
+        upload.save(update_fields=["received"])
+
+        if upload.received < upload.size:
+            return upload
+        return _finish(upload)
+
+
+def _finish(upload):
+    storage = Attachment._meta.get_field("attached_file").storage
+    # One sequential read to hash the file, then a rename into the blob
+    # store; the data is not copied.
+    name = storage.adopt(str(part_path(upload)), upload.filename)
+
+    attachment = Attachment(
+        ticket=upload.ticket,
+        uploaded_by=upload.uploaded_by,
+        filename=upload.filename,
+    )
+    attachment.attached_file.name = name
+    attachment.save()
+    upload.delete()
+    return attachment
+
+
+def clear_stale_uploads(now=None):
+    """Drop uploads left unfinished for longer than ``UPLOAD_EXPIRY``."""
+    cutoff = (now or timezone.now()) - UPLOAD_EXPIRY
+    stale = list(AttachmentUpload.objects.filter(created_at__lt=cutoff))
+    for upload in stale:
+        part_path(upload).unlink(missing_ok=True)
+    AttachmentUpload.objects.filter(
+        pk__in=[upload.pk for upload in stale]
+    ).delete()
+    return len(stale)
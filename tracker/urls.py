@@ -64,6 +64,11 @@ urlpatterns = [
         view=views.ticket_detail,
         name="ticket_detail",
     ),
+    path(
+        "tickets/<int:project_id>/<int:ticket_id>/comments/",
+        view=views.ticket_comments,
+        name="ticket_comments",
+    ),
     path(
         "tickets/update/<int:project_id>/<int:ticket_id>/",
         view=views.update_ticket,
@@ -74,16 +79,66 @@ urlpatterns = [
         view=views.add_subtask,
         name="add_subtask",
     ),
+    path(
+        "tickets/<int:project_id>/<int:ticket_id>/subtasks/",
+        views.update_subtasks,
+        name="update_subtasks",
+    ),
+    path(
+        "tickets/<int:project_id>/<int:ticket_id>/uploads/",
+        views.start_attachment_upload,
+        name="start_attachment_upload",
+    ),
+    path(
+        "tickets/<int:project_id>/<int:ticket_id>/uploads/<uuid:upload_id>/",
+        views.attachment_upload,
+        name="attachment_upload",
+    ),
     path(
         "tickets/<int:project_id>/<int:ticket_id>/update_status/<int:task_id>/",
         views.update_task_ajax,
         name="update_task_ajax",
     ),
+    path(
+        "tickets/search/",
+        view=views.ticket_search,
+        name="ticket_search",
+    ),
+    path(
+        "tickets/filters/",
+        view=views.saved_filter_list,
+        name="saved_filter_list",
+    ),
+    path(
+        "tickets/filters/<int:filter_id>/",
+        view=views.saved_filter_results,
+        name="saved_filter_results",
+    ),
+    path(
+        "tickets/filters/<int:filter_id>/delete/",
+        view=views.delete_saved_filter,
+        name="delete_saved_filter",
+    ),
     path(
         "tickets/update_task_status/<int:project_id>",
         view=views.update_task_status,
         name="update_task_status",
     ),
+    path(
+        "tickets/update_task_status/<int:project_id>/batch",
+        view=views.update_task_statuses,
+        name="update_task_statuses",
+    ),
+    path(
+        "projects/<int:project_id>/columns/<str:status>/",
+        view=views.board_column,
+        name="board_column",
+    ),
+    path(
+        "projects/<int:project_id>/events/",
+        view=views.board_events,
+        name="board_events",
+    ),
     path(
         "api/autocomplete/emails/",
         view=views.user_email_autocomplete,
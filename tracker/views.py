@@ -1,49 +1,398 @@
 import json
 
-from django import forms
+from asgiref.sync import sync_to_async
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.core.paginator import Paginator
 from django.db import transaction
-from django.forms import modelformset_factory
-from django.http import HttpResponseForbidden, JsonResponse
-from django.shortcuts import get_object_or_404, redirect, render
+from django.db.models import (
+    Count,
+    F,
+    OuterRef,
+    Q,
+    Subquery,
+    Window,
+)
+from django.db.models.functions import Coalesce, RowNumber, Substr
+from django.http import (
+    HttpResponseBadRequest,
+    HttpResponseForbidden,
+    JsonResponse,
+    StreamingHttpResponse,
+)
+from django.shortcuts import (
+    aget_object_or_404,
+    get_object_or_404,
+    redirect,
+    render,
+)
+from django.template.loader import render_to_string
 from django.urls import reverse
 from django.utils import timezone
+from django.views.decorators.cache import cache_control
 from django.views.decorators.csrf import csrf_protect
-from django.views.decorators.http import require_POST
+from django.views.decorators.http import (
+    condition,
+    require_GET,
+    require_http_methods,
+    require_POST,
+)
 
 from accounts.models import TicketsUser
 
-from .decorators import group_access_required, project_access_required
+from .access import can_access_project
+from .autocomplete import search_emails
+from .cache import attach_fragments, get_versions, invalidate
+from .decorators import (
+    group_access_required,
+    project_access_required,
+    throttle,
+)
+from .etags import board_etag, ticket_detail_etag, ticket_list_etag
+from .filters import TicketFilterForm
 from .forms import (
     CommentForm,
     GroupForm,
     ProjectForm,
+    SavedFilterForm,
     SecureAttachmentForm,
+    SubTaskFormSet,
     TicketForm,
 )
+from .invitations import INVITED, UNKNOWN, invite_to_group, parse_emails
+from .loaders import load_comments, load_ticket_detail, older_than
+from .memberships import inherit_group_members
 from .models import (
-    Invitation,
+    AttachmentUpload,
     Project,
+    SavedFilter,
     SubTask,
     Ticket,
     TrackerGroup,
 )
+from .ranking import rank_in_column
+from .realtime import board_channel, event_stream, publish_board_event
+from .saved_filters import saved_filter_counts, saved_filter_tickets
+from .search import highlight, search_tickets, visible_projects
+from .subtasks import save_subtasks
+from .uploads import (
+    UPLOAD_CHUNK_SIZE,
+    UploadError,
+    start_upload,
+    write_chunk,
+)
+
+BOARD_STATUSES = [
+    {"key": "open", "label": "Open", "badge_class": "bg-secondary"},
+    {
+        "key": "in_progress",
+        "label": "In Progress",
+        "badge_class": "bg-warning text-dark",
+    },
+    {
+        "key": "testing",
+        "label": "Testing",
+        "badge_class": "bg-info text-dark",
+    },
+    {"key": "done", "label": "Done", "badge_class": "bg-success"},
+    {
+        "key": "closed",
+        "label": "Closed",
+        "badge_class": "bg-dark text-white",
+    },
+]
+
+BOARD_COLUMNS = {status["key"]: status for status in BOARD_STATUSES}
+
+BOARD_PRIORITIES = [
+    {"key": "low", "label": "Low", "badge_class": "badge-success"},
+    {"key": "medium", "label": "Medium", "badge_class": "badge-warning"},
+    {"key": "high", "label": "High", "badge_class": "badge-danger"},
+]
+
+# Cards only show the first 15 words of the description, so there is no
+# point in pulling whole descriptions out of the database.
+BOARD_DESCRIPTION_PREVIEW = 300
+
+BOARD_PAGE_SIZE = 50
+BOARD_MAX_PAGE_SIZE = 200
+
+MAX_BATCH_MOVES = 500
+MAX_SUBTASK_CHANGES = 200
+SUBTASK_OPS = ("toggle", "rename", "add", "delete")
+
+# Per user: a fast typist sends a burst, then roughly one request per
+# debounce interval.
+AUTOCOMPLETE_RATE = 5
+AUTOCOMPLETE_BURST = 10
+
+GROUP_PAGE_SIZE = 25
+
+SEARCH_PAGE_SIZE = 20
+TICKET_LIST_PAGE_SIZE = 50
+# Everything ticket_list_card.html and its cache key read.
+TICKET_LIST_FIELDS = (
+    "id",
+    "title",
+    "status",
+    "updated_at",
+    "subtasks_total",
+    "subtasks_done",
+    "project",
+    "project__title",
+)
+SAVED_FILTER_PAGE_SIZE = 25
+
+GROUP_SORTS = {
+    "title": {"label": "Name", "order_by": ["title", "id"]},
+    "newest": {"label": "Newest", "order_by": ["-created_at", "-id"]},
+    "members": {"label": "Most members", "order_by": ["-member_count", "id"]},
+}
+
+
+def _board_tickets(project, filters=None):
+    return (
+        project.tickets.filter(filters or Q())
+        .only(
+            "id",
+            "title",
+            "status",
+            "priority",
+            "rank",
+            "updated_at",
+            "project",
+            "subtasks_total",
+            "subtasks_done",
+        )
+        .annotate(
+            description_preview=Substr(
+                "description", 1, BOARD_DESCRIPTION_PREVIEW
+            )
+        )
+    )
+
+
+def _board_columns(project, filters=None):
+    tickets = (
+        _board_tickets(project, filters)
+        .annotate(
+            column_position=Window(
+                RowNumber(),
+                partition_by=F("status"),
+                order_by=[F("rank").asc(), F("id").asc()],
+            )
+        )
+        .filter(column_position__lte=BOARD_PAGE_SIZE + 1)
+        .order_by("status", "rank", "id")
+    )
+
+    columns = [{**status, "tickets": []} for status in BOARD_STATUSES]
+    by_status = {column["key"]: column["tickets"] for column in columns}
+    for ticket in tickets:
+        if ticket.status in by_status:
+            by_status[ticket.status].append(ticket)
+
+    for column in columns:
+        column["next_cursor"] = _trim_page(column["tickets"], BOARD_PAGE_SIZE)
+
+    _attach_kanban_cards(
+        project, [ticket for column in columns for ticket in column["tickets"]]
+    )
+
+    return columns
+
+
+def _attach_kanban_cards(project, tickets):
+    return attach_fragments(
+        tickets,
+        "projects/kanban_card.html",
+        key_func=lambda ticket: f"{ticket.id}:{ticket.updated_at.timestamp()}",
+        context_func=lambda ticket: {
+            "project": project,
+            "column": BOARD_COLUMNS[ticket.status],
+            "task": ticket,
+        },
+    )
+
+
+def _publish_cards(project, ticket_ids):
+    """Send the fresh cards of ``ticket_ids`` to every open board."""
+    tickets = _attach_kanban_cards(
+        project, _board_tickets(project).filter(id__in=ticket_ids)
+    )
+    if tickets:
+        publish_board_event(
+            project.id,
+            "cards",
+            cards=[
+                {
+                    "task_id": ticket.id,
+                    "status": ticket.status,
+                    "rank": ticket.rank,
+                    "html": ticket.card_html,
+                }
+                for ticket in tickets
+            ],
+        )
+
+
+def _related_count(model, field):
+    """Count the ``model`` rows pointing at the outer row through
+    ``field``, as a correlated subquery that does not multiply joins."""
+    return Coalesce(
+        Subquery(
+            model.objects.filter(**{field: OuterRef("pk")})
+            .order_by()
+            .values(field)
+            .annotate(count=Count("*"))
+            .values("count")
+        ),
+        0,
+    )
+
+
+def _attach_group_cards(groups):
+    versions = get_versions("group", [group.id for group in groups])
+    return attach_fragments(
+        groups,
+        "groups/group_card_body.html",
+        key_func=lambda group: f"{group.id}:{versions[group.id]}",
+        context_func=lambda group: {"group": group},
+    )
+
+
+def _attach_project_cards(projects):
+    versions = get_versions("project", [project.id for project in projects])
+    return attach_fragments(
+        projects,
+        "projects/project_card.html",
+        key_func=lambda project: f"{project.id}:{versions[project.id]}",
+        context_func=lambda project: {"project": project},
+    )
+
+
+def _attach_ticket_cards(tickets):
+    versions = get_versions(
+        "project", [ticket.project_id for ticket in tickets]
+    )
+    return attach_fragments(
+        tickets,
+        "tickets/ticket_list_card.html",
+        key_func=lambda ticket: (
+            f"{ticket.id}:{ticket.updated_at.timestamp()}:"
+            f"{versions[ticket.project_id]}"
+        ),
+        context_func=lambda ticket: {"ticket": ticket},
+    )
+
+
+def _board_filters(request, project):
+    return TicketFilterForm(
+        request.GET,
+        users=TicketsUser.objects.filter(
+            Q(projects=project) | Q(id=project.owner_id)
+        ).distinct(),
+    )
+
+
+def _is_xhr(request):
+    return request.headers.get("X-Requested-With") == "XMLHttpRequest"
+
+
+def _ticket_action_done(request, ticket, message, payload):
+    """Finish a ticket_detail action: a JSON ``payload()`` for scripts,
+    otherwise a flash message and a redirect back to the page."""
+    if _is_xhr(request):
+        return JsonResponse({"success": True, **payload()})
+
+    messages.success(request, message)
+    return redirect(
+        "ticket_detail", project_id=ticket.project_id, ticket_id=ticket.id
+    )
+
+
+def _form_errors(form):
+    return JsonResponse(
+        {"success": False, "errors": form.errors.get_json_data()}, status=400
+    )
+
+
+def _subtask_progress(ticket):
+    ticket.refresh_from_db(fields=["subtasks_total", "subtasks_done"])
+    return {
+        "subtasks_total": ticket.subtasks_total,
+        "subtasks_done": ticket.subtasks_done,
+    }
+
+
+def _page_url(request, param, number):
+    query = request.GET.copy()
+    query[param] = number
+    return f"?{query.urlencode()}"
+
+
+def _report_invitations(request, report):
+    invited = [
+        email for email, outcome in report.items() if outcome == INVITED
+    ]
+    unknown = [
+        email for email, outcome in report.items() if outcome == UNKNOWN
+    ]
+    if invited:
+        messages.success(request, f"Invited {len(invited)} user(s)")
+    if unknown:
+        messages.warning(request, f"No users found for: {', '.join(unknown)}")
+
+
+def _trim_page(tickets, limit, cursor=lambda ticket: ticket.rank):
+    """Cut ``tickets`` down to ``limit`` and return the next page cursor."""
+    if len(tickets) <= limit:
+        return None
+
+    del tickets[limit:]
+    return f"{cursor(tickets[-1])}.{tickets[-1].id}"
 
 
 @login_required
 def group_list(request):
     user = request.user
-
-    owned_groups = user.owned_groups.all()
-    member_groups = user.attached_groups.all()
+    sort = request.GET.get("sort")
+    if sort not in GROUP_SORTS:
+        sort = "title"
+
+    pages = {}
+    for key, groups in (
+        ("owned_groups", user.owned_groups.all()),
+        ("member_groups", user.attached_groups.all()),
+    ):
+        page = Paginator(
+            groups.annotate(
+                member_count=_related_count(
+                    TrackerGroup.members.through, "trackergroup"
+                ),
+                project_count=_related_count(Project, "attached_group"),
+            ).order_by(*GROUP_SORTS[sort]["order_by"]),
+            GROUP_PAGE_SIZE,
+        ).get_page(request.GET.get(f"{key}_page"))
+        page.object_list = _attach_group_cards(page.object_list)
+        # Links keep the sort and the other list's page.
+        if page.has_previous():
+            page.previous_url = _page_url(
+                request, f"{key}_page", page.previous_page_number()
+            )
+        if page.has_next():
+            page.next_url = _page_url(
+                request, f"{key}_page", page.next_page_number()
+            )
+        pages[key] = page
 
     return render(
         request,
         "groups/groups_main.html",
         {
-            "owned_groups": owned_groups,
-            "member_groups": member_groups,
+            **pages,
+            "sort": sort,
+            "sorts": GROUP_SORTS,
         },
     )
 
@@ -60,20 +409,11 @@ def create_group(request):
 
             group.members.add(request.user)
 
-            emails = request.POST.get("emails", "")
+            emails = parse_emails(request.POST.get("emails", ""))
             if emails:
-                for email in emails.split(","):
-                    email = email.strip()
-                    try:
-                        target_user = TicketsUser.objects.get(email=email)
-                        Invitation.objects.create(
-                            owner=request.user,
-                            target_user=target_user,
-                            target_group=group,
-                            invitation_type="group",
-                        )
-                    except TicketsUser.DoesNotExist:
-                        continue
+                _report_invitations(
+                    request, invite_to_group(request.user, group, emails)
+                )
 
             messages.success(request, "Group is created!")
             return redirect("group_list")
@@ -92,15 +432,16 @@ def create_group(request):
 @login_required
 @group_access_required
 def group_view(request, group_id, group=None):
-    projects = (
-        group.projects.select_related("owner")
-        .prefetch_related("members", "tickets")
-        .order_by("-created_at")
-    )
+    projects = group.projects.annotate(
+        member_count=_related_count(Project.members.through, "project"),
+        ticket_count=Count("tickets"),
+        open_count=Count("tickets", filter=Q(tickets__status="open")),
+        done_count=Count("tickets", filter=Q(tickets__status="done")),
+    ).order_by("-created_at")
 
-    all_members = group.members.all()
-    if not all_members.filter(id=group.owner.id).exists():
-        all_members = list(all_members) + [group.owner]
+    members = TicketsUser.objects.filter(
+        Q(id__in=group.members.values("id")) | Q(id=group.owner_id)
+    ).order_by("id")
 
     return render(
         request,
@@ -108,9 +449,8 @@ def group_view(request, group_id, group=None):
         {
             "group": group,
             "projects": projects,
-            "members": all_members,
-            "user_can_edit": request.user == group.owner,
-            "user_is_member": request.user in group.members.all(),
+            "members": members,
+            "user_can_edit": request.user.id == group.owner_id,
         },
     )
 
@@ -238,10 +578,9 @@ def delete_project(request, group_id, project_id, group=None):
 
 
 @login_required
+@throttle("autocomplete", rate=AUTOCOMPLETE_RATE, capacity=AUTOCOMPLETE_BURST)
 def user_email_autocomplete(request):
-    query = request.GET.get("q", "")
-    users = TicketsUser.objects.filter(email__icontains=query)[:10]
-    results = [{"id": u.id, "email": u.email} for u in users]
+    results = search_emails(request.user, request.GET.get("q", ""))
 
     return JsonResponse(results, safe=False)
 
@@ -250,18 +589,13 @@ def user_email_autocomplete(request):
 @group_access_required
 def send_invitation(request, group_id, group=None):
     current_user = request.user
-    emails = request.POST.get("emails", "").strip()
+    emails = parse_emails(request.POST.get("emails", ""))
 
     if emails:
-        if group.owner.id == current_user.id:
-            for email in [e.strip() for e in emails.split(",") if e.strip()]:
-                user = get_object_or_404(TicketsUser, email=email)
-                Invitation.objects.create(
-                    owner=current_user,
-                    target_user=user,
-                    target_group=group,
-                    invitation_type="group",
-                )
+        if group.owner_id == current_user.id:
+            _report_invitations(
+                request, invite_to_group(current_user, group, emails)
+            )
         else:
             messages.error(
                 request, "You don't have permission to send invitation"
@@ -297,7 +631,7 @@ def group_delete(request, group_id, pk, group=None):
 def project_list(request):
     user = request.user
     projects = user.projects.filter(members=user.id)
-    owned_projects = user.owned_projects.all()
+    owned_projects = _attach_project_cards(user.owned_projects.all())
 
     return render(
         request,
@@ -315,21 +649,19 @@ def create_project(request, group_id, group=None):
     user = request.user
     if request.method == "POST":
         form = ProjectForm(request.POST)
-        emails = request.POST.get("emails", "").split(",")
+        emails = parse_emails(request.POST.get("emails", ""))
 
         if form.is_valid():
             project = form.save(commit=False)
             project.owner = user
             project.attached_group = group
             project.save()
-            project.members.add(user)
+            project.members.add(
+                user, *TicketsUser.objects.filter(email__in=emails)
+            )
+            if form.cleaned_data["inherit_group_members"]:
+                inherit_group_members(project, group)
 
-            if emails:
-                for email in emails:
-                    email = email.strip()
-                    coworker = TicketsUser.objects.filter(email=email).first()
-                    if coworker:
-                        project.members.add(coworker)
             messages.success(request, "Project is created!")
             return redirect(
                 request.META.get(
@@ -344,57 +676,159 @@ def create_project(request, group_id, group=None):
 
 @login_required
 @project_access_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=board_etag)
 def project_details(request, project_id, project=None):
-    tickets = project.tickets.all()
-
-    statuses = [
-        {"key": "open", "label": "Open", "badge_class": "bg-secondary"},
-        {
-            "key": "in_progress",
-            "label": "In Progress",
-            "badge_class": "bg-warning text-dark",
-        },
-        {
-            "key": "testing",
-            "label": "Testing",
-            "badge_class": "bg-info text-dark",
-        },
-        {"key": "done", "label": "Done", "badge_class": "bg-success"},
-        {
-            "key": "closed",
-            "label": "Closed",
-            "badge_class": "bg-dark text-white",
-        },
-    ]
-
-    priority = [
-        {"key": "low", "label": "Low", "badge_class": "badge-success"},
-        {"key": "medium", "label": "Medium", "badge_class": "badge-warning"},
-        {"key": "high", "label": "High", "badge_class": "badge-danger"},
-    ]
-
+    filters = _board_filters(request, project)
     return render(
         request,
         "projects/project_details.html",
         {
             "project": project,
-            "tickets": tickets,
-            "statuses": statuses,
-            "priority": priority,
+            "columns": _board_columns(project, filters.q()),
+            "priority": BOARD_PRIORITIES,
+            "filters": filters,
         },
     )
 
 
 @login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=ticket_list_etag)
 def ticket_list(request):
     user = request.user
-    user_tickets = Ticket.objects.filter(assignee=user.id)
+    assigned = Ticket.objects.filter(assignee=user.id)
+    filters = TicketFilterForm(
+        request.GET,
+        users=TicketsUser.objects.filter(id__in=assigned.values("creator_id")),
+        exclude=("assignee",),
+    )
+    tickets = assigned.filter(filters.q())
+
+    after = request.GET.get("after")
+    page = tickets
+    if after:
+        try:
+            page = older_than(page, "updated_at", after)
+        except ValueError:
+            return HttpResponseBadRequest("Invalid cursor")
+
+    user_tickets = list(
+        page.select_related("project")
+        .only(*TICKET_LIST_FIELDS)
+        .order_by("-updated_at", "-id")[: TICKET_LIST_PAGE_SIZE + 1]
+    )
+    next_cursor = _trim_page(
+        user_tickets,
+        TICKET_LIST_PAGE_SIZE,
+        cursor=lambda ticket: ticket.updated_at.isoformat(),
+    )
+    _attach_ticket_cards(user_tickets)
+
+    counts = tickets.aggregate(
+        **{
+            key: Count("id", filter=Q(status=key))
+            for key, _ in Ticket.STATUS_CHOICES
+        }
+    )
+
+    return render(
+        request,
+        "tickets/ticket_list.html",
+        {
+            "user_tickets": user_tickets,
+            "filters": filters,
+            "status_counts": [
+                {**status, "count": counts[status["key"]]}
+                for status in BOARD_STATUSES
+            ],
+            "after": after,
+            "next_cursor": next_cursor,
+        },
+    )
+
+
+@login_required
+@require_GET
+def ticket_search(request):
+    query = request.GET.get("q", "").strip()
+    page = None
+    if query:
+        tickets = search_tickets(
+            Ticket.objects.filter(
+                project__in=visible_projects(request.user)
+            ).select_related("project"),
+            query,
+        ).defer("search_vector")
+        page = Paginator(tickets, SEARCH_PAGE_SIZE).get_page(
+            request.GET.get("page")
+        )
+        for ticket in page:
+            ticket.snippet_html = highlight(ticket.snippet, query)
 
     return render(
-        request, "tickets/ticket_list.html", {"user_tickets": user_tickets}
+        request, "tickets/ticket_search.html", {"query": query, "page": page}
     )
 
 
+@login_required
+def saved_filter_list(request):
+    if request.method == "POST":
+        form = SavedFilterForm(request.POST, owner=request.user)
+        if form.is_valid():
+            saved_filter = form.save()
+            messages.success(request, f"Saved filter {saved_filter.name}")
+            return redirect("saved_filter_results", filter_id=saved_filter.id)
+    else:
+        form = SavedFilterForm(owner=request.user)
+
+    saved_filters = list(request.user.saved_filters.all())
+    counts = saved_filter_counts(request.user, saved_filters)
+    for saved_filter in saved_filters:
+        saved_filter.ticket_count = counts[saved_filter.id]
+
+    return render(
+        request,
+        "tickets/saved_filters.html",
+        {"saved_filters": saved_filters, "form": form},
+    )
+
+
+@login_required
+@require_GET
+def saved_filter_results(request, filter_id):
+    saved_filter = get_object_or_404(
+        SavedFilter, id=filter_id, owner=request.user
+    )
+    tickets = (
+        saved_filter_tickets(saved_filter, request.user)
+        .select_related("project")
+        .defer("search_vector")
+        .order_by("-updated_at", "-id")
+    )
+    page = Paginator(tickets, SAVED_FILTER_PAGE_SIZE).get_page(
+        request.GET.get("page")
+    )
+    page.object_list = _attach_ticket_cards(page.object_list)
+
+    return render(
+        request,
+        "tickets/saved_filter_results.html",
+        {"saved_filter": saved_filter, "page": page},
+    )
+
+
+@login_required
+@require_POST
+def delete_saved_filter(request, filter_id):
+    saved_filter = get_object_or_404(
+        SavedFilter, id=filter_id, owner=request.user
+    )
+    saved_filter.delete()
+    messages.success(request, f"Deleted filter {saved_filter.name}")
+    return redirect("saved_filter_list")
+
+
 @require_POST
 @csrf_protect
 @project_access_required
@@ -412,7 +846,8 @@ def update_task_status(request, project_id, project=None):
             )
 
         task.status = status
-        task.save()
+        task.save(update_fields=["status", "updated_at"])
+        _publish_cards(project, [task.id])
 
         return JsonResponse(
             {
@@ -425,6 +860,177 @@ def update_task_status(request, project_id, project=None):
         return JsonResponse({"success": False, "error": str(e)}, status=500)
 
 
+@require_POST
+@csrf_protect
+@project_access_required
+def update_task_statuses(request, project_id, project=None):
+    try:
+        moves = json.loads(request.body).get("moves")
+    except (ValueError, AttributeError):
+        moves = None
+
+    if not isinstance(moves, list) or not moves:
+        return JsonResponse(
+            {"success": False, "error": "Expected a list of moves"},
+            status=400,
+        )
+    if len(moves) > MAX_BATCH_MOVES:
+        return JsonResponse(
+            {"success": False, "error": "Too many moves in one batch"},
+            status=400,
+        )
+
+    valid_statuses = dict(Ticket.STATUS_CHOICES)
+    targets = {}
+    for move in moves:
+        if not isinstance(move, dict):
+            return JsonResponse(
+                {"success": False, "error": "Invalid move"}, status=400
+            )
+        try:
+            task_id = int(move.get("task_id"))
+            position = [
+                None if move.get(key) is None else int(move[key])
+                for key in ("before_id", "after_id")
+            ]
+        except (TypeError, ValueError):
+            return JsonResponse(
+                {"success": False, "error": "Invalid task id"}, status=400
+            )
+        if move.get("status") not in valid_statuses:
+            return JsonResponse(
+                {"success": False, "error": "Invalid status"}, status=400
+            )
+        # A card dropped twice in one batch ends up where it was dropped
+        # last, and moves are applied in the order of those last drops.
+        targets.pop(task_id, None)
+        targets[task_id] = (
+            move["status"],
+            position if "before_id" in move or "after_id" in move else None,
+        )
+
+    now = timezone.now()
+    try:
+        with transaction.atomic():
+            found = set(
+                project.tickets.filter(id__in=targets).values_list(
+                    "id", flat=True
+                )
+            )
+
+            by_status = {}
+            for task_id, (status, position) in targets.items():
+                if task_id not in found:
+                    continue
+                if position is None:
+                    by_status.setdefault(status, []).append(task_id)
+                    continue
+
+                # Neighbours may have moved earlier in this batch, so each
+                # positioned card is ranked against the current column.
+                rank = rank_in_column(
+                    project.tickets.filter(status=status).exclude(id=task_id),
+                    *position,
+                )
+                project.tickets.filter(id=task_id).update(
+                    status=status, rank=rank, updated_at=now
+                )
+
+            for status, task_ids in by_status.items():
+                project.tickets.filter(id__in=task_ids).update(
+                    status=status, updated_at=now
+                )
+    except ValueError:
+        return JsonResponse(
+            {"success": False, "error": "Board is out of date"}, status=409
+        )
+
+    # Queryset updates skip the signals that keep filter counts fresh.
+    invalidate("project_tickets", project.id)
+    _publish_cards(project, found)
+
+    return JsonResponse(
+        {
+            "success": True,
+            "updated": [
+                {
+                    "task_id": task_id,
+                    "status": status,
+                    "status_display": valid_statuses[status],
+                }
+                for task_id, (status, _) in targets.items()
+                if task_id in found
+            ],
+            "missing": sorted(set(targets) - found),
+        }
+    )
+
+
+@login_required
+@require_GET
+@project_access_required
+def board_column(request, project_id, status, project=None):
+    column = next((c for c in BOARD_STATUSES if c["key"] == status), None)
+    if column is None:
+        return JsonResponse(
+            {"success": False, "error": "Invalid status"}, status=400
+        )
+
+    try:
+        after_rank, after_id = request.GET.get("after", ".0").rsplit(".", 1)
+        after_id = int(after_id)
+        limit = int(request.GET.get("limit", BOARD_PAGE_SIZE))
+    except ValueError:
+        return JsonResponse(
+            {"success": False, "error": "Invalid cursor"}, status=400
+        )
+    limit = max(1, min(limit, BOARD_MAX_PAGE_SIZE))
+
+    tickets = list(
+        _board_tickets(project, _board_filters(request, project).q())
+        .filter(status=status)
+        .filter(Q(rank__gt=after_rank) | Q(rank=after_rank, id__gt=after_id))
+        .order_by("rank", "id")[: limit + 1]
+    )
+    next_cursor = _trim_page(tickets, limit)
+    _attach_kanban_cards(project, tickets)
+
+    html = render_to_string(
+        "projects/kanban_cards.html",
+        {"project": project, "column": column, "tickets": tickets},
+        request=request,
+    )
+
+    return JsonResponse(
+        {
+            "success": True,
+            "status": status,
+            "count": len(tickets),
+            "html": html,
+            "next_cursor": next_cursor,
+        }
+    )
+
+
+@login_required
+@require_GET
+async def board_events(request, project_id):
+    project = await aget_object_or_404(Project, id=project_id)
+
+    user = await request.auser()
+    if not await sync_to_async(can_access_project)(user, project):
+        return HttpResponseForbidden("No access to this project")
+
+    response = StreamingHttpResponse(
+        event_stream(board_channel(project.id)),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    # Stop nginx from buffering the stream.
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
 @login_required
 @require_POST
 def add_subtask(request, ticket_id):
@@ -438,14 +1044,139 @@ def add_subtask(request, ticket_id):
     )
 
 
+@login_required
+@require_GET
+@project_access_required
+def ticket_comments(request, project_id, ticket_id, project=None):
+    get_object_or_404(Ticket.objects.only("id"), id=ticket_id, project=project)
+
+    try:
+        comments, cursor = load_comments(
+            ticket_id, before=request.GET.get("before", "")
+        )
+    except ValueError:
+        return JsonResponse(
+            {"success": False, "error": "Invalid cursor"}, status=400
+        )
+
+    html = render_to_string(
+        "tickets/comments.html", {"comments": comments}, request=request
+    )
+    return JsonResponse(
+        {
+            "success": True,
+            "count": len(comments),
+            "html": html,
+            "next_cursor": cursor,
+        }
+    )
+
+
+@login_required
+@require_POST
+@project_access_required
+def update_subtasks(request, project_id, ticket_id, project=None):
+    ticket = get_object_or_404(
+        Ticket.objects.only("id", "project"), id=ticket_id, project=project
+    )
+    try:
+        changes = json.loads(request.body).get("changes")
+    except (ValueError, AttributeError):
+        changes = None
+
+    if not isinstance(changes, list) or not changes:
+        return JsonResponse(
+            {"success": False, "error": "Expected a list of changes"},
+            status=400,
+        )
+    if len(changes) > MAX_SUBTASK_CHANGES:
+        return JsonResponse(
+            {"success": False, "error": "Too many changes in one batch"},
+            status=400,
+        )
+
+    max_length = SubTask._meta.get_field("text").max_length
+    for change in changes:
+        if not isinstance(change, dict) or change.get("op") not in SUBTASK_OPS:
+            return JsonResponse(
+                {"success": False, "error": "Invalid change"}, status=400
+            )
+        if change["op"] != "add" and not isinstance(change.get("id"), int):
+            return JsonResponse(
+                {"success": False, "error": "Invalid subtask id"}, status=400
+            )
+        if change["op"] == "toggle" and not isinstance(
+            change.get("is_done"), bool
+        ):
+            return JsonResponse(
+                {"success": False, "error": "Invalid subtask state"},
+                status=400,
+            )
+        if change["op"] in ("add", "rename"):
+            text = change.get("text")
+            if not isinstance(text, str) or not 0 < len(text) <= max_length:
+                return JsonResponse(
+                    {"success": False, "error": "Invalid subtask text"},
+                    status=400,
+                )
+
+    with transaction.atomic():
+        existing = {
+            subtask.id: subtask
+            for subtask in SubTask.objects.select_for_update().filter(
+                ticket=ticket,
+                id__in=[c["id"] for c in changes if c["op"] != "add"],
+            )
+        }
+        changed, added, deleted, missing = {}, [], set(), set()
+        for change in changes:
+            if change["op"] == "add":
+                added.append(SubTask(text=change["text"]))
+                continue
+
+            subtask = existing.get(change["id"])
+            if subtask is None or subtask.id in deleted:
+                missing.add(change["id"])
+            elif change["op"] == "delete":
+                deleted.add(subtask.id)
+                changed.pop(subtask.id, None)
+            else:
+                if change["op"] == "toggle":
+                    subtask.is_done = change["is_done"]
+                else:
+                    subtask.text = change["text"]
+                changed[subtask.id] = subtask
+
+        save_subtasks(
+            ticket,
+            changed=list(changed.values()),
+            added=added,
+            deleted_ids=deleted,
+        )
+    _publish_cards(project, [ticket.id])
+
+    return JsonResponse(
+        {
+            "success": True,
+            "added": [
+                {"id": subtask.id, "text": subtask.text} for subtask in added
+            ],
+            "missing": sorted(missing),
+            **_subtask_progress(ticket),
+        }
+    )
+
+
 @login_required
 @project_access_required
-def update_task_ajax(request, project_id, ticket_id, task_id):
+def update_task_ajax(request, project_id, ticket_id, task_id, project=None):
     if request.method == "POST":
         try:
-            task = SubTask.objects.get(id=task_id, ticket_id=ticket_id)
+            task = SubTask.objects.get(
+                id=task_id, ticket_id=ticket_id, ticket__project=project
+            )
             data = json.loads(request.body)
-            task.is_done = data.get("completed", False)
+            task.is_done = bool(data.get("completed", False))
             task.save()
             return JsonResponse({"status": "success"})
         except SubTask.DoesNotExist:
@@ -457,32 +1188,113 @@ def update_task_ajax(request, project_id, ticket_id, task_id):
 
 
 @login_required
+@require_POST
 @project_access_required
-def ticket_detail(request, project_id, ticket_id, project):  # TODO Decopose
-    ticket = get_object_or_404(Ticket, id=ticket_id)
+def start_attachment_upload(request, project_id, ticket_id, project=None):
+    ticket = get_object_or_404(
+        Ticket.objects.only("id", "project"), id=ticket_id, project=project
+    )
+    try:
+        data = json.loads(request.body)
+        filename, size = data.get("filename"), data.get("size")
+    except (ValueError, AttributeError):
+        filename = size = None
 
-    comments = ticket.comments.all()
-    attachments = ticket.attachments.all()
-    subtasks = ticket.subtasks.all()
-
-    SubTaskFormSet = modelformset_factory(
-        SubTask,
-        fields=("text", "is_done"),
-        extra=0,
-        widgets={
-            "text": forms.TextInput(attrs={"class": "form-control"}),
-            "is_done": forms.CheckboxInput(
-                attrs={"class": "form-check-input"}
+    try:
+        upload = start_upload(ticket, request.user, filename, size)
+    except UploadError as e:
+        return JsonResponse(
+            {"success": False, "error": str(e)}, status=e.status
+        )
+    return JsonResponse(
+        {
+            "success": True,
+            "upload_id": str(upload.pk),
+            "url": reverse(
+                "attachment_upload",
+                args=[project_id, ticket_id, upload.pk],
             ),
+            "offset": 0,
+            "chunk_size": UPLOAD_CHUNK_SIZE,
         },
+        status=201,
     )
 
-    form = TicketForm(instance=ticket, project=project)
+
+@login_required
+@require_http_methods(["GET", "PATCH"])
+@project_access_required
+def attachment_upload(request, project_id, ticket_id, upload_id, project=None):
+    """GET reports how much of the upload has arrived; PATCH appends the
+    request body at the ``Upload-Offset`` header."""
+    upload = get_object_or_404(
+        AttachmentUpload,
+        pk=upload_id,
+        ticket_id=ticket_id,
+        ticket__project=project,
+        uploaded_by=request.user,
+    )
+    if request.method == "GET":
+        return JsonResponse(
+            {"success": True, "offset": upload.received, "size": upload.size}
+        )
+
+    try:
+        offset = int(request.headers.get("Upload-Offset", ""))
+        length = int(request.META.get("CONTENT_LENGTH") or 0)
+    except ValueError:
+        return JsonResponse(
+            {"success": False, "error": "Invalid Upload-Offset header"},
+            status=400,
+        )
+
+    try:
+        # Under ASGI the handler has already spooled the chunk, in memory
+        # up to FILE_UPLOAD_MAX_MEMORY_SIZE; UPLOAD_CHUNK_SIZE is what
+        # bounds the memory one request can take.
+        result = write_chunk(upload.pk, request.user, offset, request, length)
+    except UploadError as e:
+        return JsonResponse(
+            {"success": False, "error": str(e)}, status=e.status
+        )
+
+    if isinstance(result, AttachmentUpload):
+        return JsonResponse(
+            {"success": True, "offset": result.received, "size": result.size}
+        )
+    return JsonResponse(
+        {
+            "success": True,
+            "attachment": {
+                "id": result.id,
+                "name": result.filename,
+                "url": result.attached_file.url,
+            },
+        },
+        status=201,
+    )
+
+
+@login_required
+@project_access_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=ticket_detail_etag)
+def ticket_detail(request, project_id, ticket_id, project):  # TODO Decopose
+    form = TicketForm(project=project)
     comment_form = CommentForm()
     attachment_form = SecureAttachmentForm()
-    formset = SubTaskFormSet(queryset=subtasks)
+    formset = None
 
     if request.method == "POST":
+        # Actions only need the ticket; the rest is loaded if the page
+        # is rendered again.
+        ticket = get_object_or_404(
+            Ticket.objects.defer("search_vector"),
+            id=ticket_id,
+            project=project,
+        )
+        ticket.project = project
+
         if "add_comment" in request.POST:
             comment_form = CommentForm(request.POST)
             if comment_form.is_valid():
@@ -490,10 +1302,20 @@ def ticket_detail(request, project_id, ticket_id, project):  # TODO Decopose
                 comment.ticket = ticket
                 comment.author = request.user
                 comment.save()
-                messages.success(request, "Comment added!")
-                return redirect(
-                    "ticket_detail", project_id=project_id, ticket_id=ticket.id
+                return _ticket_action_done(
+                    request,
+                    ticket,
+                    "Comment added!",
+                    lambda: {
+                        "html": render_to_string(
+                            "tickets/comments.html",
+                            {"comments": [comment]},
+                            request=request,
+                        )
+                    },
                 )
+            if _is_xhr(request):
+                return _form_errors(comment_form)
 
         elif "add_attachment" in request.POST:
             attachment_form = SecureAttachmentForm(request.POST, request.FILES)
@@ -502,51 +1324,117 @@ def ticket_detail(request, project_id, ticket_id, project):  # TODO Decopose
                 attachment.ticket = ticket
                 attachment.uploaded_by = request.user
                 attachment.save()
-                messages.success(request, "File attached!")
-                return redirect(
-                    "ticket_detail", project_id=project_id, ticket_id=ticket.id
-                )
-            else:
-                messages.error(
+                return _ticket_action_done(
                     request,
-                    "Error attaching file. Please check the file type and size.",
+                    ticket,
+                    "File attached!",
+                    lambda: {
+                        "attachment": {
+                            "id": attachment.id,
+                            "name": attachment.filename,
+                            "url": attachment.attached_file.url,
+                        }
+                    },
                 )
+            if _is_xhr(request):
+                return _form_errors(attachment_form)
+            messages.error(
+                request,
+                "Error attaching file. Please check the file type and size.",
+            )
 
         elif "update_subtasks" in request.POST:
-            formset = SubTaskFormSet(request.POST, queryset=subtasks)
+            formset = SubTaskFormSet(
+                request.POST, queryset=ticket.subtasks.order_by("id")
+            )
             if formset.is_valid():
-                formset.save()
-                messages.success(request, "Subtasks updated!")
-                return redirect(
-                    "ticket_detail", project_id=project_id, ticket_id=ticket.id
+                edited = formset.save(commit=False)
+                save_subtasks(
+                    ticket,
+                    changed=[subtask for subtask in edited if subtask.pk],
+                    added=[subtask for subtask in edited if not subtask.pk],
+                    deleted_ids=[
+                        subtask.pk for subtask in formset.deleted_objects
+                    ],
+                )
+                _publish_cards(project, [ticket.id])
+                return _ticket_action_done(
+                    request,
+                    ticket,
+                    "Subtasks updated!",
+                    lambda: _subtask_progress(ticket),
+                )
+            if _is_xhr(request):
+                return JsonResponse(
+                    {
+                        "success": False,
+                        "errors": [
+                            subtask_form.errors.get_json_data()
+                            for subtask_form in formset
+                        ],
+                        "non_form_errors": list(formset.non_form_errors()),
+                    },
+                    status=400,
                 )
 
         elif "add_subtask" in request.POST:
             new_text = request.POST.get("new_subtask")
             if new_text:
-                SubTask.objects.create(ticket=ticket, text=new_text)
-                messages.success(request, "Subtask added!")
-                return redirect(
-                    "ticket_detail", project_id=project_id, ticket_id=ticket.id
+                subtask = SubTask.objects.create(ticket=ticket, text=new_text)
+                return _ticket_action_done(
+                    request,
+                    ticket,
+                    "Subtask added!",
+                    lambda: {
+                        "html": render_to_string(
+                            "tickets/subtask_item.html",
+                            {"subtask": subtask, "ticket": ticket},
+                            request=request,
+                        ),
+                        **_subtask_progress(ticket),
+                    },
+                )
+            if _is_xhr(request):
+                return JsonResponse(
+                    {"success": False, "error": "Subtask text is required"},
+                    status=400,
                 )
 
         else:
             form = TicketForm(request.POST, instance=ticket, project=project)
             if form.is_valid():
                 form.save()
-                messages.success(request, "Ticket updated successfully!")
-                return redirect(
-                    "ticket_detail", project_id=project_id, ticket_id=ticket.id
+                _publish_cards(project, [ticket.id])
+                return _ticket_action_done(
+                    request,
+                    ticket,
+                    "Ticket updated successfully!",
+                    lambda: {
+                        "ticket": {
+                            "id": ticket.id,
+                            "title": ticket.title,
+                            "priority": ticket.priority,
+                            "ticket_type": ticket.ticket_type,
+                            "assignee": ticket.assignee_id,
+                            "due_date": ticket.due_date,
+                        }
+                    },
                 )
+            if _is_xhr(request):
+                return _form_errors(form)
+
+    loaded = load_ticket_detail(project, ticket_id)
+    if not form.is_bound:
+        form = TicketForm(instance=loaded["ticket"], project=project)
+    if formset is None:
+        formset = SubTaskFormSet(queryset=loaded["subtasks"])
 
     return render(
         request,
         "tickets/ticket_detail.html",
         {
+            **loaded,
             "project": project,
-            "ticket": ticket,
-            "comments": comments,
-            "attachments": attachments,
             "comment_form": comment_form,
             "formset": formset,
             "attachment_form": attachment_form,
@@ -566,6 +1454,7 @@ def create_ticket(request, project_id, project):
             ticket.project = project
             ticket.creator = request.user
             ticket.save()
+            _publish_cards(project, [ticket.id])
             messages.success(request, "Ticket created!")
             return redirect("project_details", project_id=project.id)
     else:
@@ -593,6 +1482,7 @@ def update_ticket(request, project_id, ticket_id, project=None):
         )
         if ticket_form.is_valid():
             ticket_form.save()
+            _publish_cards(ticket.project, [ticket.id])
             messages.success(request, "Ticket is updated")
 
             return redirect(